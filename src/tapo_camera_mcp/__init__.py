@@ -10,10 +10,10 @@ __version__ = "1.1.0"
 __author__ = "Tapo Camera MCP Team <tapo-camera-mcp@example.com>"
 __license__ = "MIT"
 
-from . import presets
+import importlib
 
-# Import core components
-from .core import (
+from . import presets
+from .core.models import (
     CameraInfo,
     CameraModel,
     CameraStatus,
@@ -22,16 +22,20 @@ from .core import (
     PTZDirection,
     PTZPosition,
     StreamType,
-    TapoCameraServer,
     VideoQuality,
-    get_server,
 )
-
-# For backward compatibility
-from .core.server import TapoCameraServer as Server
-from .core.server import TapoCameraServer as TapoCameraMCP
 from .exceptions import TapoCameraError
 
+# Imported on first access, so that importing the package does not load the
+# server, FastMCP and the camera backends
+_LAZY = {
+    "TapoCameraServer": (".core.server", "TapoCameraServer"),
+    "get_server": (".core.server", "get_server"),
+    # For backward compatibility
+    "Server": (".core.server", "TapoCameraServer"),
+    "TapoCameraMCP": (".core.server", "TapoCameraServer"),
+}
+
 __all__ = [
     "CameraInfo",
     # Models
@@ -51,3 +55,10 @@ __all__ = [
     "get_server",
     "presets",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _LAZY[name]
+    return getattr(importlib.import_module(module, __name__), attribute)
@@ -3,7 +3,7 @@
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
-from .vision.dinov3 import DINOv3Processor
+from .vision.dinov3 import DINOv3Processor, dinov3_processor
 
 
 class ImageAnalyzer:
@@ -13,10 +13,15 @@ class ImageAnalyzer:
         """Initialize the image analyzer.
 
         Args:
-            model_name: Name of the DINOv3 model variant to use.
+            model_name: Name of the DINOv3 model variant to use. The model is
+                loaded on the first analysis; the default variant shares the
+                global processor so it is only loaded once per process.
         """
         self.model_name = model_name
-        self.processor = DINOv3Processor(model_name)
+        if model_name == dinov3_processor.model_name:
+            self.processor = dinov3_processor
+        else:
+            self.processor = DINOv3Processor(model_name)
 
     async def analyze_image(
         self, image_path: Union[str, Path], features_only: bool = False
@@ -334,7 +334,9 @@ class APIRouter:
                 }
 
         @self.mcp.tool()
-        async def capture_still(camera: str, save_path: Optional[str] = None) -> Dict[str, Any]:
+        async def capture_still(
+            camera: str, save_path: Optional[str] = None, store: bool = False
+        ) -> Dict[str, Any]:
             """Capture a still image from a specified camera.
 
             Takes a snapshot from the specified camera and either returns the image data
@@ -349,6 +351,9 @@ class APIRouter:
                     - If provided, image is saved to this path and path is returned
                     - If not provided, image data is returned directly
                     - Supports common image formats (.jpg, .png, .bmp)
+                store: Also keep the snapshot in the deduplicating snapshot store (optional)
+                    - The camera's JPEG is stored as received, once per distinct image
+                    - The store entry is returned as 'snapshot'
 
             Returns:
                 Dictionary containing:
@@ -357,6 +362,7 @@ class APIRouter:
                     - image: Image data or file path (only present on success)
                         - PIL Image object if save_path not provided
                         - File path string if save_path was provided
+                    - snapshot: Snapshot store entry (only present if store was set)
                     - message: Error description (only present on error)
 
             Usage:
@@ -427,7 +433,7 @@ class APIRouter:
                 if not camera:
                     return {"status": "error", "message": "Camera name is required"}
 
-                return await self.camera_manager.capture_still(camera, save_path)
+                return await self.camera_manager.capture_still(camera, save_path, store=store)
 
             except Exception as e:
                 return {
@@ -1,35 +1,29 @@
-"""Camera module imports."""
+"""Camera module imports.
 
+The camera backends and their clients (pytapo, ring_doorbell, cv2, aiohttp)
+are imported on first use: ``CameraFactory`` imports a backend when a camera
+of its type is created, and the classes below are resolved on attribute
+access, so importing this package stays cheap.
+"""
+
+import importlib
 import logging
 
 logger = logging.getLogger(__name__)
 
-from .petcube import PetcubeCamera
-
-# Import all camera implementations to ensure they register with the factory
-from .tapo import TapoCamera
-
-# Import RingCamera with error handling
-try:
-    # Apply patch before importing ring module
-    try:
-        import patch_ring_doorbell
-
-        patch_ring_doorbell.patch_ring_doorbell()
-    except Exception as e:
-        logger.warning(f"Failed to apply ring_doorbell patch: {e}")
-
-    from .ring import RingCamera
-
-    RING_AVAILABLE = True
-except ImportError as e:
-    logger.warning(f"Failed to import RingCamera: {e}")
-    RING_AVAILABLE = False
-
-from .webcam import WebCamera
+# Module of each camera implementation
+_BACKENDS = {
+    "PetcubeCamera": ".petcube",
+    "RingCamera": ".ring",
+    "TapoCamera": ".tapo",
+    "WebCamera": ".webcam",
+}
 
 __all__ = ["PetcubeCamera", "TapoCamera", "WebCamera"]
 
-# Only add RingCamera to __all__ if it's available
-if RING_AVAILABLE:
-    __all__.append("RingCamera")
+
+def __getattr__(name: str):
+    module = _BACKENDS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
@@ -1,12 +1,15 @@
 """Base camera interface for unified camera support."""
 
+import asyncio
+import importlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import TYPE_CHECKING, Dict, Optional, Union
 
-from PIL import Image
+if TYPE_CHECKING:
+    from PIL import Image
 
 
 class CameraType(str, Enum):
@@ -76,7 +79,7 @@ class BaseCamera(ABC):
         self._is_connected = False
 
     @abstractmethod
-    async def capture_still(self, save_path: Optional[Union[str, Path]] = None) -> Image.Image:
+    async def capture_still(self, save_path: Optional[Union[str, Path]] = None) -> "Image.Image":
         """Capture a still image from the camera.
 
         Args:
@@ -91,6 +94,26 @@ class BaseCamera(ABC):
         if not self._is_connected:
             raise RuntimeError("Camera is not connected")
 
+    async def capture_jpeg(self, quality: int = 90) -> bytes:
+        """Capture a still image as JPEG.
+
+        Cameras that deliver JPEG return the camera's own bytes; the default
+        encodes the image returned by ``capture_still``.
+
+        Args:
+            quality: JPEG quality used when the image has to be encoded
+
+        Returns:
+            bytes: The JPEG data
+
+        Raises:
+            RuntimeError: If the camera is not connected or capture fails
+        """
+        from ..media.scheduler import encode_jpeg
+
+        image = await self.capture_still()
+        return await asyncio.get_event_loop().run_in_executor(None, encode_jpeg, image, quality)
+
     @abstractmethod
     async def get_stream_url(self) -> Optional[str]:
         """Get the stream URL for the camera.
@@ -146,10 +169,23 @@ class BaseCamera(ABC):
 
 
 class CameraFactory:
-    """Factory for creating camera instances."""
+    """Factory for creating camera instances.
+
+    Camera implementations register themselves when their module is imported.
+    The module of a camera type is imported on first use, so the third-party
+    client of a backend is only loaded when a camera of that type is configured.
+    """
 
     _camera_classes = {}
 
+    # Module implementing each camera type
+    _camera_modules = {
+        CameraType.TAPO: f"{__package__}.tapo",
+        CameraType.RING: f"{__package__}.ring",
+        CameraType.WEBCAM: f"{__package__}.webcam",
+        CameraType.PETCUBE: f"{__package__}.petcube",
+    }
+
     @classmethod
     def register(cls, camera_type: CameraType):
         """Register a camera implementation."""
@@ -166,7 +202,21 @@ class CameraFactory:
         if isinstance(config, dict):
             config = CameraConfig(**config)
 
-        if config.type not in cls._camera_classes:
-            raise ValueError(f"Unsupported camera type: {config.type}")
+        return cls.get_camera_class(config.type)(config)
 
-        return cls._camera_classes[config.type](config)
+    @classmethod
+    def get_camera_class(cls, camera_type: Union[str, CameraType]) -> type:
+        """Return the implementation of a camera type, importing it if needed.
+
+        Raises:
+            ValueError: If the type is unknown or its dependencies are missing
+        """
+        if camera_type not in cls._camera_classes:
+            module = cls._camera_modules.get(camera_type)
+            if module is None:
+                raise ValueError(f"Unsupported camera type: {camera_type}")
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                raise ValueError(f"Camera type {camera_type} is unavailable: {e}") from e
+        return cls._camera_classes[camera_type]
@@ -1,5 +1,7 @@
 """Camera manager for handling multiple camera types and groups."""
 
+import asyncio
+import io
 import logging
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
@@ -10,6 +12,18 @@ from .groups import CameraGroupManager
 logger = logging.getLogger(__name__)
 
 
+def _open_still(data: bytes, save_path: Optional[Union[str, Path]] = None):
+    """Decode a captured JPEG and save it like the cameras' ``capture_still`` does."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    if save_path:
+        save_path = Path(save_path)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        image.save(save_path)
+    return image
+
+
 class CameraManager:
     """Manages multiple camera instances and groups."""
 
@@ -132,19 +146,44 @@ class CameraManager:
         return result
 
     async def capture_still(
-        self, camera_name: str, save_path: Optional[Union[str, Path]] = None
+        self,
+        camera_name: str,
+        save_path: Optional[Union[str, Path]] = None,
+        store: bool = False,
     ) -> dict:
-        """Capture a still image from a camera."""
+        """Capture a still image from a camera.
+
+        Args:
+            camera_name: Name of the camera
+            save_path: Optional path to save the image to
+            store: Also add the camera's JPEG to the deduplicating snapshot store
+
+        Returns:
+            Capture result; includes the snapshot store entry when ``store`` is set
+        """
         if camera_name not in self.cameras:
             return {"status": "error", "message": f"Camera not found: {camera_name}"}
 
         try:
-            image = await self.cameras[camera_name].capture_still(save_path)
-            return {
+            camera = self.cameras[camera_name]
+            entry = None
+            if store:
+                from ..media.snapshot_store import snapshot_store
+
+                loop = asyncio.get_event_loop()
+                data = await camera.capture_jpeg()
+                entry = await loop.run_in_executor(None, snapshot_store.put, camera_name, data)
+                image = await loop.run_in_executor(None, _open_still, data, save_path)
+            else:
+                image = await camera.capture_still(save_path)
+            result = {
                 "status": "success",
                 "camera": camera_name,
                 "image": image if not save_path else str(save_path),
             }
+            if entry is not None:
+                result["snapshot"] = entry.to_dict()
+            return result
         except Exception as e:
             return {"status": "error", "camera": camera_name, "message": str(e)}
 
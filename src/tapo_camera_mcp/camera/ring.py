@@ -8,12 +8,21 @@ from typing import Dict, Optional
 
 from oauthlib.oauth2 import MissingTokenError
 from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Apply patch before importing ring_doorbell
+try:
+    import patch_ring_doorbell
+
+    patch_ring_doorbell.patch_ring_doorbell()
+except Exception as e:
+    logger.warning(f"Failed to apply ring_doorbell patch: {e}")
+
 from ring_doorbell import Auth, Ring
 
 from .base import BaseCamera, CameraFactory, CameraType
 
-logger = logging.getLogger(__name__)
-
 
 @CameraFactory.register(CameraType.RING)
 class RingCamera(BaseCamera):
@@ -2,14 +2,21 @@
 
 import asyncio
 import io
+import logging
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from PIL import Image
 from pytapo import Tapo
 
 from .base import BaseCamera, CameraFactory, CameraType
 
+logger = logging.getLogger(__name__)
+
+# Detections that ended this many seconds ago still count as current motion
+MOTION_HOLD_SECONDS = 30
+
 
 @CameraFactory.register(CameraType.TAPO)
 class TapoCamera(BaseCamera):
@@ -19,6 +26,8 @@ class TapoCamera(BaseCamera):
         super().__init__(config)
         self._camera = None
         self._stream_url = None
+        # Whether the last detection list held a current event (None: not read yet)
+        self._motion: Optional[bool] = None
 
     async def connect(self) -> bool:
         """Initialize connection to the Tapo camera."""
@@ -43,6 +52,19 @@ class TapoCamera(BaseCamera):
         self._is_connected = False
         self._camera = None
 
+    async def capture_jpeg(self, quality: int = 90) -> bytes:
+        """Capture a still image as the JPEG the camera sent (``quality`` does not apply)."""
+        if not await self.is_connected():
+            await self.connect()
+
+        try:
+            return await asyncio.get_event_loop().run_in_executor(
+                None, lambda: self._camera.get_image()
+            )
+        except Exception as e:
+            self._is_connected = False
+            raise RuntimeError(f"Failed to capture image: {e}") from e
+
     async def capture_still(self, save_path: Optional[str] = None) -> Image.Image:
         """Capture a still image from the camera."""
         if not await self.is_connected():
@@ -133,7 +155,7 @@ class TapoCamera(BaseCamera):
             except Exception as exc:
                 logger.debug("Failed to get audio capability: %s", exc)
 
-            return {
+            status = {
                 "connected": True,
                 "model": device_info.get("device_model", "Unknown"),
                 "firmware": device_info.get("firmware_version", "Unknown"),
@@ -144,6 +166,9 @@ class TapoCamera(BaseCamera):
                 "streaming_capable": True,  # All Tapo cameras can stream
                 "capture_capable": True,  # All Tapo cameras can capture
             }
+            if self._motion is not None:
+                status["motion_detected"] = self._motion
+            return status
         except Exception as e:
             self._is_connected = False
             return {
@@ -156,6 +181,30 @@ class TapoCamera(BaseCamera):
                 "capture_capable": False,
             }
 
+    async def get_detections(self) -> Optional[List[Dict[str, Any]]]:
+        """The motion detections the camera recorded, each with a start_time and end_time.
+
+        Searching the detection list takes several requests to the camera, so
+        only the metrics collector calls this, once per poll. The result also
+        sets the ``motion_detected`` that ``get_status`` reports.
+
+        Returns None if the camera cannot search its detections (e.g. no SD card).
+        """
+        if not await self.is_connected():
+            await self.connect()
+
+        try:
+            events = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: self._camera.getEvents()
+            )
+        except Exception as exc:
+            logger.debug("Failed to get detection events: %s", exc)
+            return None
+        events = list(events or ())
+        recent = time.time() - MOTION_HOLD_SECONDS
+        self._motion = any(event.get("end_time", 0) >= recent for event in events)
+        return events
+
     async def get_info(self) -> Dict:
         """Get comprehensive Tapo camera information."""
         try:
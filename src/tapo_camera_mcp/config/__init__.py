@@ -293,6 +293,16 @@ get_config = config_manager.load_config
 get_setting = config_manager.get
 get_model = config_manager.get_model
 
+
+def get_storage_settings() -> StorageSettings:
+    """Get the storage settings from the server configuration.
+
+    Returns:
+        The ``storage`` section of the server configuration.
+    """
+    return get_model(ServerConfig).storage
+
+
 # Export models and utilities
 __all__ = [
     "CameraConfig",
@@ -306,4 +316,5 @@ __all__ = [
     "get_config",
     "get_model",
     "get_setting",
+    "get_storage_settings",
 ]
@@ -1,7 +1,11 @@
 """
 Core functionality for the Tapo Camera MCP server.
+
+The server (and with it FastMCP) is imported on first access.
 """
 
+import importlib
+
 from .models import (
     CameraInfo,
     CameraModel,
@@ -13,7 +17,8 @@ from .models import (
     StreamType,
     VideoQuality,
 )
-from .server import TapoCameraServer, get_server
+
+_LAZY = {"TapoCameraServer": ".server", "get_server": ".server"}
 
 __all__ = [
     "CameraInfo",
@@ -28,3 +33,10 @@ __all__ = [
     "VideoQuality",
     "get_server",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
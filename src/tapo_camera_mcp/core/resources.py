@@ -0,0 +1,180 @@
+"""
+MCP resources of the Tapo Camera MCP server.
+
+Tools return references to binary results kept in the blob store (see
+``tapo_camera_mcp.media.blob_store``); clients read the bytes through the
+resource templates registered here.
+
+The state of cameras, motion, alarms and smart plugs is served as JSON
+resources clients can subscribe to. They are sent ``resources/updated`` when
+the content changes (see ``tapo_camera_mcp.core.subscriptions``) instead of
+polling the status tools.
+"""
+
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ResourceError
+
+from ..event_counters import MOTION, event_counters
+from .subscriptions import resource_watcher
+
+logger = logging.getLogger(__name__)
+
+# Blob kind -> MIME type of its resource template
+BLOB_KINDS = {"snapshots": "image/jpeg"}
+
+
+def _blob_reader(kind: str):
+    async def read_blob(digest: str) -> bytes:
+        from ..media.blob_store import blob_store
+
+        blob = blob_store.get(digest)
+        if blob is None or blob.kind != kind:
+            raise ResourceError(f"{kind} blob {digest} is unknown or has expired")
+        return blob.data
+
+    read_blob.__name__ = f"read_{kind}"
+    return read_blob
+
+
+async def _camera_manager():
+    from .server import TapoCameraServer  # Lazy import to avoid circular imports
+
+    server = await TapoCameraServer.get_instance()
+    return server.camera_manager
+
+
+async def read_camera_status() -> Dict[str, Any]:
+    """Connection and device status of every camera."""
+    manager = await _camera_manager()
+    return {"cameras": await manager.list_cameras()}
+
+
+async def read_motion() -> Dict[str, Any]:
+    """Whether each camera sees motion now, and its recent motion events.
+
+    Current motion comes from the camera status (Tapo cameras report what the
+    metrics collector's last search of their detections found; other cameras
+    leave it None). Event counts are those the metrics collector recorded, if
+    it runs.
+    """
+    manager = await _camera_manager()
+    cameras = {}
+    for camera in await manager.list_cameras():
+        status = camera.get("status") or {}
+        cameras[camera["name"]] = {
+            "motion_detected": status.get("motion_detected"),
+            **event_counters.summary(camera["name"], MOTION),
+        }
+    return {"cameras": cameras}
+
+
+async def read_alarms() -> Dict[str, Any]:
+    """Smoke and CO state of the Nest Protect devices and their unresolved alerts."""
+    from ..tools.alarms.nest_protect_tools import nest_manager
+
+    devices = await nest_manager.get_all_devices()
+    alerts = await nest_manager.get_recent_alerts()
+    return {
+        # last_seen changes with every device contact, not with the state
+        "devices": [device.model_dump(exclude={"last_seen"}) for device in devices],
+        "active_alerts": [alert.model_dump() for alert in alerts if not alert.resolved],
+    }
+
+
+async def read_plug_power() -> Dict[str, Any]:
+    """Power state and draw of every smart plug."""
+    from ..tools.energy.tapo_plug_tools import tapo_plug_manager
+
+    return {
+        "plugs": [
+            {
+                "device_id": plug.device_id,
+                "name": plug.name,
+                "power_state": plug.power_state,
+                # Whole watts, so measurement noise is not reported as a change
+                "current_power": round(plug.current_power),
+            }
+            for plug in await tapo_plug_manager.get_all_devices()
+        ]
+    }
+
+
+# Resource path -> (description, reader) of the subscribable state resources
+STATE_RESOURCES: Dict[str, Tuple[str, Callable[[], Awaitable[Dict[str, Any]]]]] = {
+    "cameras/status": ("Connection and device status of all cameras", read_camera_status),
+    "cameras/motion": ("Current motion and motion event counts per camera", read_motion),
+    "alarms/nest_protect": ("Nest Protect smoke/CO state and unresolved alerts", read_alarms),
+    "plugs/power": ("Power state and draw of all smart plugs", read_plug_power),
+}
+
+
+def _state_reader(
+    path: str,
+    reader: Callable[[], Awaitable[Dict[str, Any]]],
+    run_in: Optional[Callable[[Awaitable[Any]], Awaitable[Any]]],
+) -> Callable[[], Awaitable[str]]:
+    async def read_state() -> str:
+        call = reader()
+        state = await (call if run_in is None else run_in(call))
+        # Sorted keys, so equal state always reads (and hashes) the same
+        return json.dumps(state, sort_keys=True, default=str)
+
+    read_state.__name__ = "read_" + path.replace("/", "_")
+    return read_state
+
+
+def _enable_subscriptions(mcp: FastMCP) -> None:
+    """Handle resources/subscribe and advertise it (FastMCP has no API for either)."""
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def subscribe(uri) -> None:
+        await resource_watcher.subscribe(str(uri), server.request_context.session)
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri) -> None:
+        resource_watcher.unsubscribe(str(uri), server.request_context.session)
+
+    get_capabilities = server.get_capabilities
+
+    def get_capabilities_with_subscribe(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities_with_subscribe
+
+
+def register_resources(
+    mcp: FastMCP, run_in: Optional[Callable[[Awaitable[Any]], Awaitable[Any]]] = None
+) -> None:
+    """Register the resource templates of stored tool results and the state resources.
+
+    ``run_in`` takes a state reader's coroutine and returns an awaitable of
+    its result, to read device state on the event loop the devices live on.
+    """
+    for kind, mime_type in BLOB_KINDS.items():
+        mcp.resource(
+            f"tapo://{kind}/{{digest}}",
+            name=kind,
+            description=f"Stored {kind} returned by tools, addressed by SHA-256",
+            mime_type=mime_type,
+        )(_blob_reader(kind))
+        logger.debug(f"Registered resource template tapo://{kind}/{{digest}}")
+    for path, (description, reader) in STATE_RESOURCES.items():
+        uri = f"tapo://{path}"
+        read_state = _state_reader(path, reader, run_in)
+        mcp.resource(
+            uri,
+            name=path.replace("/", "_"),
+            description=description,
+            mime_type="application/json",
+        )(read_state)
+        resource_watcher.add_resource(uri, read_state)
+    _enable_subscriptions(mcp)
+    logger.debug(f"Registered {len(STATE_RESOURCES)} subscribable state resources")
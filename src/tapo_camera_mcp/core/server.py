@@ -2,6 +2,7 @@ import asyncio
 import logging
 import sys
 from pathlib import Path
+from typing import Any, Dict, List
 
 # Add the src directory to the Python path
 src_path = Path(__file__).parent.parent
@@ -11,16 +12,11 @@ if str(src_path) not in sys.path:
 from fastmcp.server import FastMCP
 
 from tapo_camera_mcp.camera.manager import CameraManager
-from tapo_camera_mcp.tools.base_tool import ToolResult
+from tapo_camera_mcp.core.resources import register_resources
+from tapo_camera_mcp.tool_metrics import tool_metrics
 from tapo_camera_mcp.tools.discovery import discover_tools
-
-# Optional camera imports - handle missing dependencies gracefully
-try:
-    from tapo_camera_mcp.camera.ring import RingCamera
-except ImportError as e:
-    logger = logging.getLogger(__name__)
-    logger.warning(f"Ring camera support unavailable: {e}")
-    RingCamera = None
+from tapo_camera_mcp.tools.invoker import build_tool_wrapper
+from tapo_camera_mcp.tools.manifest import entries_from_classes, load_manifest
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -82,206 +78,119 @@ class TapoCameraServer:
                 except Exception as e:
                     logger.exception(f"Error loading camera {camera_name}: {e}")
 
-        # Register all tools
+        # Measure event loop lag and capture the stacks of blocking calls
+        monitor_config = config.get("loop_monitor") or {}
+        if monitor_config.get("enabled", True):
+            from ..loop_monitor import loop_monitor
+
+            loop_monitor.configure(monitor_config)
+            loop_monitor.start()
+
+        # Track resident memory and the size of long-lived structures
+        memory_config = config.get("memory_diagnostics") or {}
+        if memory_config.get("enabled", True):
+            from ..memory_diagnostics import memory_diagnostics
+
+            memory_diagnostics.configure(memory_config)
+            if memory_config.get("trace_allocations", False):
+                memory_diagnostics.start_tracing(int(memory_config.get("trace_frames", 1)))
+            memory_diagnostics.start()
+
+        # Keep a latest frame of every camera in memory
+        scheduler_config = config.get("snapshot_scheduler") or {}
+        if scheduler_config.get("enabled", False):
+            from ..media.scheduler import snapshot_scheduler
+
+            snapshot_scheduler.configure(scheduler_config)
+            snapshot_scheduler.start(self.camera_manager)
+
+        # Keep binary tool results for clients to fetch as resources
+        blob_config = config.get("blob_store")
+        if blob_config:
+            from ..media.blob_store import blob_store
+
+            blob_store.configure(blob_config)
+
+        # Let clients subscribe to device state instead of polling the tools
+        from .subscriptions import resource_watcher
+
+        resource_watcher.configure(config.get("resource_subscriptions") or {})
+
+        # Poll camera metrics into the history and serve /metrics, the range
+        # query API and the Grafana datasource
+        self.metrics_collector = None
+        metrics_config = config.get("metrics_server") or {}
+        if metrics_config.get("enabled", False):
+            await self._start_metrics(metrics_config)
+
+        # Register all tools and the resources they refer to
         await self._register_tools()
+        register_resources(self.mcp)
 
         self._initialized = True
         logger.info("Tapo Camera MCP Server initialized successfully")
 
+        # Optionally load the vision model in the background once the server is ready
+        if (config.get("vision") or {}).get("warmup", False):
+            self._vision_warmup = asyncio.ensure_future(self._warmup_vision())
+
+    async def _start_metrics(self, metrics_config: Dict[str, Any]) -> None:
+        """Start the camera metrics collector and the HTTP server exposing it."""
+        from ..metrics_service import MetricsCollector, MetricsServer
+
+        self.metrics_collector = MetricsCollector(
+            self.camera_manager,
+            poll_interval=float(metrics_config.get("poll_interval", 30.0)),
+            min_interval=float(metrics_config.get("min_interval", 5.0)),
+            max_interval=float(metrics_config.get("max_interval", 300.0)),
+        )
+        await self.metrics_collector.start()
+        self.metrics_server = MetricsServer(
+            self.metrics_collector,
+            host=metrics_config.get("host", "127.0.0.1"),
+            port=int(metrics_config.get("port", 8080)),
+        )
+        self._metrics_task = asyncio.ensure_future(self.metrics_server.start())
+        logger.info(
+            f"Metrics server listening on {self.metrics_server.host}:{self.metrics_server.port}"
+        )
+
+    async def _warmup_vision(self) -> None:
+        """Load the vision model ahead of the first image analysis."""
+        from ..vision import dinov3_processor
+
+        try:
+            await dinov3_processor.warmup()
+            logger.info("Vision model %s loaded", dinov3_processor.model_name)
+        except Exception as e:
+            logger.warning(f"Vision model warmup failed: {e}")
+
+    def _tool_entries(self) -> List[Dict[str, Any]]:
+        """Manifest entries of all tools, discovering the tools if there is no manifest."""
+        entries = load_manifest()
+        if entries is None:
+            logger.warning("No tool manifest, importing every tool module to discover tools")
+            entries = entries_from_classes(discover_tools("tapo_camera_mcp.tools", rescan=True))
+        return entries
+
     async def _register_tools(self):
-        """Register all tools with the MCP server using FastMCP 2.12 patterns."""
-        # Discover and register all tools from the tools package
-        tools = discover_tools("tapo_camera_mcp.tools")
-
-        # Deduplicate tools by name to avoid registering the same tool twice
-        seen_tools = set()
-        unique_tools = []
-        for tool_cls in tools:
-            tool_meta = getattr(tool_cls, "Meta", None)
-            if tool_meta:
-                tool_name = getattr(
-                    tool_meta, "name", tool_cls.__name__.replace("Tool", "").lower()
-                )
-                if tool_name not in seen_tools:
-                    seen_tools.add(tool_name)
-                    unique_tools.append(tool_cls)
-
-        logger.info(f"Discovered {len(tools)} tools, registering {len(unique_tools)} unique tools")
-
-        for tool_cls in unique_tools:
-            # Get tool metadata from the class
-            tool_meta = getattr(tool_cls, "Meta", None)
-            if not tool_meta:
-                logger.warning(f"Tool {tool_cls.__name__} is missing Meta class, skipping")
-                continue
-
-            tool_name = getattr(tool_meta, "name", tool_cls.__name__.replace("Tool", "").lower())
-            tool_description = getattr(tool_meta, "description", "")
+        """Register all tools with the MCP server using FastMCP 2.12 patterns.
+
+        Tools are registered from the prebuilt tool manifest, so no tool module
+        is imported here; each one is imported when its tool is first called.
+        """
+        entries = self._tool_entries()
+        logger.info(f"Registering {len(entries)} tools")
 
+        for entry in entries:
+            tool_name = entry["name"]
             logger.debug(f"Registering tool: {tool_name}")
 
-            # Create a simple wrapper function using closures
-
-            # Extract parameter names from the tool class
-            param_names = []
-            if hasattr(tool_meta, "Parameters"):
-                # Extract parameter names from the Parameters class
-                params_class = tool_meta.Parameters
-                for attr_name in dir(params_class):
-                    if not attr_name.startswith("_") and not callable(
-                        getattr(params_class, attr_name)
-                    ):
-                        param_names.append(attr_name)
-            elif hasattr(tool_cls, "model_fields"):
-                # Extract from Pydantic V2 model_fields
-                param_names = list(tool_cls.model_fields.keys())
-            elif hasattr(tool_cls, "__fields__"):
-                # Fallback for Pydantic V1 __fields__
-                param_names = list(tool_cls.__fields__.keys())
-
-            # Create wrapper function with explicit parameters
-            if param_names:
-                # Create parameter signature
-                param_list = [f"{name}" for name in param_names]
-                param_signature = ", ".join(param_list)
-
-                # Get the docstring
-                docstring = (
-                    tool_cls.execute.__doc__
-                    if hasattr(tool_cls, "execute") and tool_cls.execute.__doc__
-                    else "Tool execution"
-                )
-
-                # Create kwargs assignments
-                kwargs_lines = "\n".join(
-                    [f"        kwargs['{name}'] = {name}" for name in param_names]
-                )
-
-                # Create the function code using string formatting
-                func_code = (
-                    """
-async def tool_wrapper("""
-                    + param_signature
-                    + '''):
-    """'''
-                    + docstring
-                    + '''"""
-    try:
-        # Create kwargs dict from parameters
-        kwargs = {}
-'''
-                    + kwargs_lines
-                    + """
-
-        # Create tool instance with parameters
-        tool_instance = tool_cls(**kwargs)
-
-        # If the tool has an async initialize method, call it
-        if hasattr(tool_instance, 'initialize') and callable(tool_instance.initialize):
-            if asyncio.iscoroutinefunction(tool_instance.initialize):
-                await tool_instance.initialize()
-            else:
-                tool_instance.initialize()
-
-        # Call the tool's execute method
-        if hasattr(tool_instance, 'execute'):
-            execute_method = tool_instance.execute
-
-            # Handle both sync and async execute methods
-            if asyncio.iscoroutinefunction(execute_method):
-                result = await execute_method()
-            else:
-                result = execute_method()
-
-            # Handle the result
-            if isinstance(result, ToolResult):
-                return {
-                    "content": result.content,
-                    "is_error": result.is_error
-                }
-            elif isinstance(result, dict):
-                return result
-            else:
-                return {
-                    "content": str(result),
-                    "is_error": False
-                }
-        else:
-            raise ValueError("Tool """
-                    + tool_name
-                    + """ has no execute method")
-
-    except Exception as e:
-        error_msg = "Error executing tool """
-                    + tool_name
-                    + """: {}".format(e)
-        logger.error(error_msg)
-        logger.exception("Full traceback:")
-        return {
-            "content": error_msg,
-            "is_error": True
-        }
-"""
-                )
-
-                # Execute the function code
-                local_vars = {
-                    "tool_cls": tool_cls,
-                    "tool_name": tool_name,
-                    "asyncio": asyncio,
-                    "ToolResult": ToolResult,
-                    "logger": logger,
-                }
-                exec(func_code, local_vars)
-                wrapper_func = local_vars["tool_wrapper"]
-            else:
-                # No parameters - simple wrapper
-                async def wrapper_func():
-                    """{tool_cls.execute.__doc__ if hasattr(tool_cls, 'execute') and tool_cls.execute.__doc__ else 'Tool execution'}"""
-                    try:
-                        # Create tool instance
-                        tool_instance = tool_cls()
-
-                        # If the tool has an async initialize method, call it
-                        if hasattr(tool_instance, "initialize") and callable(
-                            tool_instance.initialize
-                        ):
-                            if asyncio.iscoroutinefunction(tool_instance.initialize):
-                                await tool_instance.initialize()
-                            else:
-                                tool_instance.initialize()
-
-                        # Call the tool's execute method
-                        if hasattr(tool_instance, "execute"):
-                            execute_method = tool_instance.execute
-
-                            # Handle both sync and async execute methods
-                            if asyncio.iscoroutinefunction(execute_method):
-                                result = await execute_method()
-                            else:
-                                result = execute_method()
-
-                            # Handle the result
-                            if isinstance(result, ToolResult):
-                                return {
-                                    "content": result.content,
-                                    "is_error": result.is_error,
-                                }
-                            if isinstance(result, dict):
-                                return result
-                            return {"content": str(result), "is_error": False}
-                        raise ValueError(f"Tool {tool_name} has no execute method")
-
-                    except Exception as e:
-                        error_msg = f"Error executing tool {tool_name}: {e}"
-                        logger.exception(error_msg)
-                        logger.exception("Full traceback:")
-                        return {"content": error_msg, "is_error": True}
-
-                wrapper_func = wrapper_func
-
-            # Register the tool
-            self.mcp.tool(tool_name, description=tool_description)(wrapper_func)
+            # Register the tool, measuring every call
+            wrapper_func = tool_metrics.instrument(tool_name, build_tool_wrapper(entry))
+            registered = self.mcp.tool(tool_name, description=entry["description"])(wrapper_func)
+            # Advertise the typed schema from the manifest rather than the untyped wrapper's
+            registered.parameters = entry["parameters"]
             logger.debug(f"Successfully registered tool: {tool_name}")
 
     async def run(
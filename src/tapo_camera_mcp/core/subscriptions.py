@@ -0,0 +1,148 @@
+"""
+Subscriptions to MCP resources of changing state.
+
+Clients subscribe to a state resource (camera status, motion, alarms, plug
+power) instead of polling the tools that report it. While a resource has
+subscribers the watcher reads it once every ``interval`` seconds, however
+many clients subscribed, and compares the SHA-256 of what a read returns with
+the previous read. Only when it differs are the subscribed sessions sent a
+``notifications/resources/updated``; they then read the resource again.
+"""
+
+import asyncio
+import hashlib
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..prometheus import MetricsRegistry
+from ..prometheus import registry as prometheus_registry
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceWatcher:
+    """Watch subscribed resources and notify their subscribers of changes."""
+
+    def __init__(self, interval: float = 5.0, registry: Optional[MetricsRegistry] = None):
+        """Initialize the watcher.
+
+        Args:
+            interval: Seconds between two reads of a subscribed resource
+            registry: Prometheus registry of the notification counter.
+                Defaults to the global registry.
+        """
+        registry = registry if registry is not None else prometheus_registry
+        self.updates = registry.counter(
+            "mcp_resource_updates_total",
+            "resources/updated notifications sent to subscribed MCP sessions",
+            ["resource"],
+        )
+        self.interval = interval
+        self._readers: Dict[str, Callable[[], Awaitable[str]]] = {}
+        self._subscribers: Dict[str, "weakref.WeakSet[Any]"] = {}
+        self._digests: Dict[str, Optional[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Apply the ``resource_subscriptions`` configuration section."""
+        self.interval = float(config.get("interval", self.interval))
+
+    def add_resource(self, uri: str, reader: Callable[[], Awaitable[str]]) -> None:
+        """Make a resource subscribable; ``reader`` returns its current content."""
+        self._readers[uri] = reader
+
+    def supports(self, uri: str) -> bool:
+        """Whether clients can subscribe to a resource."""
+        return uri in self._readers
+
+    async def subscribe(self, uri: str, session: Any) -> None:
+        """Notify a session (with ``send_resource_updated``) when a resource changes."""
+        if uri not in self._readers:
+            raise ValueError(f"Resource {uri} does not support subscriptions")
+        if uri not in self._subscribers:
+            self._subscribers[uri] = weakref.WeakSet()
+            self._digests[uri] = await self._read(uri)
+        self._subscribers[uri].add(session)
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._task = asyncio.ensure_future(self._watch())
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        """Stop notifying a session of a resource."""
+        subscribers = self._subscribers.get(uri)
+        if subscribers is not None:
+            subscribers.discard(session)
+            if not subscribers:
+                self._forget(uri)
+
+    def subscriptions(self) -> Dict[str, int]:
+        """Number of subscribed sessions of each resource."""
+        return {uri: len(subscribers) for uri, subscribers in self._subscribers.items()}
+
+    def _forget(self, uri: str) -> None:
+        self._subscribers.pop(uri, None)
+        self._digests.pop(uri, None)
+
+    async def _read(self, uri: str) -> Optional[str]:
+        """Digest of the current content of a resource, or None if it cannot be read."""
+        try:
+            content = await self._readers[uri]()
+        except Exception as e:
+            logger.warning(f"Could not read subscribed resource {uri}: {e}")
+            return None
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    async def check(self) -> List[str]:
+        """Read every subscribed resource once and notify the subscribers of changed ones.
+
+        Returns:
+            The URIs of the resources that changed
+        """
+        for uri in [uri for uri, subscribers in self._subscribers.items() if not subscribers]:
+            self._forget(uri)
+        uris = list(self._subscribers)
+        digests = await asyncio.gather(*(self._read(uri) for uri in uris))
+        changed = []
+        for uri, digest in zip(uris, digests):
+            if uri not in self._subscribers or digest is None:
+                continue
+            previous = self._digests.get(uri)
+            self._digests[uri] = digest
+            if previous is not None and digest != previous:
+                changed.append(uri)
+                await self._notify(uri)
+        return changed
+
+    async def _notify(self, uri: str) -> None:
+        for session in list(self._subscribers.get(uri, ())):
+            try:
+                await session.send_resource_updated(uri)
+                self.updates.labels(uri).inc()
+            except Exception as e:
+                # The session has gone away
+                logger.debug(f"Dropping subscriber of {uri}: {e}")
+                self.unsubscribe(uri, session)
+
+    async def _watch(self) -> None:
+        """Background task reading subscribed resources until none are left."""
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Error checking subscribed resources")
+
+    async def stop(self) -> None:
+        """Drop all subscriptions and stop watching."""
+        self._subscribers.clear()
+        self._digests.clear()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                await asyncio.gather(task, return_exceptions=True)
+
+
+# Global instance
+resource_watcher = ResourceWatcher()
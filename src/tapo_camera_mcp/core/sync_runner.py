@@ -2,109 +2,146 @@
 Synchronous runner for Tapo Camera MCP Server in direct mode.
 This module provides a completely synchronous way to run the MCP server
 for Claude Desktop integration, avoiding asyncio event loop conflicts.
+
+Tools do not run on the loop of the stdio transport but on one background
+event loop that lives as long as the process, so camera connections and HTTP
+sessions opened by a tool call are still usable by the next one.
 """
 
+import asyncio
+import concurrent.futures
 import logging
+import threading
 from pathlib import Path
+from typing import Any, Awaitable, Optional
 
 from fastmcp import FastMCP
 
+from ..tool_metrics import tool_metrics
+
 logger = logging.getLogger(__name__)
 
 
+class BackgroundLoop:
+    """An event loop running forever in a daemon thread.
+
+    Coroutines are submitted from other threads or loops with
+    ``run_coroutine_threadsafe``; the loop and everything bound to it are
+    kept until ``stop`` is called.
+    """
+
+    def __init__(self, name: str = "tapo-mcp-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """The running loop, if started."""
+        return self._loop if self.running else None
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread unless it is running, and return the loop."""
+        with self._lock:
+            if not self.running:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(
+                    target=self._serve, args=(loop, ready), name=self.name, daemon=True
+                )
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+                logger.debug(f"Started background event loop {self.name}")
+            return self._loop
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop, starting it if needed."""
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block until it returns."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BackgroundLoop.run() called from the loop's own thread")
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the loop and await its result from another loop."""
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel pending tasks, close the loop and join its thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and thread is not None and thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            logger.debug(f"Stopped background event loop {self.name}")
+
+
 def create_mcp_server() -> FastMCP:
     """Create and configure the FastMCP server synchronously."""
     # Initialize FastMCP
     mcp = FastMCP(name="Tapo-Camera-MCP", version="0.4.0")
 
-    # Import and register tools synchronously
+    # Register tools from the prebuilt manifest; tool modules are imported on first call
+    from fastmcp.tools import Tool
+
     from ..tools.discovery import discover_tools
+    from ..tools.invoker import build_tool_wrapper
+    from ..tools.manifest import entries_from_classes, load_manifest
 
-    tools = discover_tools("tapo_camera_mcp.tools")
+    tools = load_manifest()
+    if tools is None:
+        tools = entries_from_classes(discover_tools("tapo_camera_mcp.tools", rescan=True))
 
-    for tool_cls in tools:
-        # Get the tool name and description from the Meta class or class attributes
-        tool_name = getattr(tool_cls, "name", getattr(tool_cls.Meta, "name", tool_cls.__name__))
-        tool_description = getattr(
-            tool_cls, "description", getattr(tool_cls.Meta, "description", "")
-        )
+    for entry in tools:
+        tool_name = entry["name"]
+        logger.debug(f"Registering tool: {tool_name}")
 
         try:
-            # Try to create an instance with default values
-            try:
-                tool_instance = tool_cls()
-                logger.debug(f"Successfully instantiated tool: {tool_name}")
-            except Exception as e:
-                # If we can't create with defaults, skip this tool
-                logger.warning(
-                    f"Skipping tool {tool_name}: Could not instantiate with defaults: {e!s}"
-                )
-                continue
-
-            logger.debug(f"Registering tool: {tool_name}")
-
-            # If the tool has a sync initialize method, call it
-            if hasattr(tool_instance, "initialize") and callable(tool_instance.initialize):
-                try:
-                    # Check if it's async (has __await__ method)
-                    if not hasattr(tool_instance.initialize, "__await__"):
-                        tool_instance.initialize()
-                        logger.debug(f"Initialized tool: {tool_name}")
-                    else:
-                        logger.debug(f"Skipping async initialization for tool: {tool_name}")
-                except Exception as e:
-                    logger.warning(f"Failed to initialize tool {tool_name}: {e!s}")
-                    continue
-
-            # Create a synchronous wrapper for the tool
-            def create_sync_tool_wrapper(tool_instance, tool_name):
-                """Create a synchronous tool wrapper."""
-
-                def sync_tool_wrapper(*args, **kwargs):
-                    """Synchronous wrapper for tool execution."""
-                    try:
-                        # Try to call the tool synchronously
-                        if hasattr(tool_instance, "execute"):
-                            # Call execute method directly (sync)
-                            result = tool_instance.execute(**kwargs)
-                        elif callable(tool_instance):
-                            # Call the instance directly
-                            result = tool_instance(**kwargs)
-                        else:
-                            result = {"error": "Tool not callable", "success": False}
-
-                        return result
-
-                    except Exception as e:
-                        logger.exception(f"Error executing tool {tool_name}: {e}")
-                        return {"error": str(e), "success": False}
-
-                return sync_tool_wrapper
-
-            # Create the wrapper with the correct tool name
-            tool_wrapper = create_sync_tool_wrapper(tool_instance, tool_name)
-
-            # Register with FastMCP using from_function
-            try:
-                from fastmcp.tools import Tool
-
-                fastmcp_tool = Tool.from_function(
-                    fn=tool_wrapper, name=tool_name, description=tool_description
-                )
-
-                # Add to MCP server
-                mcp.add_tool(fastmcp_tool)
-                logger.info(f"Successfully registered tool: {tool_name}")
-
-            except Exception as e:
-                logger.warning(f"Failed to register tool {tool_name}: {e}")
-                continue
+            # Run the tool on the background loop, measuring every call
+            tool_wrapper = tool_metrics.instrument(
+                tool_name, build_tool_wrapper(entry, background_loop.run_async)
+            )
+            fastmcp_tool = Tool.from_function(
+                fn=tool_wrapper, name=tool_name, description=entry["description"]
+            )
+            fastmcp_tool.parameters = entry["parameters"]
+            mcp.add_tool(fastmcp_tool)
+            logger.info(f"Successfully registered tool: {tool_name}")
 
         except Exception as e:
-            logger.error(f"Unexpected error processing tool {tool_name}: {e!s}", exc_info=True)
+            logger.warning(f"Failed to register tool {tool_name}: {e}")
             continue
 
     logger.info(f"Registered {len(tools)} tools")
+
+    from .resources import register_resources
+
+    # Device state is read on the loop the tools and their devices run on
+    register_resources(mcp, background_loop.run_async)
     return mcp
 
 
@@ -132,3 +169,9 @@ def run_direct_server():
         logger.exception(f"Direct server error: {e}")
         logger.exception("Full traceback:")
         raise
+    finally:
+        background_loop.stop()
+
+
+# Global instance
+background_loop = BackgroundLoop()
@@ -0,0 +1,169 @@
+"""
+Sliding-window event counters.
+
+Events (motion, alarms, energy state changes, ...) are counted per source and
+event type into minute buckets held in a circular array. Counting the events
+of the last hour or day sums at most that many buckets, independent of the
+number of events, and recording an event is a single array update. Nothing
+scans event lists at query time.
+"""
+
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Event types counted by the server
+MOTION = "motion"
+ALARM = "alarm"
+ENERGY = "energy"
+
+
+class WindowCounter:
+    """Event counts of one source and event type in a circular array of buckets."""
+
+    __slots__ = ("bucket_seconds", "buckets", "counts", "last_bucket", "last_event")
+
+    def __init__(self, bucket_seconds: int = 60, buckets: int = 1440):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self.counts = array("d", [0.0]) * buckets
+        self.last_bucket: Optional[int] = None
+        self.last_event: Optional[float] = None
+
+    def _advance(self, bucket: int) -> None:
+        """Move the head to ``bucket``, zeroing the buckets that expired on the way."""
+        if self.last_bucket is None:
+            self.last_bucket = bucket
+            return
+        if bucket <= self.last_bucket:
+            return
+        for stale in range(self.last_bucket + 1, min(bucket, self.last_bucket + self.buckets) + 1):
+            self.counts[stale % self.buckets] = 0.0
+        self.last_bucket = bucket
+
+    def add(self, timestamp: float, amount: float = 1.0) -> None:
+        """Count an event; events older than the covered span are ignored."""
+        bucket = int(timestamp // self.bucket_seconds)
+        self._advance(bucket)
+        if bucket <= self.last_bucket - self.buckets:
+            return
+        self.counts[bucket % self.buckets] += amount
+        if self.last_event is None or timestamp > self.last_event:
+            self.last_event = timestamp
+
+    def total(self, window_seconds: float, now: float) -> float:
+        """Sum of the events in the last ``window_seconds`` (whole buckets)."""
+        current = int(now // self.bucket_seconds)
+        self._advance(current)
+        span = min(max(int(window_seconds // self.bucket_seconds), 1), self.buckets)
+        counts = self.counts
+        return sum(
+            counts[bucket % self.buckets] for bucket in range(current - span + 1, current + 1)
+        )
+
+    def per_bucket(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """(bucket start, count) pairs of the non-empty buckets between two timestamps."""
+        if self.last_bucket is None:
+            return []
+        first = max(int(start // self.bucket_seconds), self.last_bucket - self.buckets + 1)
+        last = min(int(end // self.bucket_seconds), self.last_bucket)
+        counts = self.counts
+        return [
+            (bucket * self.bucket_seconds, counts[bucket % self.buckets])
+            for bucket in range(first, last + 1)
+            if counts[bucket % self.buckets]
+        ]
+
+
+class EventCounters:
+    """Sliding-window counters keyed by source (camera, device) and event type."""
+
+    def __init__(self, bucket_seconds: int = 60, retention_seconds: int = 24 * 3600):
+        """Initialize the counters.
+
+        Args:
+            bucket_seconds: Width of one bucket (default one minute)
+            retention_seconds: Longest window that can be queried (default one day)
+        """
+        self.bucket_seconds = bucket_seconds
+        self.buckets = max(retention_seconds // bucket_seconds, 1)
+        self._counters: Dict[Tuple[str, str], WindowCounter] = {}
+        self._lock = threading.Lock()
+
+    def _counter(self, source_id: str, event_type: str) -> WindowCounter:
+        key = (source_id, event_type)
+        counter = self._counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(
+                    key, WindowCounter(self.bucket_seconds, self.buckets)
+                )
+        return counter
+
+    def record(
+        self,
+        source_id: str,
+        event_type: str,
+        timestamp: Optional[float] = None,
+        amount: float = 1.0,
+    ) -> None:
+        """Record an event (or ``amount`` units of it) for a source."""
+        timestamp = time.time() if timestamp is None else timestamp
+        counter = self._counter(source_id, event_type)
+        with self._lock:
+            counter.add(timestamp, amount)
+
+    def count(
+        self, source_id: str, event_type: str, window_seconds: float, now: Optional[float] = None
+    ) -> float:
+        """Number of events of a source in the trailing window."""
+        counter = self._counters.get((source_id, event_type))
+        if counter is None:
+            return 0
+        now = time.time() if now is None else now
+        with self._lock:
+            return counter.total(window_seconds, now)
+
+    def rate(
+        self, source_id: str, event_type: str, window_seconds: float, now: Optional[float] = None
+    ) -> float:
+        """Average events per hour over the trailing window."""
+        return self.count(source_id, event_type, window_seconds, now) * 3600 / window_seconds
+
+    def per_bucket(
+        self, source_id: str, event_type: str, start: float, end: float
+    ) -> List[Tuple[float, float]]:
+        """Per-bucket event counts of a source between two timestamps."""
+        counter = self._counters.get((source_id, event_type))
+        if counter is None:
+            return []
+        with self._lock:
+            return counter.per_bucket(start, end)
+
+    def last_event(self, source_id: str, event_type: str) -> Optional[datetime]:
+        """Time of the most recent event of a source, if any was recorded."""
+        counter = self._counters.get((source_id, event_type))
+        if counter is None or counter.last_event is None:
+            return None
+        return datetime.fromtimestamp(counter.last_event)
+
+    def sources(self, event_type: Optional[str] = None) -> List[str]:
+        """Sources with recorded events, optionally of one event type."""
+        return sorted({source for source, kind in self._counters if event_type in (None, kind)})
+
+    def summary(
+        self, source_id: str, event_type: str, now: Optional[float] = None
+    ) -> Dict[str, object]:
+        """Counts of the last hour and day plus the last event time."""
+        last = self.last_event(source_id, event_type)
+        return {
+            f"{event_type}_events_1h": int(self.count(source_id, event_type, 3600, now)),
+            f"{event_type}_events_24h": int(self.count(source_id, event_type, 24 * 3600, now)),
+            f"last_{event_type}_time": last.isoformat() if last else None,
+        }
+
+
+# Global instance
+event_counters = EventCounters()
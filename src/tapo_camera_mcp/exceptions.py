@@ -45,3 +45,7 @@ class TimeoutError(TapoCameraError):
 
 class FirmwareError(TapoCameraError):
     """Raised when there is a firmware-related error."""
+
+
+class DiagnosticsBusyError(TapoCameraError):
+    """Raised when a diagnostic capture is requested while another one is running."""
@@ -0,0 +1,133 @@
+"""
+Grafana JSON datasource over the metrics history.
+
+Implements the ``/search``, ``/query`` and ``/annotations`` calls of the
+Grafana JSON (SimpleJSON) datasource. Bucketing, aggregation and the
+``maxDataPoints`` limit are applied server-side against the ring-buffer
+history, so a panel receives only the points it draws rather than the full
+series. Annotations are built from the minute buckets of the event counters.
+"""
+
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .event_counters import EventCounters
+from .event_counters import event_counters as default_event_counters
+from .metrics_history import AGGREGATIONS, MetricsHistory, parse_selector
+
+
+def _parse_time(value: Any) -> float:
+    """Parse epoch milliseconds or an ISO 8601 time into seconds since the epoch."""
+    if isinstance(value, (int, float)):
+        return value / 1000
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def _series_name(name: str, labels: Dict[str, str]) -> str:
+    if not labels:
+        return name
+    pairs = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{pairs}}}"
+
+
+class GrafanaDatasource:
+    """Answer Grafana JSON datasource requests from the metrics history."""
+
+    def __init__(self, history: MetricsHistory, counters: Optional[EventCounters] = None):
+        """Initialize the datasource.
+
+        Args:
+            history: History the time series are read from
+            counters: Event counters annotations are read from. Defaults to the
+                global event counters.
+        """
+        self.history = history
+        self.counters = counters if counters is not None else default_event_counters
+
+    def search(self, target: str = "") -> List[str]:
+        """Metric names and series selectors containing ``target``."""
+        names = self.history.series_names()
+        selectors = [
+            _series_name(name, labels)
+            for name in names
+            for labels, _ring in self.history.select(name)
+        ]
+        return [item for item in names + sorted(selectors) if target in item]
+
+    def step(self, start: float, end: float, interval_ms: float, max_points: int) -> float:
+        """Bucket width honouring the panel interval, ``maxDataPoints`` and resolution."""
+        resolution = self.history.resolution
+        step = max(interval_ms / 1000, (end - start) / max(max_points, 1), resolution)
+        return math.ceil(step / resolution) * resolution
+
+    def query(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Answer a ``/query`` request with one time series per matching series.
+
+        Each target may choose its aggregation with ``{"data": {"agg": "max"}}``.
+
+        Raises:
+            ValueError: If a target or aggregation is not supported
+        """
+        time_range = request.get("range") or {}
+        start = _parse_time(time_range["from"])
+        end = _parse_time(time_range["to"])
+        step = self.step(
+            start, end, request.get("intervalMs") or 0, request.get("maxDataPoints") or 1000
+        )
+
+        result = []
+        for target in request.get("targets") or []:
+            if target.get("hide") or not target.get("target"):
+                continue
+            aggregation = (target.get("data") or {}).get("agg", "avg")
+            if aggregation not in AGGREGATIONS:
+                raise ValueError(f"Unsupported aggregation: {aggregation}")
+            name, matchers = parse_selector(target["target"])
+            for labels, ring in self.history.select(name, matchers):
+                points = ring.query(start, end, step, aggregation)
+                result.append(
+                    {
+                        "target": _series_name(name, labels),
+                        "refId": target.get("refId"),
+                        "datapoints": [
+                            [round(value, 4), int(timestamp * 1000)] for timestamp, value in points
+                        ],
+                    }
+                )
+        return result
+
+    def annotations(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Answer an ``/annotations`` request from the event counters.
+
+        The annotation query names an event type, optionally restricted to one
+        source: ``motion`` or ``motion{source_id="porch"}``. Every minute with
+        events becomes one annotation.
+
+        Raises:
+            ValueError: If the annotation query cannot be parsed
+        """
+        time_range = request.get("range") or {}
+        start = _parse_time(time_range["from"])
+        end = _parse_time(time_range["to"])
+        annotation = request.get("annotation") or {}
+        event_type, matchers = parse_selector(annotation.get("query") or "motion")
+
+        sources = self.counters.sources(event_type)
+        if "source_id" in matchers:
+            sources = [source for source in sources if source == matchers["source_id"]]
+        result = []
+        for source in sources:
+            for timestamp, events in self.counters.per_bucket(source, event_type, start, end):
+                count = int(events)
+                result.append(
+                    {
+                        "annotation": annotation,
+                        "time": int(timestamp * 1000),
+                        "title": f"{source}: {event_type}",
+                        "text": f"{count} {event_type} event{'s' if count != 1 else ''}",
+                        "tags": [event_type, source],
+                    }
+                )
+        result.sort(key=lambda item: item["time"])
+        return result
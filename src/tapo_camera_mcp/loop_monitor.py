@@ -0,0 +1,177 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+A coroutine wakes up every ``interval`` seconds and measures how late it was
+scheduled; the lag is published as the ``event_loop_lag_seconds`` histogram.
+Each wake-up also stamps a heartbeat. A watchdog thread checks the heartbeat,
+and when the loop has not come back for longer than ``threshold`` it captures
+the stack of the loop thread -- i.e. of the callback that is blocking it, such
+as a synchronous ``cap.read()`` or ``image.save`` inside a coroutine. Stack
+captures are rate-limited and kept in a short list of recent stalls.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional
+
+from .prometheus import MetricsRegistry
+from .prometheus import registry as prometheus_registry
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LoopLagMonitor:
+    """Measure event-loop scheduling lag and capture the stacks of stalls."""
+
+    def __init__(
+        self,
+        interval: float = 0.25,
+        threshold: float = 0.25,
+        stack_interval: float = 30.0,
+        max_stalls: int = 20,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag samples
+            threshold: Seconds the loop may be blocked before its stack is captured
+            stack_interval: Minimum seconds between two stack captures
+            max_stalls: Number of recent stalls kept
+            registry: Prometheus registry the lag metrics are exported to.
+                Defaults to the global registry.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_interval = stack_interval
+        registry = registry if registry is not None else prometheus_registry
+        self.lag = registry.histogram(
+            "event_loop_lag_seconds", "Delay of scheduled event loop callbacks", (), LAG_BUCKETS
+        )
+        self.max_lag = registry.gauge(
+            "event_loop_lag_max_seconds", "Largest event loop lag of the current minute"
+        )
+        self.stalls_total = registry.counter(
+            "event_loop_stalls_total", "Times the event loop was blocked beyond the threshold"
+        )
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=max_stalls)
+        self._heartbeat = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_capture = -float("inf")
+        self._window_max = 0.0
+        self._window_start = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the monitor is sampling."""
+        return self._task is not None and not self._task.done()
+
+    def configure(self, settings: Dict[str, Any]) -> None:
+        """Apply the ``loop_monitor`` section of the configuration."""
+        self.interval = float(settings.get("interval", self.interval))
+        self.threshold = float(settings.get("threshold", self.threshold))
+        self.stack_interval = float(settings.get("stack_interval", self.stack_interval))
+
+    def start(self) -> None:
+        """Start sampling the running event loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop = asyncio.get_event_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop = threading.Event()
+        self._task = asyncio.ensure_future(self._sample())
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(self._stop,), name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info("Event loop monitor started (stall threshold %.0f ms)", self.threshold * 1000)
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def record_lag(self, lag: float) -> None:
+        """Record one lag sample."""
+        lag = max(lag, 0.0)
+        self.lag.observe(lag)
+        now = time.monotonic()
+        if now - self._window_start >= 60:
+            self._window_start, self._window_max = now, 0.0
+        if lag > self._window_max:
+            self._window_max = lag
+            self.max_lag.set(lag)
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.record_lag(now - expected)
+
+    def _watch(self, stop: threading.Event) -> None:
+        """Watchdog thread: capture the loop thread's stack while it is blocked."""
+        reported = None
+        while not stop.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked <= self.threshold or heartbeat == reported:
+                continue
+            if self._loop is None or not self._loop.is_running():
+                continue  # loop stopped, not blocked
+            reported = heartbeat  # one report per stall
+            self.stalls_total.inc()
+            self.capture_stall(blocked)
+
+    def capture_stall(self, blocked: float) -> Optional[Dict[str, Any]]:
+        """Capture the loop thread's stack, unless a stack was captured recently."""
+        now = time.monotonic()
+        if now - self._last_capture < self.stack_interval:
+            return None
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        self._last_capture = now
+        stack = "".join(traceback.format_stack(frame))
+        stall = {
+            "detected_at": datetime.now().isoformat(),
+            "blocked_seconds": round(blocked, 3),
+            "stack": stack,
+        }
+        self.stalls.append(stall)
+        logger.warning("Event loop blocked for more than %.0f ms in:\n%s", blocked * 1000, stack)
+        return stall
+
+    def report(self) -> Dict[str, Any]:
+        """Lag percentiles and recent stalls."""
+        child = self.lag.labels()
+        return {
+            "running": self.running,
+            "samples": child.count,
+            "lag_p50_ms": round(child.quantile(0.5) * 1000, 3) if child.count else None,
+            "lag_p99_ms": round(child.quantile(0.99) * 1000, 3) if child.count else None,
+            "lag_max_ms": round(self._window_max * 1000, 3),
+            "stalls_total": int(self.stalls_total.labels().value),
+            "recent_stalls": list(self.stalls),
+        }
+
+
+# Global instance
+loop_monitor = LoopLagMonitor()
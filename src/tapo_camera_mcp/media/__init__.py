@@ -0,0 +1,47 @@
+"""
+Media storage services for Tapo Camera MCP.
+
+This package works on the recordings and snapshots kept under the configured
+storage directories (see ``StorageSettings``).
+"""
+
+from .blob_store import Blob, BlobStore, blob_store
+from .clips import ClipExporter, ClipExportProgress, RecordingSegment, clip_exporter
+from .jobs import Job, JobManager, job_manager
+from .scheduler import (
+    CachedFrame,
+    LatestFrameCache,
+    SnapshotScheduler,
+    frame_cache,
+    snapshot_scheduler,
+)
+from .snapshot_store import SnapshotEntry, SnapshotStore, snapshot_store
+from .thumbnails import Thumbnail, ThumbnailService, thumbnail_service
+from .timelapse import TimelapseBuilder, TimelapseProgress, timelapse_builder
+
+__all__ = [
+    "Blob",
+    "BlobStore",
+    "CachedFrame",
+    "ClipExportProgress",
+    "ClipExporter",
+    "Job",
+    "JobManager",
+    "LatestFrameCache",
+    "RecordingSegment",
+    "SnapshotEntry",
+    "SnapshotScheduler",
+    "SnapshotStore",
+    "Thumbnail",
+    "ThumbnailService",
+    "TimelapseBuilder",
+    "TimelapseProgress",
+    "blob_store",
+    "clip_exporter",
+    "frame_cache",
+    "job_manager",
+    "snapshot_scheduler",
+    "snapshot_store",
+    "thumbnail_service",
+    "timelapse_builder",
+]
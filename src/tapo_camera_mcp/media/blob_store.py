@@ -0,0 +1,157 @@
+"""
+Content-addressed store for binary tool results.
+
+Inlining images in tool results as base64 grows every MCP message by a third
+and makes clients parse megabytes of JSON they may never look at. Tools put
+the bytes here instead and return a reference: the SHA-256 of the content as
+an MCP resource URI (``tapo://snapshots/<sha256>``) and as a REST path
+(``/api/media/blobs/<sha256>``). Clients read the bytes through either only
+when they need them.
+
+Blobs live in memory. Each one expires ``ttl`` seconds after it was last put
+(putting the same content again renews it), and the least recently used
+blobs are dropped once the store holds more than ``max_bytes``.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+URI_SCHEME = "tapo"
+REST_PREFIX = "/api/media/blobs"
+
+
+@dataclass(frozen=True)
+class Blob:
+    """Stored content and its metadata."""
+
+    digest: str  # SHA-256 of the data
+    data: bytes
+    mime_type: str
+    kind: str  # first URI path segment, e.g. "snapshots"
+    expires_at: float  # time.time() at which the blob is dropped
+
+    @property
+    def uri(self) -> str:
+        """MCP resource URI of the blob."""
+        return blob_uri(self.kind, self.digest)
+
+    def reference(self) -> Dict[str, Any]:
+        """What a tool returns instead of the data."""
+        return {
+            "uri": self.uri,
+            "url": f"{REST_PREFIX}/{self.digest}",
+            "sha256": self.digest,
+            "mime_type": self.mime_type,
+            "size": len(self.data),
+            "expires_at": datetime.fromtimestamp(self.expires_at, timezone.utc).isoformat(),
+        }
+
+
+def blob_uri(kind: str, digest: str) -> str:
+    """Resource URI of a blob of the given kind."""
+    return f"{URI_SCHEME}://{kind}/{digest}"
+
+
+def parse_blob_uri(uri: str) -> Tuple[str, str]:
+    """Split a resource URI into its kind and digest."""
+    prefix = f"{URI_SCHEME}://"
+    kind, _, digest = uri[len(prefix) :].partition("/") if uri.startswith(prefix) else ("", "", "")
+    if not kind or not digest:
+        raise ValueError(f"Not a blob URI: {uri}")
+    return kind, digest
+
+
+class BlobStore:
+    """In-memory content-addressed blob store with TTL and size-bounded eviction."""
+
+    def __init__(self, ttl: float = 600.0, max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the store.
+
+        Args:
+            ttl: Seconds a blob is kept after it was last put
+            max_bytes: Total size above which least recently used blobs are dropped
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._blobs: "OrderedDict[str, Blob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Apply the ``blob_store`` configuration section."""
+        self.ttl = float(config.get("ttl", self.ttl))
+        if "max_mb" in config:
+            self.max_bytes = int(float(config["max_mb"]) * 1024 * 1024)
+
+    def put(
+        self,
+        data: bytes,
+        mime_type: str = "image/jpeg",
+        kind: str = "snapshots",
+        ttl: Optional[float] = None,
+    ) -> Blob:
+        """Store content, or renew it if it is already stored, and return its blob."""
+        digest = hashlib.sha256(data).hexdigest()
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            previous = self._blobs.pop(digest, None)
+            if previous is not None:
+                self.size -= len(previous.data)
+                expires_at = max(expires_at, previous.expires_at)
+            blob = Blob(digest, data, mime_type, kind, expires_at)
+            self._blobs[digest] = blob
+            self.size += len(data)
+            self._evict()
+        return blob
+
+    def get(self, digest: str) -> Optional[Blob]:
+        """The blob with a digest, or None if it is unknown or expired."""
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is None:
+                return None
+            if blob.expires_at <= time.time():
+                self._drop(digest)
+                return None
+            self._blobs.move_to_end(digest)
+            return blob
+
+    def resolve(self, uri: str) -> Optional[Blob]:
+        """The blob a resource URI refers to."""
+        kind, digest = parse_blob_uri(uri)
+        blob = self.get(digest)
+        return blob if blob is not None and blob.kind == kind else None
+
+    def purge(self) -> int:
+        """Drop expired blobs and return how many were dropped."""
+        now = time.time()
+        with self._lock:
+            expired = [digest for digest, blob in self._blobs.items() if blob.expires_at <= now]
+            for digest in expired:
+                self._drop(digest)
+        return len(expired)
+
+    def _drop(self, digest: str) -> None:
+        self.size -= len(self._blobs.pop(digest).data)
+
+    def _evict(self) -> None:
+        now = time.time()
+        for digest in [d for d, blob in self._blobs.items() if blob.expires_at <= now]:
+            self._drop(digest)
+        # Keep the newest blob even if it alone exceeds the limit
+        while self.size > self.max_bytes and len(self._blobs) > 1:
+            self._drop(next(iter(self._blobs)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Number and total size of stored blobs."""
+        with self._lock:
+            return {"blobs": len(self._blobs), "bytes": self.size, "max_bytes": self.max_bytes}
+
+
+# Global instance
+blob_store = BlobStore()
@@ -0,0 +1,476 @@
+"""
+Clip export for stored camera recordings.
+
+Finds the recording segments of a camera that overlap a time range and joins
+them into one file with FFmpeg's concat demuxer in stream-copy mode. Segments
+are cut at keyframes and nothing is re-encoded, so an export is bounded by disk
+throughput rather than CPU.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..config import get_storage_settings
+from ..exceptions import StorageError
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {".mp4", ".mkv", ".mov", ".ts", ".avi"}
+
+# Matches timestamps such as 20240501_140200, 20240501T140200 or 2024-05-01_14-02-00
+_FILENAME_TIMESTAMP = re.compile(
+    r"(\d{4})-?(\d{2})-?(\d{2})[_T\- ]?(\d{2})[-:]?(\d{2})[-:]?(\d{2})"
+)
+
+
+# Camera ids become path components below the media directories
+_CAMERA_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.\-]*$")
+
+
+def check_camera_id(camera_id: str) -> str:
+    """Return a camera id that is safe to use as a file or directory name.
+
+    Raises:
+        ValueError: If the id contains path separators or other unsafe characters
+    """
+    if not _CAMERA_ID.match(camera_id or ""):
+        raise ValueError(f"Invalid camera id: {camera_id!r}")
+    return camera_id
+
+
+def confine_output_path(
+    output_path: Union[str, Path], directory: Path, extensions: Iterable[str]
+) -> Path:
+    """Resolve a requested output file, which has to lie inside ``directory``.
+
+    Relative paths are taken relative to ``directory``.
+
+    Raises:
+        ValueError: If the path leaves the directory or has an unsupported extension
+    """
+    directory = directory.resolve()
+    output = (directory / output_path).resolve()
+    if directory not in output.parents:
+        raise ValueError(f"output_path must be inside {directory}")
+    if output.suffix.lower() not in extensions:
+        raise ValueError(f"output_path must end in one of {', '.join(sorted(extensions))}")
+    return output
+
+
+def partial_output(output: Path) -> Path:
+    """Create an empty, uniquely named file next to ``output`` to write into first.
+
+    Writers fill the partial file and rename it to ``output`` once it is
+    complete, so a failed write never truncates or deletes an existing file.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=output.parent, prefix=f".{output.stem}.", suffix=output.suffix)
+    os.close(fd)
+    return Path(name)
+
+
+def to_local_naive(value: datetime) -> datetime:
+    """Convert a datetime to naive local time, the convention used for stored media."""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp (a trailing ``Z`` is accepted) into naive local time.
+
+    Raises:
+        ValueError: If the value is not a valid ISO 8601 timestamp
+    """
+    return to_local_naive(datetime.fromisoformat(value.strip().replace("Z", "+00:00")))
+
+
+def parse_recording_timestamp(filename: str) -> Optional[datetime]:
+    """Extract the start time encoded in a recording or snapshot file name.
+
+    Args:
+        filename: File name such as ``front_door_20240501_140200.mp4``
+
+    Returns:
+        The start time, or None if the name carries no timestamp
+    """
+    match = _FILENAME_TIMESTAMP.search(filename)
+    if not match:
+        return None
+    try:
+        return datetime(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+def recording_camera_id(filename: str) -> Optional[str]:
+    """Extract the camera id a recording or snapshot file name starts with.
+
+    Args:
+        filename: File name such as ``front_door_20240501_140200.mp4``
+
+    Returns:
+        The camera id (``front_door``), or None if the name carries no
+        timestamp or nothing precedes it
+    """
+    match = _FILENAME_TIMESTAMP.search(filename)
+    if not match:
+        return None
+    return filename[: match.start()].rstrip("_-. ") or None
+
+
+@dataclass
+class RecordingSegment:
+    """A single recording file and the time span it covers."""
+
+    path: Path
+    start: datetime
+    duration: float  # seconds
+
+    @property
+    def end(self) -> datetime:
+        """Time at which the segment ends."""
+        return self.start + timedelta(seconds=self.duration)
+
+
+@dataclass
+class ClipExportProgress:
+    """Progress update emitted while a clip is exported."""
+
+    stage: str  # planning, copying or done
+    progress: float = 0.0  # 0.0 - 1.0
+    bytes_written: int = 0
+    segments: int = 0
+    output_path: Optional[str] = None
+    message: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the progress update to a dictionary for JSON serialization."""
+        return asdict(self)
+
+
+def build_concat_script(segments: List[RecordingSegment], start: datetime, end: datetime) -> str:
+    """Build an ffconcat script that trims the first and last segments to the range.
+
+    With stream copy the demuxer starts each segment at the keyframe preceding
+    ``inpoint``, so cuts land on keyframes without decoding anything.
+    """
+    lines = ["ffconcat version 1.0"]
+    for segment in segments:
+        escaped = str(segment.path.resolve()).replace("'", "'\\''")
+        lines.append(f"file '{escaped}'")
+        inpoint = (start - segment.start).total_seconds()
+        if inpoint > 0:
+            lines.append(f"inpoint {inpoint:.3f}")
+        outpoint = (end - segment.start).total_seconds()
+        if outpoint < segment.duration:
+            lines.append(f"outpoint {outpoint:.3f}")
+    return "\n".join(lines) + "\n"
+
+
+def clip_duration(segments: List[RecordingSegment], start: datetime, end: datetime) -> float:
+    """Total duration in seconds of the parts of the segments inside the range."""
+    total = 0.0
+    for segment in segments:
+        clip_start = max(segment.start, start)
+        clip_end = min(segment.end, end)
+        total += max((clip_end - clip_start).total_seconds(), 0.0)
+    return total
+
+
+class ClipExporter:
+    """Export time ranges of stored recordings as single files."""
+
+    def __init__(
+        self,
+        recordings_dir: Optional[Union[str, Path]] = None,
+        ffmpeg_path: str = "ffmpeg",
+        ffprobe_path: str = "ffprobe",
+    ):
+        """Initialize the exporter.
+
+        Args:
+            recordings_dir: Directory holding recordings. Defaults to
+                ``StorageSettings.recordings_dir``.
+            ffmpeg_path: FFmpeg executable
+            ffprobe_path: FFprobe executable
+        """
+        self._recordings_dir = Path(recordings_dir) if recordings_dir else None
+        self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
+        # Probed durations keyed by (path, size, mtime) so unchanged files are probed once
+        self._durations: Dict[Tuple[str, int, int], float] = {}
+
+    @property
+    def recordings_dir(self) -> Path:
+        """Directory holding the recordings."""
+        if self._recordings_dir is not None:
+            return self._recordings_dir
+        return Path(get_storage_settings().recordings_dir)
+
+    def _candidate_files(self, camera_id: str) -> List[Path]:
+        """List the video files that belong to a camera.
+
+        Recordings live either in a per-camera subdirectory or directly in the
+        recordings directory, named ``<camera id>_<timestamp>``.
+        """
+        camera_dir = self.recordings_dir / check_camera_id(camera_id)
+        if camera_dir.is_dir():
+            candidates = camera_dir.rglob("*")
+        elif self.recordings_dir.is_dir():
+            # front_* also matches front_yard_*, so compare the whole id
+            candidates = (
+                path
+                for path in self.recordings_dir.glob(f"{camera_id}_*")
+                if recording_camera_id(path.name) == camera_id
+            )
+        else:
+            return []
+        return sorted(
+            path
+            for path in candidates
+            if path.suffix.lower() in VIDEO_EXTENSIONS and path.is_file()
+        )
+
+    async def _probe_duration(self, path: Path) -> float:
+        """Read the container duration of a recording with ffprobe."""
+        process = await asyncio.create_subprocess_exec(
+            self.ffprobe_path,
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            str(path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+        try:
+            return float(stdout.decode().strip())
+        except ValueError:
+            logger.warning("Could not determine duration of recording %s", path)
+            return 0.0
+
+    async def _duration(self, path: Path, size: int, mtime: float) -> float:
+        key = (str(path), size, int(mtime))
+        if key not in self._durations:
+            self._durations[key] = await self._probe_duration(path)
+        return self._durations[key]
+
+    async def find_segments(
+        self, camera_id: str, start: datetime, end: datetime
+    ) -> List[RecordingSegment]:
+        """Find the recording segments of a camera that overlap a time range.
+
+        Args:
+            camera_id: Camera whose recordings to search
+            start: Start of the range
+            end: End of the range
+
+        Returns:
+            Overlapping segments ordered by start time
+        """
+        start = to_local_naive(start)
+        end = to_local_naive(end)
+        segments = []
+        for path in self._candidate_files(camera_id):
+            stat = path.stat()
+            # A file last written before the range starts cannot overlap it
+            if datetime.fromtimestamp(stat.st_mtime) < start:
+                continue
+            file_start = parse_recording_timestamp(path.name)
+            if file_start is not None and file_start >= end:
+                continue
+
+            duration = await self._duration(path, stat.st_size, stat.st_mtime)
+            if duration <= 0:
+                continue
+            if file_start is None:
+                file_start = datetime.fromtimestamp(stat.st_mtime) - timedelta(seconds=duration)
+
+            segment = RecordingSegment(path=path, start=file_start, duration=duration)
+            if segment.end > start and segment.start < end:
+                segments.append(segment)
+
+        segments.sort(key=lambda segment: segment.start)
+        return segments
+
+    @property
+    def exports_dir(self) -> Path:
+        """Directory exported clips are written to."""
+        return self.recordings_dir / "exports"
+
+    def default_output_path(
+        self, camera_id: str, start: datetime, end: datetime, suffix: str = ".mp4"
+    ) -> Path:
+        """Output location used when the caller does not choose one."""
+        name = f"{camera_id}_{start:%Y%m%d_%H%M%S}-{end:%Y%m%d_%H%M%S}{suffix}"
+        return self.exports_dir / name
+
+    async def export(
+        self,
+        camera_id: str,
+        start: datetime,
+        end: datetime,
+        output_path: Optional[Union[str, Path]] = None,
+    ) -> AsyncIterator[ClipExportProgress]:
+        """Export the recordings of a camera between two times as a single file.
+
+        Args:
+            camera_id: Camera whose recordings to export
+            start: Start of the range
+            end: End of the range
+            output_path: Destination file inside ``exports_dir`` (relative paths
+                are taken relative to it). Defaults to a name made of the camera
+                id and the range.
+
+        Yields:
+            Progress updates, ending with a ``done`` update carrying the output path
+
+        Raises:
+            ValueError: If the range is empty, the camera id is not a plain name
+                or the output path is outside ``exports_dir``
+            StorageError: If FFmpeg is unavailable, no recordings overlap the
+                range or FFmpeg fails
+        """
+        start = to_local_naive(start)
+        end = to_local_naive(end)
+        if end <= start:
+            raise ValueError("end must be after start")
+        check_camera_id(camera_id)
+        if output_path:
+            output_path = confine_output_path(output_path, self.exports_dir, VIDEO_EXTENSIONS)
+        if shutil.which(self.ffmpeg_path) is None:
+            raise StorageError(f"FFmpeg executable not found: {self.ffmpeg_path}")
+
+        yield ClipExportProgress(stage="planning", message="Locating recordings")
+        segments = await self.find_segments(camera_id, start, end)
+        if not segments:
+            raise StorageError(
+                f"No recordings for camera {camera_id} between {start.isoformat()} "
+                f"and {end.isoformat()}"
+            )
+
+        output = output_path or self.default_output_path(
+            camera_id, start, end, segments[0].path.suffix
+        )
+        total_seconds = clip_duration(segments, start, end)
+        logger.info(
+            "Exporting %.1fs of %s from %d segments to %s",
+            total_seconds,
+            camera_id,
+            len(segments),
+            output,
+        )
+
+        partial = partial_output(output)
+        try:
+            with tempfile.TemporaryDirectory(prefix="tapo-clip-") as temp_dir:
+                script = Path(temp_dir) / "segments.ffconcat"
+                script.write_text(build_concat_script(segments, start, end), encoding="utf-8")
+
+                process = await asyncio.create_subprocess_exec(
+                    self.ffmpeg_path,
+                    "-hide_banner",
+                    "-nostdin",
+                    "-loglevel",
+                    "error",
+                    "-y",
+                    "-f",
+                    "concat",
+                    "-safe",
+                    "0",
+                    "-i",
+                    str(script),
+                    "-map",
+                    "0",
+                    "-c",
+                    "copy",
+                    "-avoid_negative_ts",
+                    "make_zero",
+                    "-progress",
+                    "pipe:1",
+                    "-nostats",
+                    str(partial),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stderr_task = asyncio.ensure_future(process.stderr.read())
+                try:
+                    async for progress in self._read_progress(
+                        process, total_seconds, len(segments)
+                    ):
+                        yield progress
+                    returncode = await process.wait()
+                    stderr = await stderr_task
+                except BaseException:
+                    if process.returncode is None:
+                        process.kill()
+                        await process.wait()
+                    stderr_task.cancel()
+                    raise
+
+            if returncode != 0:
+                raise StorageError(
+                    f"FFmpeg failed to export clip: {stderr.decode(errors='replace').strip()}"
+                )
+            partial.replace(output)
+        except BaseException:
+            # Whatever failed, leave no partial file next to the output
+            with contextlib.suppress(OSError):
+                partial.unlink()
+            raise
+
+        yield ClipExportProgress(
+            stage="done",
+            progress=1.0,
+            bytes_written=output.stat().st_size,
+            segments=len(segments),
+            output_path=str(output),
+            message=f"Exported {total_seconds:.1f}s from {len(segments)} segment(s)",
+        )
+
+    async def _read_progress(
+        self, process: asyncio.subprocess.Process, total_seconds: float, segment_count: int
+    ) -> AsyncIterator[ClipExportProgress]:
+        """Translate FFmpeg ``-progress`` key/value blocks into progress updates."""
+        values: Dict[str, str] = {}
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            key, _, value = line.decode(errors="replace").strip().partition("=")
+            values[key] = value
+            if key != "progress":
+                continue
+
+            try:
+                out_seconds = int(values.get("out_time_us", "0")) / 1_000_000
+            except ValueError:
+                out_seconds = 0.0
+            try:
+                bytes_written = int(values.get("total_size", "0"))
+            except ValueError:
+                bytes_written = 0
+            fraction = min(out_seconds / total_seconds, 1.0) if total_seconds > 0 else 0.0
+            yield ClipExportProgress(
+                stage="copying",
+                progress=round(fraction, 4),
+                bytes_written=bytes_written,
+                segments=segment_count,
+            )
+
+
+# Global instance
+clip_exporter = ClipExporter()
@@ -0,0 +1,73 @@
+"""
+Image decoding helpers shared by the media services.
+"""
+
+import io
+from pathlib import Path
+from typing import Callable, Tuple, Union
+
+from PIL import Image
+
+ImageSource = Union[str, Path, bytes]
+
+
+def open_scaled(source: ImageSource, size: Tuple[int, int]) -> Image.Image:
+    """Open an image, letting the JPEG decoder downscale while decoding.
+
+    For JPEG sources ``Image.draft`` configures the decoder to scale by 1/2, 1/4
+    or 1/8 in the DCT domain, choosing the largest reduction that still yields
+    at least ``size``. The image is not resampled; callers resize the result to
+    the exact size they need.
+
+    Args:
+        source: File path or encoded image bytes
+        size: Requested (width, height)
+
+    Returns:
+        The opened image (decoded lazily on first access)
+    """
+    image, _ = open_fitted(source, lambda _: size)
+    return image
+
+
+def open_fitted(
+    source: ImageSource, fit: Callable[[Tuple[int, int]], Tuple[int, int]]
+) -> Tuple[Image.Image, Tuple[int, int]]:
+    """Like ``open_scaled``, with the requested size computed from the source size.
+
+    Returns:
+        The opened image and the size ``fit`` returned
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    image = Image.open(source)
+    size = fit(image.size)
+    if image.format == "JPEG":
+        image.draft("RGB", size)
+    return image, size
+
+
+def encoded_size(data: bytes) -> Tuple[int, int]:
+    """Width and height of an encoded image, read from its header without decoding."""
+    with Image.open(io.BytesIO(data)) as image:
+        return image.size
+
+
+def decode_scaled(source: ImageSource, size: Tuple[int, int]) -> Image.Image:
+    """Decode an image to RGB at exactly ``size`` using draft-mode scaling first."""
+    with open_scaled(source, size) as image:
+        frame = image.convert("RGB")
+    if frame.size != size:
+        frame = frame.resize(size, Image.BILINEAR)
+    return frame
+
+
+def scaled_size(source_size: Tuple[int, int], width: int) -> Tuple[int, int]:
+    """Size with the given width (capped at the source width) and the source aspect ratio.
+
+    Both dimensions are rounded down to even numbers, as most video encoders require.
+    """
+    source_width, source_height = source_size
+    width = min(width, source_width)
+    height = round(source_height * width / source_width)
+    return max(width - width % 2, 2), max(height - height % 2, 2)
@@ -0,0 +1,142 @@
+"""
+Background jobs for long-running media operations.
+
+A job consumes an async iterator of progress updates (as produced by the clip
+exporter and the timelapse builder) in a background task and keeps the latest
+state so REST clients can poll it.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    """State of a background job."""
+
+    job_id: str
+    kind: str
+    status: str = "pending"  # pending, running, completed, failed, cancelled
+    progress: float = 0.0
+    message: str = ""
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    _task: Optional["asyncio.Task"] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.status in ("completed", "failed", "cancelled")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the job to a dictionary for JSON serialization."""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobManager:
+    """Run and track background jobs."""
+
+    def __init__(self, max_finished: int = 100):
+        """Initialize the job manager.
+
+        Args:
+            max_finished: Number of finished jobs kept for status queries
+        """
+        self.max_finished = max_finished
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+
+    def start(self, kind: str, updates: AsyncIterator[Any]) -> Job:
+        """Start a job that consumes progress updates in the background.
+
+        Each update must provide ``progress``, ``message`` and ``to_dict()``.
+        The last update becomes the job result.
+
+        Args:
+            kind: Job type, e.g. ``timelapse``
+            updates: Async iterator of progress updates
+
+        Returns:
+            The started job
+        """
+        job = Job(job_id=uuid.uuid4().hex, kind=kind)
+        job._task = asyncio.ensure_future(self._run(job, updates))
+        job._task.add_done_callback(lambda task: self._on_done(job, task))
+        self._jobs[job.job_id] = job
+        self._prune()
+        return job
+
+    async def _run(self, job: Job, updates: AsyncIterator[Any]) -> None:
+        job.status = "running"
+        last = None
+        try:
+            async for update in updates:
+                last = update
+                job.progress = update.progress
+                job.message = update.message
+            job.status = "completed"
+            job.progress = 1.0
+            job.result = last.to_dict() if last is not None else None
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception("%s job %s failed", job.kind, job.job_id)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now()
+
+    @staticmethod
+    def _on_done(job: Job, task: "asyncio.Task") -> None:
+        # A job cancelled before it started never ran its own bookkeeping
+        if task.cancelled() and not job.done:
+            job.status = "cancelled"
+            job.finished_at = datetime.now()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id."""
+        return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        """List tracked jobs, optionally filtered by kind."""
+        return [job for job in self._jobs.values() if kind is None or job.kind == kind]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a running job.
+
+        Returns:
+            True if the job was running and has been cancelled
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done or job._task is None:
+            return False
+        job._task.cancel()
+        return True
+
+
+# Global instance
+job_manager = JobManager()
@@ -0,0 +1,277 @@
+"""
+Periodic snapshot scheduler with a latest-frame cache.
+
+Dashboard tiles, Grafana image panels and analysis tools all want the current
+picture of a camera. Instead of each of them triggering a live capture, the
+scheduler captures every camera once per interval and keeps the most recent
+JPEG in memory, so reads become dictionary lookups.
+
+Capture times are staggered: with ``n`` cameras, camera ``i`` is captured at
+offset ``interval * i / n`` within each interval, spreading the load on the
+network and the cameras evenly instead of capturing all of them at once.
+"""
+
+import asyncio
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .imaging import encoded_size
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedFrame:
+    """Most recent snapshot of a camera."""
+
+    camera_id: str
+    data: bytes  # JPEG
+    captured_at: datetime
+    width: int
+    height: int
+    _monotonic: float = field(default_factory=time.monotonic, repr=False)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the frame was captured."""
+        return time.monotonic() - self._monotonic
+
+    @property
+    def source_id(self) -> str:
+        """Identifier of this particular capture, used as a thumbnail cache key."""
+        return f"{self.camera_id}@{self.captured_at.isoformat()}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the frame (without image data) for JSON serialization."""
+        return {
+            "camera_id": self.camera_id,
+            "captured_at": self.captured_at.isoformat(),
+            "age": round(self.age, 3),
+            "width": self.width,
+            "height": self.height,
+            "size": len(self.data),
+        }
+
+
+class LatestFrameCache:
+    """In-memory cache holding the latest frame of each camera."""
+
+    def __init__(self, max_age: float = 120.0):
+        """Initialize the cache.
+
+        Args:
+            max_age: Default age in seconds after which a frame is considered stale
+        """
+        self.max_age = max_age
+        self._frames: Dict[str, CachedFrame] = {}
+
+    def put(self, frame: CachedFrame) -> None:
+        """Store a frame, replacing the previous one of the camera."""
+        self._frames[frame.camera_id] = frame
+
+    def get(self, camera_id: str, max_age: Optional[float] = None) -> Optional[CachedFrame]:
+        """Return the latest frame of a camera unless it is older than ``max_age``."""
+        frame = self._frames.get(camera_id)
+        limit = self.max_age if max_age is None else max_age
+        if frame is None or frame.age > limit:
+            return None
+        return frame
+
+    def remove(self, camera_id: str) -> None:
+        """Drop the frame of a camera."""
+        self._frames.pop(camera_id, None)
+
+    def camera_ids(self) -> List[str]:
+        """Cameras that currently have a frame."""
+        return list(self._frames)
+
+    def clear(self) -> None:
+        """Drop all frames."""
+        self._frames.clear()
+
+
+def encode_jpeg(image, quality: int = 80) -> bytes:
+    """Encode a captured PIL image as JPEG."""
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def stagger_offsets(camera_ids: List[str], interval: float) -> Dict[str, float]:
+    """Spread the capture times of the cameras evenly across one interval."""
+    count = len(camera_ids)
+    return {
+        camera_id: interval * index / count for index, camera_id in enumerate(sorted(camera_ids))
+    }
+
+
+class SnapshotScheduler:
+    """Capture every camera once per interval into a :class:`LatestFrameCache`."""
+
+    def __init__(
+        self,
+        cache: Optional[LatestFrameCache] = None,
+        interval: float = 60.0,
+        timeout: float = 15.0,
+        quality: int = 80,
+        persist: bool = False,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            cache: Frame cache to fill. Defaults to the global ``frame_cache``.
+            interval: Seconds between two captures of the same camera
+            timeout: Seconds after which a capture is abandoned
+            quality: JPEG quality of frames of cameras that do not send JPEG
+            persist: Also add every capture to the deduplicating snapshot store
+        """
+        self.cache = cache if cache is not None else frame_cache
+        self.interval = interval
+        self.timeout = timeout
+        self.quality = quality
+        self.persist = persist
+        self.camera_manager = None
+        self.failures: Dict[str, int] = {}
+        self._supervisor: Optional[asyncio.Task] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether periodic capturing is active."""
+        return self._supervisor is not None and not self._supervisor.done()
+
+    def configure(self, settings: Dict[str, Any]) -> None:
+        """Apply the ``snapshot_scheduler`` section of the configuration."""
+        self.interval = float(settings.get("interval", self.interval))
+        self.timeout = float(settings.get("timeout", self.timeout))
+        self.quality = int(settings.get("quality", self.quality))
+        self.persist = bool(settings.get("persist", self.persist))
+
+    def start(self, camera_manager) -> None:
+        """Start capturing the cameras of a camera manager in the background."""
+        self.camera_manager = camera_manager
+        if self.running:
+            return
+        # Frames stay valid for a missed capture before readers fall back to live
+        self.cache.max_age = max(self.cache.max_age, self.interval * 2)
+        self._supervisor = asyncio.ensure_future(self._supervise())
+        logger.info("Snapshot scheduler started (interval %.0fs)", self.interval)
+
+    async def stop(self) -> None:
+        """Stop periodic capturing."""
+        tasks = list(self._tasks.values())
+        if self._supervisor is not None:
+            tasks.append(self._supervisor)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._supervisor = None
+
+    async def _supervise(self) -> None:
+        """Keep one capture loop per camera, re-staggering when cameras change."""
+        scheduled: List[str] = []
+        while True:
+            camera_ids = sorted(self.camera_manager.cameras) if self.camera_manager else []
+            if camera_ids != scheduled:
+                for task in self._tasks.values():
+                    task.cancel()
+                self._tasks.clear()
+                for camera_id in set(scheduled) - set(camera_ids):
+                    self.cache.remove(camera_id)
+                for camera_id, offset in stagger_offsets(camera_ids, self.interval).items():
+                    self._tasks[camera_id] = asyncio.ensure_future(
+                        self._run_camera(camera_id, offset)
+                    )
+                scheduled = camera_ids
+            await asyncio.sleep(min(self.interval, 30.0))
+
+    async def _run_camera(self, camera_id: str, offset: float) -> None:
+        """Capture one camera at its offset within every interval."""
+        loop = asyncio.get_event_loop()
+        due = loop.time() + offset
+        while True:
+            await asyncio.sleep(max(due - loop.time(), 0.0))
+            await self.capture(camera_id)
+            due += self.interval
+            now = loop.time()
+            if due < now:
+                # Skip ticks missed by a slow capture instead of bursting to catch up
+                missed = int((now - due) // self.interval) + 1
+                due += missed * self.interval
+
+    async def capture(self, camera_id: str) -> Optional[CachedFrame]:
+        """Capture a camera now and cache the frame.
+
+        Concurrent calls for the same camera share a single capture.
+
+        Returns:
+            The new frame, or None if the capture failed
+        """
+        pending = self._inflight.get(camera_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._capture(camera_id))
+            self._inflight[camera_id] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(camera_id, None))
+        return await asyncio.shield(pending)
+
+    async def _capture(self, camera_id: str) -> Optional[CachedFrame]:
+        camera = self.camera_manager.cameras.get(camera_id) if self.camera_manager else None
+        if camera is None:
+            return None
+
+        loop = asyncio.get_event_loop()
+        try:
+            # Cameras that send JPEG hand over their bytes as they are
+            data = await asyncio.wait_for(camera.capture_jpeg(self.quality), self.timeout)
+            captured_at = datetime.now()
+            width, height = encoded_size(data)
+        except asyncio.TimeoutError:
+            self.failures[camera_id] = self.failures.get(camera_id, 0) + 1
+            logger.warning("Snapshot of %s timed out after %.0fs", camera_id, self.timeout)
+            return None
+        except Exception as e:
+            self.failures[camera_id] = self.failures.get(camera_id, 0) + 1
+            logger.warning("Snapshot of %s failed: %s", camera_id, e)
+            return None
+
+        frame = CachedFrame(camera_id, data, captured_at, width, height)
+        self.cache.put(frame)
+        self.failures.pop(camera_id, None)
+
+        if self.persist:
+            from .snapshot_store import snapshot_store
+
+            try:
+                await loop.run_in_executor(None, snapshot_store.put, camera_id, data, captured_at)
+            except Exception as e:
+                logger.warning("Could not store snapshot of %s: %s", camera_id, e)
+        return frame
+
+    async def latest(
+        self, camera_id: str, max_age: Optional[float] = None, camera_manager=None
+    ) -> Optional[CachedFrame]:
+        """Return the cached frame of a camera, capturing live if it is missing or stale.
+
+        Args:
+            camera_id: Camera to read
+            max_age: Maximum acceptable frame age in seconds (defaults to the cache's)
+            camera_manager: Camera manager used for live captures when the
+                scheduler has not been started
+        """
+        frame = self.cache.get(camera_id, max_age)
+        if frame is not None:
+            return frame
+        if self.camera_manager is None:
+            self.camera_manager = camera_manager
+        return await self.capture(camera_id)
+
+
+# Global instances
+frame_cache = LatestFrameCache()
+snapshot_scheduler = SnapshotScheduler(frame_cache)
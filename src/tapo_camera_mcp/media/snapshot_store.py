@@ -0,0 +1,253 @@
+"""
+Content-addressed, deduplicated snapshot store.
+
+Snapshots are written once per distinct content, named by their SHA-256 hash.
+Every capture still gets its own timeline entry, but exact duplicates reuse the
+existing blob and near-duplicates (small perceptual-hash distance to the last
+stored blob of the same camera, within a time window) become references to it
+instead of new files. Static scenes therefore cost one blob per window rather
+than one per capture.
+
+Layout under the store root::
+
+    blobs/ab/abcdef....jpg   content-addressed image data
+    index/<camera_id>.jsonl  append-only timeline of entries
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from PIL import Image
+
+from ..config import get_storage_settings
+from .imaging import open_scaled
+
+logger = logging.getLogger(__name__)
+
+
+def perceptual_hash(data: bytes) -> int:
+    """Compute a 64-bit difference hash (dHash) of an encoded image.
+
+    The image is decoded at the smallest JPEG draft scale, reduced to 9x8
+    grayscale pixels and each bit records whether a pixel is brighter than its
+    right-hand neighbour. Visually similar images yield hashes with a small
+    Hamming distance.
+    """
+    with open_scaled(data, (9, 8)) as image:
+        pixels = list(image.convert("L").resize((9, 8), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class SnapshotEntry:
+    """A single capture on a camera's snapshot timeline."""
+
+    camera_id: str
+    taken: datetime
+    blob: str  # SHA-256 of the stored image data
+    phash: int
+    size: int  # bytes of the captured image
+    stored: bool  # whether this capture wrote a new blob
+    reference: bool = False  # near-duplicate resolved to an earlier blob
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the entry to a dictionary for JSON serialization."""
+        return {
+            "camera_id": self.camera_id,
+            "taken": self.taken.isoformat(),
+            "blob": self.blob,
+            "phash": f"{self.phash:016x}",
+            "size": self.size,
+            "stored": self.stored,
+            "reference": self.reference,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SnapshotEntry":
+        """Create an entry from its dictionary form."""
+        return cls(
+            camera_id=data["camera_id"],
+            taken=datetime.fromisoformat(data["taken"]),
+            blob=data["blob"],
+            phash=int(data["phash"], 16),
+            size=data["size"],
+            stored=data["stored"],
+            reference=data.get("reference", False),
+        )
+
+
+class SnapshotStore:
+    """Deduplicating store for camera snapshots."""
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        near_duplicate_distance: int = 4,
+        window_seconds: int = 3600,
+    ):
+        """Initialize the store.
+
+        Args:
+            root: Store directory. Defaults to ``.store`` inside
+                ``StorageSettings.snapshots_dir``.
+            near_duplicate_distance: Maximum perceptual-hash distance (in bits)
+                for a capture to be stored as a reference; 0 disables
+                near-duplicate collapsing.
+            window_seconds: Maximum age of the blob a near-duplicate may refer
+                to, so static scenes still get a fresh image once per window.
+        """
+        self._root = Path(root) if root else None
+        self.near_duplicate_distance = near_duplicate_distance
+        self.window = timedelta(seconds=window_seconds)
+        self._lock = threading.Lock()
+        # Last blob actually written per camera: the anchor for near-duplicates
+        self._anchors: Dict[str, SnapshotEntry] = {}
+
+    @property
+    def root(self) -> Path:
+        """Store directory."""
+        if self._root is not None:
+            return self._root
+        return Path(get_storage_settings().snapshots_dir) / ".store"
+
+    def blob_path(self, blob: str) -> Path:
+        """Path of a blob in the store."""
+        return self.root / "blobs" / blob[:2] / f"{blob}.jpg"
+
+    def _index_path(self, camera_id: str) -> Path:
+        return self.root / "index" / f"{camera_id}.jsonl"
+
+    def _anchor(self, camera_id: str) -> Optional[SnapshotEntry]:
+        """Last stored blob of a camera, recovered from the index after a restart."""
+        if camera_id not in self._anchors:
+            stored = [entry for entry in self._read_index(camera_id) if entry.stored]
+            if stored:
+                self._anchors[camera_id] = stored[-1]
+        return self._anchors.get(camera_id)
+
+    def put(self, camera_id: str, data: bytes, taken: Optional[datetime] = None) -> SnapshotEntry:
+        """Add an encoded snapshot to a camera's timeline.
+
+        Args:
+            camera_id: Camera the snapshot was captured from
+            data: Encoded image (JPEG)
+            taken: Capture time (defaults to now)
+
+        Returns:
+            The timeline entry; ``stored`` tells whether a new blob was written
+        """
+        taken = taken or datetime.now()
+        digest = hashlib.sha256(data).hexdigest()
+        phash = perceptual_hash(data)
+
+        with self._lock:
+            anchor = self._anchor(camera_id)
+            blob_path = self.blob_path(digest)
+
+            if blob_path.exists():
+                entry = SnapshotEntry(camera_id, taken, digest, phash, len(data), stored=False)
+            elif (
+                anchor is not None
+                and self.near_duplicate_distance > 0
+                and abs(taken - anchor.taken) <= self.window
+                and hamming_distance(phash, anchor.phash) <= self.near_duplicate_distance
+            ):
+                entry = SnapshotEntry(
+                    camera_id, taken, anchor.blob, phash, len(data), stored=False, reference=True
+                )
+            else:
+                self._write_blob(blob_path, data)
+                entry = SnapshotEntry(camera_id, taken, digest, phash, len(data), stored=True)
+                self._anchors[camera_id] = entry
+
+            self._append_index(entry)
+        return entry
+
+    @staticmethod
+    def _write_blob(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+
+    def _append_index(self, entry: SnapshotEntry) -> None:
+        path = self._index_path(entry.camera_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry.to_dict()) + "\n")
+
+    def _read_index(self, camera_id: str) -> List[SnapshotEntry]:
+        path = self._index_path(camera_id)
+        if not path.exists():
+            return []
+        entries = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(SnapshotEntry.from_dict(json.loads(line)))
+                except (ValueError, KeyError):
+                    logger.warning("Skipping corrupt snapshot index line in %s", path)
+        return entries
+
+    def entries(
+        self,
+        camera_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[SnapshotEntry]:
+        """List the timeline entries of a camera, optionally limited to a time window."""
+        return [
+            entry
+            for entry in self._read_index(camera_id)
+            if (start is None or entry.taken >= start) and (end is None or entry.taken < end)
+        ]
+
+    def read(self, entry: SnapshotEntry) -> bytes:
+        """Read the image data an entry resolves to."""
+        return self.blob_path(entry.blob).read_bytes()
+
+    def stats(self, camera_id: str) -> Dict[str, Any]:
+        """Storage statistics for a camera's timeline."""
+        entries = self._read_index(camera_id)
+        stored = [entry for entry in entries if entry.stored]
+        logical = sum(entry.size for entry in entries)
+        physical = sum(entry.size for entry in stored)
+        return {
+            "camera_id": camera_id,
+            "entries": len(entries),
+            "blobs_written": len(stored),
+            "references": sum(1 for entry in entries if entry.reference),
+            "logical_bytes": logical,
+            "stored_bytes": physical,
+            "saved_ratio": round(1 - physical / logical, 4) if logical else 0.0,
+        }
+
+
+# Global instance
+snapshot_store = SnapshotStore()
@@ -0,0 +1,163 @@
+"""
+Thumbnail service for camera snapshots.
+
+Thumbnails are produced with DCT-domain scaling: for JPEG sources the decoder
+is asked (via ``Image.draft``) to reduce the image by 1/2, 1/4 or 1/8 while
+decoding, so a 4K frame shrunk to a dashboard tile never materialises its full
+resolution. Only the remaining small step to the exact size is resampled.
+
+Results are cached by (source id, size), so repeated requests for the same
+frame at the same size are served from memory.
+"""
+
+import asyncio
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from .imaging import ImageSource, open_fitted
+
+
+@dataclass(frozen=True)
+class Thumbnail:
+    """An encoded thumbnail."""
+
+    data: bytes  # JPEG
+    width: int
+    height: int
+
+
+def fit_size(
+    source_size: Tuple[int, int], width: Optional[int] = None, height: Optional[int] = None
+) -> Tuple[int, int]:
+    """Largest size that fits in ``width`` x ``height`` with the source aspect ratio.
+
+    Either bound may be omitted; images are never enlarged.
+    """
+    source_width, source_height = source_size
+    scale = 1.0
+    if width:
+        scale = min(scale, width / source_width)
+    if height:
+        scale = min(scale, height / source_height)
+    return max(round(source_width * scale), 1), max(round(source_height * scale), 1)
+
+
+def render_thumbnail(
+    source: ImageSource,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: int = 80,
+) -> Thumbnail:
+    """Decode an image at reduced scale and encode it as a JPEG thumbnail."""
+    image, size = open_fitted(source, lambda source_size: fit_size(source_size, width, height))
+    with image:
+        thumb = image.convert("RGB")
+    if thumb.size != size:
+        thumb = thumb.resize(size, Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    thumb.save(buffer, format="JPEG", quality=quality)
+    return Thumbnail(buffer.getvalue(), *size)
+
+
+def source_id_for(source: ImageSource) -> str:
+    """Identify a source for caching: file identity for paths, content digest for bytes."""
+    if isinstance(source, bytes):
+        return hashlib.blake2b(source, digest_size=16).hexdigest()
+    path = Path(source)
+    stat = path.stat()
+    return f"{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class ThumbnailService:
+    """Render and cache thumbnails of camera snapshots."""
+
+    def __init__(self, max_entries: int = 512, quality: int = 80):
+        """Initialize the service.
+
+        Args:
+            max_entries: Number of thumbnails kept in the LRU cache
+            quality: JPEG quality of rendered thumbnails
+        """
+        self.max_entries = max_entries
+        self.quality = quality
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Tuple[str, Optional[int], Optional[int]], Thumbnail]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def thumbnail(
+        self,
+        source: ImageSource,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        source_id: Optional[str] = None,
+    ) -> Thumbnail:
+        """Return a thumbnail of an image, rendering it on a cache miss.
+
+        Args:
+            source: File path or encoded image bytes
+            width: Maximum thumbnail width
+            height: Maximum thumbnail height
+            source_id: Stable identifier of the source, such as a camera id and
+                capture time. Derived from the file or content when omitted.
+        """
+        key = (source_id or source_id_for(source), width, height)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        thumb = render_thumbnail(source, width, height, self.quality)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = thumb
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return thumb
+
+    def _lookup(self, key: Tuple[str, Optional[int], Optional[int]]) -> Optional[Thumbnail]:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+    async def get(
+        self,
+        source: ImageSource,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        source_id: Optional[str] = None,
+    ) -> Thumbnail:
+        """Asynchronous :meth:`thumbnail`; rendering runs in an executor."""
+        # Known sources are looked up without the executor round trip
+        if source_id is not None:
+            cached = self._lookup((source_id, width, height))
+            if cached is not None:
+                return cached
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.thumbnail, source, width, height, source_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        """Drop all cached thumbnails."""
+        with self._lock:
+            self._cache.clear()
+
+
+# Global instance
+thumbnail_service = ThumbnailService()
@@ -0,0 +1,279 @@
+"""
+Timelapse generation from stored snapshots.
+
+Snapshots are decoded in a process pool with draft-mode JPEG downscaling and
+written to the encoder one frame at a time. Only a small, fixed number of
+frames is in flight at once, so memory use does not depend on how many
+snapshots go into the video.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from ..config import get_storage_settings
+from ..exceptions import StorageError
+from .clips import (
+    check_camera_id,
+    confine_output_path,
+    parse_recording_timestamp,
+    partial_output,
+    recording_camera_id,
+    to_local_naive,
+)
+from .imaging import decode_scaled, scaled_size
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+VIDEO_EXTENSIONS = {".mp4"}
+
+
+def decode_frame(path: str, size: Tuple[int, int]) -> bytes:
+    """Decode a snapshot to packed BGR bytes of the given size.
+
+    Runs in a worker process; returns bytes so the result pickles cheaply.
+    """
+    red, green, blue = decode_scaled(path, size).split()
+    return Image.merge("RGB", (blue, green, red)).tobytes()
+
+
+def frame_size(path: Path, width: int) -> Tuple[int, int]:
+    """Video frame size for snapshots like ``path``; reads only the image header."""
+    with Image.open(path) as image:
+        return scaled_size(image.size, width)
+
+
+@dataclass
+class TimelapseProgress:
+    """Progress update emitted while a timelapse is built."""
+
+    stage: str  # planning, encoding or done
+    progress: float = 0.0  # 0.0 - 1.0
+    frames_written: int = 0
+    total_frames: int = 0
+    output_path: Optional[str] = None
+    message: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the progress update to a dictionary for JSON serialization."""
+        return asdict(self)
+
+
+class TimelapseBuilder:
+    """Build timelapse videos from the stored snapshots of a camera."""
+
+    def __init__(
+        self,
+        snapshots_dir: Optional[Union[str, Path]] = None,
+        output_dir: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize the builder.
+
+        Args:
+            snapshots_dir: Directory holding snapshots. Defaults to
+                ``StorageSettings.snapshots_dir``.
+            output_dir: Directory for generated videos. Defaults to a
+                ``timelapses`` directory inside ``StorageSettings.recordings_dir``.
+            max_workers: Decoder processes (defaults to the CPU count)
+        """
+        self._snapshots_dir = Path(snapshots_dir) if snapshots_dir else None
+        self._output_dir = Path(output_dir) if output_dir else None
+        self.max_workers = max_workers
+
+    @property
+    def snapshots_dir(self) -> Path:
+        """Directory holding the snapshots."""
+        if self._snapshots_dir is not None:
+            return self._snapshots_dir
+        return Path(get_storage_settings().snapshots_dir)
+
+    @property
+    def output_dir(self) -> Path:
+        """Directory for generated videos."""
+        if self._output_dir is not None:
+            return self._output_dir
+        return Path(get_storage_settings().recordings_dir) / "timelapses"
+
+    def find_snapshots(
+        self, camera_id: str, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, Path]]:
+        """Find the snapshots of a camera taken within a time window.
+
+        The capture time comes from the file name when it carries a timestamp,
+        otherwise from the file modification time.
+
+        Returns:
+            (capture time, path) pairs ordered by capture time
+        """
+        start = to_local_naive(start)
+        end = to_local_naive(end)
+        camera_dir = self.snapshots_dir / check_camera_id(camera_id)
+        if camera_dir.is_dir():
+            candidates = camera_dir.rglob("*")
+        elif self.snapshots_dir.is_dir():
+            # camX_* also matches camX_other_*, so compare the whole id
+            candidates = (
+                path
+                for path in self.snapshots_dir.glob(f"{camera_id}_*")
+                if recording_camera_id(path.name) == camera_id
+            )
+        else:
+            return []
+
+        snapshots = []
+        for path in candidates:
+            if path.suffix.lower() not in IMAGE_EXTENSIONS or not path.is_file():
+                continue
+            taken = parse_recording_timestamp(path.name)
+            if taken is None:
+                taken = datetime.fromtimestamp(path.stat().st_mtime)
+            if start <= taken < end:
+                snapshots.append((taken, path))
+        snapshots.sort()
+        return snapshots
+
+    def default_output_path(self, camera_id: str, start: datetime, end: datetime) -> Path:
+        """Output location used when the caller does not choose one."""
+        return self.output_dir / f"{camera_id}_{start:%Y%m%d_%H%M%S}-{end:%Y%m%d_%H%M%S}.mp4"
+
+    async def build(
+        self,
+        camera_id: str,
+        start: datetime,
+        end: datetime,
+        output_path: Optional[Union[str, Path]] = None,
+        fps: int = 24,
+        width: int = 1280,
+    ) -> AsyncIterator[TimelapseProgress]:
+        """Build a timelapse video from the snapshots of a camera.
+
+        Args:
+            camera_id: Camera whose snapshots to use
+            start: Start of the window
+            end: End of the window
+            output_path: Destination MP4 file inside ``output_dir`` (relative
+                paths are taken relative to it)
+            fps: Frames per second of the video
+            width: Maximum video width; the height follows the snapshot aspect ratio
+
+        Yields:
+            Progress updates, ending with a ``done`` update carrying the output path
+
+        Raises:
+            ValueError: If the window or encoding parameters are invalid, the
+                camera id is not a plain name or the output path is outside
+                ``output_dir``
+            StorageError: If no snapshots are found or the encoder cannot be opened
+        """
+        import cv2
+        import numpy as np
+
+        start = to_local_naive(start)
+        end = to_local_naive(end)
+        if end <= start:
+            raise ValueError("end must be after start")
+        if fps <= 0 or width <= 0:
+            raise ValueError("fps and width must be positive")
+        check_camera_id(camera_id)
+        if output_path:
+            output_path = confine_output_path(output_path, self.output_dir, VIDEO_EXTENSIONS)
+
+        yield TimelapseProgress(stage="planning", message="Locating snapshots")
+        snapshots = await asyncio.get_running_loop().run_in_executor(
+            None, self.find_snapshots, camera_id, start, end
+        )
+        if not snapshots:
+            raise StorageError(
+                f"No snapshots for camera {camera_id} between {start.isoformat()} "
+                f"and {end.isoformat()}"
+            )
+
+        loop = asyncio.get_running_loop()
+        # Reading the first header is enough to fix the frame geometry
+        size = await loop.run_in_executor(None, frame_size, snapshots[0][1], width)
+        frame_width, frame_height = size
+
+        output = output_path or self.default_output_path(camera_id, start, end)
+        partial = partial_output(output)
+        writer = cv2.VideoWriter(str(partial), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+        if not writer.isOpened():
+            partial.unlink()
+            raise StorageError(f"Could not open video encoder for {output}")
+
+        total = len(snapshots)
+        logger.info("Building %dx%d timelapse of %d snapshots for %s", *size, total, camera_id)
+
+        window = (self.max_workers or 4) * 2
+        written = 0
+        last_percent = -1
+        pending: Deque[asyncio.Future] = deque()
+        paths = iter(str(path) for _, path in snapshots)
+
+        pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            for path in paths:
+                pending.append(loop.run_in_executor(pool, decode_frame, path, size))
+                if len(pending) >= window:
+                    break
+
+            while pending:
+                future = pending.popleft()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append(loop.run_in_executor(pool, decode_frame, next_path, size))
+                try:
+                    data = await future
+                except Exception as e:
+                    logger.warning("Skipping undecodable snapshot for %s: %s", camera_id, e)
+                    continue
+
+                frame = np.frombuffer(data, dtype=np.uint8).reshape(frame_height, frame_width, 3)
+                await loop.run_in_executor(None, writer.write, frame)
+                written += 1
+
+                percent = written * 100 // total
+                if percent != last_percent:
+                    last_percent = percent
+                    yield TimelapseProgress(
+                        stage="encoding",
+                        progress=round(written / total, 4),
+                        frames_written=written,
+                        total_frames=total,
+                    )
+        except BaseException:
+            writer.release()
+            partial.unlink()
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+            # Do not block the event loop on workers finishing abandoned frames
+            pool.shutdown(wait=False)
+            writer.release()
+
+        if written == 0:
+            partial.unlink()
+            raise StorageError(f"None of the {total} snapshots for {camera_id} could be decoded")
+        partial.replace(output)
+
+        yield TimelapseProgress(
+            stage="done",
+            progress=1.0,
+            frames_written=written,
+            total_frames=total,
+            output_path=str(output),
+            message=f"Encoded {written} frames at {fps} fps ({written / fps:.1f}s)",
+        )
+
+
+# Global instance
+timelapse_builder = TimelapseBuilder()
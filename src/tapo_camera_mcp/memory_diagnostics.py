@@ -0,0 +1,435 @@
+"""
+Memory growth tracking and leak reports.
+
+Long-running servers grow when lists and caches keyed by camera or device are
+never trimmed. This module watches that growth from three angles:
+
+* the resident set size of the process, exported as
+  ``process_resident_memory_bytes`` together with its growth since start-up and
+  an alert gauge that turns 1 once the growth exceeds a threshold;
+* named structures such as the plug usage history or the frame cache, whose
+  sizes are probed per camera or device so growth can be attributed to them;
+* tracemalloc snapshots taken on demand and diffed against the previous and
+  the first snapshot, attributing new allocations to source lines and files.
+
+tracemalloc slows down every allocation, so it only runs while it has been
+started explicitly (via the ``memory_report`` tool or the configuration).
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .prometheus import MetricsRegistry
+from .prometheus import registry as prometheus_registry
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil is optional
+    psutil = None
+
+# A probe returns the size of a structure per owner (camera, device, ...)
+Probe = Callable[[], Dict[str, int]]
+
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, if it can be determined."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _loaded(module: str, name: str) -> Any:
+    """A global of a module if the module has been imported, else None.
+
+    Probes never import modules themselves: a tool module that has not been
+    loaded holds no data.
+    """
+    return getattr(sys.modules.get(f"{__package__}.{module}"), name, None)
+
+
+def _usage_history() -> Dict[str, int]:
+    tapo_plug_manager = _loaded("tools.energy.tapo_plug_tools", "tapo_plug_manager")
+    if tapo_plug_manager is None:
+        return {}
+    sizes: Dict[str, int] = {}
+    for entry in tapo_plug_manager.usage_history:
+        sizes[entry.device_id] = sizes.get(entry.device_id, 0) + 1
+    return sizes
+
+
+def _discovered_devices() -> Dict[str, int]:
+    discovery_manager = _loaded("tools.onboarding.device_discovery_tools", "discovery_manager")
+    if discovery_manager is None:
+        return {}
+    return {"all": len(discovery_manager.discovered_devices)}
+
+
+def _frame_cache() -> Dict[str, int]:
+    frame_cache = _loaded("media.scheduler", "frame_cache")
+    if frame_cache is None:
+        return {}
+    return {
+        camera_id: len(frame_cache._frames[camera_id].data)
+        for camera_id in frame_cache.camera_ids()
+    }
+
+
+def _thumbnail_cache() -> Dict[str, int]:
+    thumbnail_service = _loaded("media.thumbnails", "thumbnail_service")
+    if thumbnail_service is None:
+        return {}
+    sizes: Dict[str, int] = {}
+    for (source_id, _, _), thumbnail in list(thumbnail_service._cache.items()):
+        camera_id = source_id.split("@", 1)[0]
+        sizes[camera_id] = sizes.get(camera_id, 0) + len(thumbnail.data)
+    return sizes
+
+
+def _blob_store() -> Dict[str, int]:
+    blob_store = _loaded("media.blob_store", "blob_store")
+    if blob_store is None:
+        return {}
+    sizes: Dict[str, int] = {}
+    for blob in list(blob_store._blobs.values()):
+        sizes[blob.kind] = sizes.get(blob.kind, 0) + len(blob.data)
+    return sizes
+
+
+def _nest_alert_ids() -> Dict[str, int]:
+    nest_manager = _loaded("tools.alarms.nest_protect_tools", "nest_manager")
+    if nest_manager is None:
+        return {}
+    return {"all": len(nest_manager._seen_alert_ids)}
+
+
+def _event_counters() -> Dict[str, int]:
+    event_counters = _loaded("event_counters", "event_counters")
+    if event_counters is None:
+        return {}
+    sizes: Dict[str, int] = {}
+    for source_id, _ in list(event_counters._counters):
+        sizes[source_id] = sizes.get(source_id, 0) + 1
+    return sizes
+
+
+def _automation_history() -> Dict[str, int]:
+    smart_automation_tool = _loaded("tools.automation.smart_automation", "SmartAutomationTool")
+    if smart_automation_tool is None:
+        return {}
+    sizes: Dict[str, int] = {}
+    for tool in list(smart_automation_tool.instances.values()):
+        for entry in tool._automation_history:
+            sizes[entry["rule_id"]] = sizes.get(entry["rule_id"], 0) + 1
+    return sizes
+
+
+def _webcam_frames() -> Dict[str, int]:
+    webcam = _loaded("camera.webcam", "WebCamera")
+    if webcam is None:
+        return {}
+    # The server keeps its own manager next to the global one the tools use
+    managers = [_loaded("camera.manager", "camera_manager")]
+    server = _loaded("core.server", "TapoCameraServer")
+    managers.append(getattr(getattr(server, "_instance", None), "camera_manager", None))
+    sizes: Dict[str, int] = {}
+    for manager in managers:
+        for camera_id, camera in list(getattr(manager, "cameras", {}).items()):
+            frame = getattr(camera, "_frame", None) if isinstance(camera, webcam) else None
+            if frame is not None:
+                sizes[camera_id] = frame.nbytes
+    return sizes
+
+
+DEFAULT_STRUCTURES: Dict[str, Tuple[Probe, str]] = {
+    "plug_usage_history": (_usage_history, "items"),
+    "discovered_devices": (_discovered_devices, "items"),
+    "frame_cache": (_frame_cache, "bytes"),
+    "thumbnail_cache": (_thumbnail_cache, "bytes"),
+    "blob_store": (_blob_store, "bytes"),
+    "nest_seen_alerts": (_nest_alert_ids, "items"),
+    "event_counters": (_event_counters, "counters"),
+    "automation_history": (_automation_history, "items"),
+    "webcam_frames": (_webcam_frames, "bytes"),
+}
+
+
+def _stat_to_dict(stat: tracemalloc.StatisticDiff, key: str = "lineno") -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    location = frame.filename if key == "filename" else f"{frame.filename}:{frame.lineno}"
+    return {
+        "site": location,
+        "size_diff_kb": round(stat.size_diff / 1024, 1),
+        "size_kb": round(stat.size / 1024, 1),
+        "count_diff": stat.count_diff,
+        "count": stat.count,
+    }
+
+
+class MemoryDiagnostics:
+    """Track process memory, known structures and allocation sites over time."""
+
+    def __init__(
+        self,
+        rss_growth_threshold: float = 256 * 1024 * 1024,
+        interval: float = 60.0,
+        registry: Optional[MetricsRegistry] = None,
+        structures: Optional[Dict[str, Tuple[Probe, str]]] = None,
+    ):
+        """Initialize the tracker.
+
+        Args:
+            rss_growth_threshold: Bytes of RSS growth since start-up that raise the alert
+            interval: Seconds between two samples of the background monitor
+            registry: Prometheus registry the memory metrics are exported to.
+                Defaults to the global registry.
+            structures: Structures to probe, name -> (probe, unit).
+                Defaults to the known per-camera and per-device structures.
+        """
+        self.rss_growth_threshold = rss_growth_threshold
+        self.interval = interval
+        registry = registry if registry is not None else prometheus_registry
+        self.rss_gauge = registry.gauge(
+            "process_resident_memory_bytes", "Resident memory size of the server process"
+        )
+        self.rss_growth_gauge = registry.gauge(
+            "process_rss_growth_bytes", "Resident memory growth since the server started"
+        )
+        self.rss_alert_gauge = registry.gauge(
+            "process_rss_growth_alert", "1 while the resident memory growth exceeds the threshold"
+        )
+        self.structure_gauge = registry.gauge(
+            "memory_structure_size", "Size of long-lived in-memory structures", ("structure",)
+        )
+        self.structures: Dict[str, Tuple[Probe, str]] = dict(
+            DEFAULT_STRUCTURES if structures is None else structures
+        )
+        self.baseline_rss: Optional[int] = None
+        self.last_rss: Optional[int] = None
+        self._structure_baseline: Dict[str, Dict[str, int]] = {}
+        self._structure_sizes: Dict[str, Dict[str, int]] = {}
+        self._first_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._snapshots = 0
+        self._started_tracing = False
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, settings: Dict[str, Any]) -> None:
+        """Apply the ``memory_diagnostics`` section of the configuration."""
+        self.interval = float(settings.get("interval", self.interval))
+        if "rss_growth_threshold_mb" in settings:
+            self.rss_growth_threshold = float(settings["rss_growth_threshold_mb"]) * 1024 * 1024
+
+    def register_structure(self, name: str, probe: Probe, unit: str = "items") -> None:
+        """Track the size of a structure, reported per owner by ``probe``."""
+        self.structures[name] = (probe, unit)
+
+    # RSS and structures
+
+    def sample(self) -> Dict[str, Any]:
+        """Measure the RSS and the structure sizes and update the gauges."""
+        rss = current_rss()
+        if rss is not None:
+            if self.baseline_rss is None:
+                self.baseline_rss = rss
+            self.last_rss = rss
+            growth = rss - self.baseline_rss
+            self.rss_gauge.set(rss)
+            self.rss_growth_gauge.set(growth)
+            self.rss_alert_gauge.set(1 if growth > self.rss_growth_threshold else 0)
+
+        for name, (probe, _) in list(self.structures.items()):
+            try:
+                sizes = dict(probe())
+            except Exception as e:
+                logger.debug("Memory probe %s failed: %s", name, e)
+                continue
+            self._structure_sizes[name] = sizes
+            self._structure_baseline.setdefault(name, sizes)
+            self.structure_gauge.labels(name).set(sum(sizes.values()))
+        return self.rss_status()
+
+    def rss_status(self) -> Dict[str, Any]:
+        """The last RSS sample, its growth and whether the alert is raised."""
+        if self.last_rss is None or self.baseline_rss is None:
+            return {"available": False}
+        growth = self.last_rss - self.baseline_rss
+        return {
+            "available": True,
+            "rss_mb": round(self.last_rss / 1024 / 1024, 2),
+            "baseline_rss_mb": round(self.baseline_rss / 1024 / 1024, 2),
+            "growth_mb": round(growth / 1024 / 1024, 2),
+            "threshold_mb": round(self.rss_growth_threshold / 1024 / 1024, 2),
+            "alert": growth > self.rss_growth_threshold,
+        }
+
+    def structure_report(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Structure sizes and their growth, largest growth first.
+
+        Each entry lists the owners (camera, device) that grew the most.
+        """
+        report = []
+        for name, sizes in self._structure_sizes.items():
+            baseline = self._structure_baseline.get(name, {})
+            owners = sorted(
+                (
+                    {"owner": owner, "size": size, "growth": size - baseline.get(owner, 0)}
+                    for owner, size in sizes.items()
+                ),
+                key=lambda entry: entry["growth"],
+                reverse=True,
+            )
+            total = sum(sizes.values())
+            report.append(
+                {
+                    "structure": name,
+                    "unit": self.structures.get(name, (None, "items"))[1],
+                    "size": total,
+                    "growth": total - sum(baseline.values()),
+                    "owners": owners[:limit],
+                }
+            )
+        report.sort(key=lambda entry: entry["growth"], reverse=True)
+        return report
+
+    # tracemalloc
+
+    @property
+    def tracing(self) -> bool:
+        """Whether tracemalloc is recording allocations."""
+        return tracemalloc.is_tracing()
+
+    def start_tracing(self, frames: int = 1) -> None:
+        """Start recording allocations and take the first snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started_tracing = True
+        self._first_snapshot = self._last_snapshot = None
+        self._snapshots = 0
+        self.take_snapshot()
+        logger.info("Memory allocation tracing started")
+
+    def stop_tracing(self) -> None:
+        """Stop recording allocations (if this tracker started it) and drop the snapshots."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self._first_snapshot = self._last_snapshot = None
+        self._snapshots = 0
+
+    def take_snapshot(self, limit: int = 10) -> Dict[str, Any]:
+        """Snapshot the traced allocations and diff them against the earlier snapshots.
+
+        Returns the allocation sites that grew the most since the previous and
+        since the first snapshot, and the files that grew the most overall.
+        """
+        if not tracemalloc.is_tracing():
+            return {"tracing": False}
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+        previous = self._last_snapshot
+        if self._first_snapshot is None:
+            self._first_snapshot = snapshot
+        self._last_snapshot = snapshot
+        self._snapshots += 1
+        return self._diff(snapshot, previous, limit)
+
+    def _diff(
+        self,
+        snapshot: tracemalloc.Snapshot,
+        previous: Optional[tracemalloc.Snapshot],
+        limit: int,
+    ) -> Dict[str, Any]:
+        traced, peak = tracemalloc.get_traced_memory()
+        result: Dict[str, Any] = {
+            "tracing": True,
+            "snapshots": self._snapshots,
+            "traced_mb": round(traced / 1024 / 1024, 2),
+            "peak_mb": round(peak / 1024 / 1024, 2),
+        }
+        first = self._first_snapshot
+        if previous is not None:
+            result["since_previous"] = self._growth(snapshot, previous, "lineno", limit)
+        if first is not None and first is not snapshot:
+            result["since_first"] = self._growth(snapshot, first, "lineno", limit)
+            result["files_since_first"] = self._growth(snapshot, first, "filename", limit)
+        return result
+
+    @staticmethod
+    def _growth(
+        snapshot: tracemalloc.Snapshot, other: tracemalloc.Snapshot, key: str, limit: int
+    ) -> List[Dict[str, Any]]:
+        stats = snapshot.compare_to(other, key)
+        return [_stat_to_dict(stat, key) for stat in stats[:limit] if stat.size_diff > 0]
+
+    # Reporting and monitoring
+
+    def report(self, limit: int = 10, snapshot: bool = True) -> Dict[str, Any]:
+        """A leak report: RSS growth, structure growth and allocation-site growth."""
+        self.sample()
+        result: Dict[str, Any] = {
+            "timestamp": datetime.now().isoformat(),
+            "rss": self.rss_status(),
+            "structures": self.structure_report(limit),
+        }
+        if snapshot and self.tracing:
+            result["allocations"] = self.take_snapshot(limit)
+        else:
+            result["allocations"] = {"tracing": self.tracing}
+        return result
+
+    @property
+    def running(self) -> bool:
+        """Whether the background monitor is sampling."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Sample the memory every ``interval`` seconds in the running event loop."""
+        if not self.running:
+            self._task = asyncio.ensure_future(self._monitor())
+
+    async def stop(self) -> None:
+        """Stop the background monitor."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _monitor(self) -> None:
+        alerted = False
+        while True:
+            started = time.monotonic()
+            try:
+                status = self.sample()
+            except Exception:
+                logger.exception("Memory sample failed")
+            else:
+                if status.get("alert") and not alerted:
+                    logger.warning(
+                        "Resident memory grew by %.1f MB since start-up (threshold %.1f MB)",
+                        status["growth_mb"],
+                        status["threshold_mb"],
+                    )
+                alerted = bool(status.get("alert"))
+            await asyncio.sleep(max(self.interval - (time.monotonic() - started), 0.0))
+
+
+# Global instance
+memory_diagnostics = MemoryDiagnostics()
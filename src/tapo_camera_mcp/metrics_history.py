@@ -0,0 +1,196 @@
+"""
+In-memory metrics history for Grafana range queries.
+
+Each (metric, labels) series is a fixed-size ring of 64-bit floats with an
+implicit time axis: slot ``i`` holds the sample of the ``resolution``-second
+interval ``i``, and missing intervals are NaN. Doubles keep cumulative
+counters such as network bytes exact; 32-bit floats would round every value
+above 2**24. No timestamps are stored, so a week of 30-second samples costs
+about 160 KB per series -- 50 cameras with ten series each fit in roughly
+80 MB. Several samples falling into the same slot keep the last one.
+"""
+
+import math
+import re
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+_NAN = float("nan")
+
+_SELECTOR = re.compile(r"^\s*([a-zA-Z_:][a-zA-Z0-9_:]*)\s*(?:\{(.*)\})?\s*$")
+_MATCHER = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+
+
+def _avg(values: Sequence[float]) -> float:
+    return sum(values) / len(values)
+
+
+AGGREGATIONS: Dict[str, Callable[[Sequence[float]], float]] = {
+    "avg": _avg,
+    "min": min,
+    "max": max,
+    "last": lambda values: values[-1],
+}
+
+
+def parse_selector(query: str) -> Tuple[str, Dict[str, str]]:
+    """Parse a Prometheus-style series selector such as ``camera_temperature{camera_id="porch"}``.
+
+    Only equality matchers are supported.
+
+    Raises:
+        ValueError: If the selector cannot be parsed
+    """
+    match = _SELECTOR.match(query)
+    if not match:
+        raise ValueError(f"Unsupported query: {query}")
+    name, body = match.groups()
+    matchers: Dict[str, str] = {}
+    body = (body or "").strip()
+    position = 0
+    while position < len(body):
+        matcher = _MATCHER.match(body, position)
+        if not matcher:
+            raise ValueError(f"Unsupported label matcher in query: {query}")
+        matchers[matcher.group(1)] = matcher.group(2).replace('\\"', '"')
+        position = matcher.end()
+    return name, matchers
+
+
+class SeriesRing:
+    """Ring buffer of one series' samples at a fixed resolution."""
+
+    __slots__ = ("capacity", "last_slot", "resolution", "values")
+
+    def __init__(self, resolution: float, capacity: int):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.values = array("d", [_NAN]) * capacity
+        self.last_slot: Optional[int] = None
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Record a sample; samples older than the retention are dropped."""
+        slot = int(timestamp // self.resolution)
+        if self.last_slot is None:
+            self.last_slot = slot
+        elif slot > self.last_slot:
+            # Clear the slots skipped since the previous sample
+            for stale in range(self.last_slot + 1, min(slot, self.last_slot + self.capacity + 1)):
+                self.values[stale % self.capacity] = _NAN
+            self.last_slot = slot
+        elif slot <= self.last_slot - self.capacity:
+            return
+        self.values[slot % self.capacity] = value
+
+    def samples(self, start: float, end: float) -> Iterable[Tuple[float, float]]:
+        """Yield the (timestamp, value) samples between two timestamps."""
+        if self.last_slot is None:
+            return
+        first = max(math.ceil(start / self.resolution), self.last_slot - self.capacity + 1)
+        last = min(int(end // self.resolution), self.last_slot)
+        values = self.values
+        for slot in range(first, last + 1):
+            value = values[slot % self.capacity]
+            if not math.isnan(value):
+                yield slot * self.resolution, value
+
+    def query(
+        self, start: float, end: float, step: float, aggregation: str = "avg"
+    ) -> List[Tuple[float, float]]:
+        """Downsample the samples between two timestamps into ``step``-second buckets.
+
+        Returns:
+            (bucket start, aggregated value) pairs for buckets holding samples
+        """
+        reduce = AGGREGATIONS[aggregation]
+        step = max(step, self.resolution)
+        points: List[Tuple[float, float]] = []
+        bucket: Optional[int] = None
+        bucket_values: List[float] = []
+        for timestamp, value in self.samples(start, end):
+            index = int(timestamp // step)
+            if index != bucket:
+                if bucket_values:
+                    points.append((bucket * step, reduce(bucket_values)))
+                bucket, bucket_values = index, []
+            bucket_values.append(value)
+        if bucket_values:
+            points.append((bucket * step, reduce(bucket_values)))
+        return points
+
+
+class MetricsHistory:
+    """Retained history of labelled metric series."""
+
+    def __init__(self, resolution: float = 30.0, retention: float = 7 * 24 * 3600):
+        """Initialize the history.
+
+        Args:
+            resolution: Seconds covered by one sample slot
+            retention: Seconds of history kept per series
+        """
+        self.resolution = resolution
+        self.retention = retention
+        self.capacity = max(int(retention // resolution), 1)
+        self._series: Dict[Tuple[str, LabelSet], SeriesRing] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, labels: Dict[str, str], value: float, timestamp: float) -> None:
+        """Record a sample of a series, creating the series on first use."""
+        key = (name, tuple(sorted(labels.items())))
+        ring = self._series.get(key)
+        if ring is None:
+            with self._lock:
+                ring = self._series.setdefault(key, SeriesRing(self.resolution, self.capacity))
+        ring.append(timestamp, float(value))
+
+    def select(self, name: str, matchers: Optional[Dict[str, str]] = None):
+        """Return the (labels, ring) pairs of a metric matching all label matchers."""
+        matchers = matchers or {}
+        return [
+            (dict(labels), ring)
+            for (series_name, labels), ring in list(self._series.items())
+            if series_name == name and all(dict(labels).get(k) == v for k, v in matchers.items())
+        ]
+
+    def query_range(
+        self,
+        query: str,
+        start: float,
+        end: float,
+        step: float,
+        aggregation: str = "avg",
+    ) -> List[Dict[str, object]]:
+        """Evaluate a series selector over a time range.
+
+        Returns:
+            Prometheus-style matrix results: ``{"metric": {...}, "values": [[ts, "v"], ...]}``
+
+        Raises:
+            ValueError: If the query or aggregation is not supported
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {aggregation}")
+        name, matchers = parse_selector(query)
+        result = []
+        for labels, ring in self.select(name, matchers):
+            points = ring.query(start, end, step, aggregation)
+            if points:
+                result.append(
+                    {
+                        "metric": {"__name__": name, **labels},
+                        "values": [[timestamp, f"{value:.7g}"] for timestamp, value in points],
+                    }
+                )
+        return result
+
+    def series_names(self) -> List[str]:
+        """Names of all recorded metrics."""
+        return sorted({name for name, _ in self._series})
+
+    def memory_bytes(self) -> int:
+        """Approximate memory used by sample storage."""
+        return sum(ring.values.itemsize * ring.capacity for ring in self._series.values())
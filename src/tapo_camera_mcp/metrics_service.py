@@ -5,16 +5,59 @@ This module provides real-time camera metrics in a format compatible with Grafan
 """
 
 import asyncio
-import contextlib
+import json
 import logging
-from dataclasses import asdict, dataclass, field
+import math
+import random
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .event_counters import MOTION, event_counters
+from .grafana_datasource import GrafanaDatasource
+from .metrics_history import MetricsHistory
+from .prometheus import CONTENT_TYPE, Gauge, MetricsRegistry
+from .prometheus import registry as prometheus_registry
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, installed with the "perf" extra
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def dumps(data: Any) -> bytes:
+    """Serialize a metrics response to compact JSON, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":"), default=str).encode()
+
+
+def _json_number(value: Union[int, float]) -> str:
+    if isinstance(value, float):
+        return repr(value) if math.isfinite(value) else "null"
+    return str(int(value))
+
+
+# HELP text of the per-camera gauges exported in Prometheus format
+_METRIC_HELP = {
+    "camera_status": "1 if the camera is online, 0 otherwise",
+    "camera_temperature": "Camera temperature in degrees Celsius",
+    "motion_detected": "1 while the camera reports motion",
+    "network_rx_bytes": "Bytes received by the camera",
+    "network_tx_bytes": "Bytes transmitted by the camera",
+    "signal_strength_dbm": "WiFi signal strength in dBm",
+    "ptz_pan": "PTZ pan position (-1 left to 1 right)",
+    "ptz_tilt": "PTZ tilt position (-1 down to 1 up)",
+    "ptz_zoom": "PTZ zoom position (0 wide to 1 tele)",
+    "ptz_moving": "1 while the PTZ motor is moving",
+    "ptz_preset": "Active PTZ preset id",
+}
+
+
 class CameraStatus(str, Enum):
     ONLINE = "online"
     OFFLINE = "offline"
@@ -22,69 +65,369 @@ class CameraStatus(str, Enum):
     ERROR = "error"
 
 
-@dataclass
 class PTZPosition:
     """PTZ position data structure"""
 
-    pan: float = 0.0  # -1.0 (left) to 1.0 (right)
-    tilt: float = 0.0  # -1.0 (down) to 1.0 (up)
-    zoom: float = 0.0  # 0.0 (wide) to 1.0 (tele)
-    moving: bool = False
-    preset_id: Optional[int] = None
-    preset_name: Optional[str] = None
+    __slots__ = ("pan", "tilt", "zoom", "moving", "preset_id", "preset_name")
+
+    def __init__(
+        self,
+        pan: float = 0.0,  # -1.0 (left) to 1.0 (right)
+        tilt: float = 0.0,  # -1.0 (down) to 1.0 (up)
+        zoom: float = 0.0,  # 0.0 (wide) to 1.0 (tele)
+        moving: bool = False,
+        preset_id: Optional[int] = None,
+        preset_name: Optional[str] = None,
+    ):
+        self.pan = pan
+        self.tilt = tilt
+        self.zoom = zoom
+        self.moving = moving
+        self.preset_id = preset_id
+        self.preset_name = preset_name
+
+    def astuple(self) -> tuple:
+        """Field values in declaration order"""
+        return (self.pan, self.tilt, self.zoom, self.moving, self.preset_id, self.preset_name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the position to a dictionary for JSON serialization"""
+        return {
+            "pan": self.pan,
+            "tilt": self.tilt,
+            "zoom": self.zoom,
+            "moving": self.moving,
+            "preset_id": self.preset_id,
+            "preset_name": self.preset_name,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PTZPosition):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __repr__(self) -> str:
+        return (
+            f"PTZPosition(pan={self.pan}, tilt={self.tilt}, zoom={self.zoom}, moving={self.moving})"
+        )
 
 
-@dataclass
 class CameraMetrics:
-    """Camera metrics data structure"""
-
-    camera_id: str
-    name: str
-    ip_address: str
-    model: str = ""
-    firmware: str = ""
-    status: CameraStatus = CameraStatus.OFFLINE
-    last_seen: Optional[datetime] = None
-    uptime_seconds: int = 0
-    temperature: Optional[float] = None
-    motion_detected: bool = False
-    motion_last_detected: Optional[datetime] = None
-    motion_zones: List[Dict[str, Any]] = field(default_factory=list)
-    cpu_usage: Optional[float] = None
-    memory_usage: Optional[float] = None
-    network_rx: Optional[int] = None  # bytes received
-    network_tx: Optional[int] = None  # bytes transmitted
-    signal_strength: Optional[int] = None  # WiFi signal strength in dBm
-    last_error: Optional[str] = None
-    custom_metadata: Dict[str, Any] = field(default_factory=dict)
-
-    # PTZ related fields
-    ptz_supported: bool = False
-    ptz_position: PTZPosition = field(default_factory=PTZPosition)
-    ptz_presets: Dict[int, str] = field(default_factory=dict)  # preset_id: preset_name
+    """Camera metrics data structure
+
+    Uses ``__slots__`` rather than a dataclass: hundreds of instances are
+    updated on every poll and serialized on every request, and slots keep them
+    compact and their attribute access fast.
+    """
+
+    __slots__ = (
+        "camera_id",
+        "name",
+        "ip_address",
+        "model",
+        "firmware",
+        "status",
+        "last_seen",
+        "uptime_seconds",
+        "temperature",
+        "motion_detected",
+        "motion_last_detected",
+        "motion_zones",
+        "cpu_usage",
+        "memory_usage",
+        "network_rx",
+        "network_tx",
+        "signal_strength",
+        "last_error",
+        "custom_metadata",
+        # PTZ related fields
+        "ptz_supported",
+        "ptz_position",
+        "ptz_presets",
+    )
+
+    def __init__(
+        self,
+        camera_id: str,
+        name: str,
+        ip_address: str,
+        model: str = "",
+        firmware: str = "",
+        status: CameraStatus = CameraStatus.OFFLINE,
+        last_seen: Optional[datetime] = None,
+        uptime_seconds: int = 0,
+        temperature: Optional[float] = None,
+        motion_detected: bool = False,
+        motion_last_detected: Optional[datetime] = None,
+        motion_zones: Optional[List[Dict[str, Any]]] = None,
+        cpu_usage: Optional[float] = None,
+        memory_usage: Optional[float] = None,
+        network_rx: Optional[int] = None,  # bytes received
+        network_tx: Optional[int] = None,  # bytes transmitted
+        signal_strength: Optional[int] = None,  # WiFi signal strength in dBm
+        last_error: Optional[str] = None,
+        custom_metadata: Optional[Dict[str, Any]] = None,
+        ptz_supported: bool = False,
+        ptz_position: Optional[PTZPosition] = None,
+        ptz_presets: Optional[Dict[int, str]] = None,  # preset_id: preset_name
+    ):
+        self.camera_id = camera_id
+        self.name = name
+        self.ip_address = ip_address
+        self.model = model
+        self.firmware = firmware
+        self.status = status
+        self.last_seen = last_seen
+        self.uptime_seconds = uptime_seconds
+        self.temperature = temperature
+        self.motion_detected = motion_detected
+        self.motion_last_detected = motion_last_detected
+        self.motion_zones = motion_zones if motion_zones is not None else []
+        self.cpu_usage = cpu_usage
+        self.memory_usage = memory_usage
+        self.network_rx = network_rx
+        self.network_tx = network_tx
+        self.signal_strength = signal_strength
+        self.last_error = last_error
+        self.custom_metadata = custom_metadata if custom_metadata is not None else {}
+        self.ptz_supported = ptz_supported
+        self.ptz_position = ptz_position if ptz_position is not None else PTZPosition()
+        self.ptz_presets = ptz_presets if ptz_presets is not None else {}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CameraMetrics):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (
+            f"CameraMetrics(camera_id={self.camera_id!r}, name={self.name!r}, "
+            f"status={self.status.value!r})"
+        )
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert metrics to dictionary for JSON serialization"""
-        data = asdict(self)
-        # Convert datetime to ISO format
-        for field in ["last_seen", "motion_last_detected"]:
-            if data[field]:
-                data[field] = data[field].isoformat()
-        # Convert Enum to string
-        if data.get("status"):
-            data["status"] = data["status"].value
-        # Convert PTZPosition to dict
-        if data.get("ptz_position"):
-            data["ptz_position"] = asdict(data["ptz_position"])
-        return data
+        """Convert metrics to dictionary for JSON serialization
+
+        Nested containers (motion zones, metadata, presets) are shared with
+        the model rather than copied; serialize the result, do not mutate it.
+        """
+        last_seen = self.last_seen
+        motion_last_detected = self.motion_last_detected
+        status = self.status
+        return {
+            "camera_id": self.camera_id,
+            "name": self.name,
+            "ip_address": self.ip_address,
+            "model": self.model,
+            "firmware": self.firmware,
+            "status": status.value if isinstance(status, Enum) else status,
+            "last_seen": last_seen.isoformat() if last_seen else None,
+            "uptime_seconds": self.uptime_seconds,
+            "temperature": self.temperature,
+            "motion_detected": self.motion_detected,
+            "motion_last_detected": (
+                motion_last_detected.isoformat() if motion_last_detected else None
+            ),
+            "motion_zones": self.motion_zones,
+            "cpu_usage": self.cpu_usage,
+            "memory_usage": self.memory_usage,
+            "network_rx": self.network_rx,
+            "network_tx": self.network_tx,
+            "signal_strength": self.signal_strength,
+            "last_error": self.last_error,
+            "custom_metadata": self.custom_metadata,
+            "ptz_supported": self.ptz_supported,
+            "ptz_position": self.ptz_position.to_dict(),
+            "ptz_presets": self.ptz_presets,
+        }
+
+
+Sample = Tuple[str, Dict[str, str], Union[int, float]]
+
+
+def _tool_sample_sources() -> List[Callable[[], Iterable[Sample]]]:
+    """Sample sources of the energy and weather tools"""
+    from .tools.energy.tapo_plug_tools import tapo_plug_manager
+    from .tools.weather.netatmo_tools import netatmo_samples
+
+    return [tapo_plug_manager.samples, netatmo_samples]
+
+
+def _apply_status(
+    metrics: CameraMetrics, status: Dict[str, Any], count_motion: bool = True
+) -> tuple:
+    """Update camera metrics from a camera ``get_status()`` result.
+
+    Fields are only filled when the camera backend reports them. Unless
+    ``count_motion`` is off (the camera's detections are counted instead),
+    each onset of ``motion_detected`` is recorded as a motion event.
+
+    Returns:
+        A fingerprint of the values that indicate activity. Monotonic counters
+        (uptime, traffic) are left out so they do not count as changes.
+    """
+    connected = status.get("connected", True)
+    metrics.status = CameraStatus.ONLINE if connected else CameraStatus.OFFLINE
+    if connected:
+        metrics.last_seen = datetime.now()
+    metrics.last_error = status.get("error") or status.get("last_error")
+
+    for key in ("model", "firmware"):
+        value = status.get(key)
+        if value and value != "Unknown":
+            setattr(metrics, key, value)
+
+    uptime = status.get("uptime_seconds", status.get("uptime"))
+    if uptime is not None:
+        metrics.uptime_seconds = int(uptime)
+    for key, aliases in (
+        ("temperature", ()),
+        ("cpu_usage", ()),
+        ("memory_usage", ()),
+        ("network_rx", ("rx_bytes",)),
+        ("network_tx", ("tx_bytes",)),
+        ("signal_strength", ("rssi",)),
+    ):
+        for name in (key, *aliases):
+            if status.get(name) is not None:
+                setattr(metrics, key, status[name])
+                break
+
+    if "ptz_capable" in status:
+        metrics.ptz_supported = bool(status["ptz_capable"])
+    position = status.get("ptz_position")
+    if isinstance(position, dict):
+        for key in ("pan", "tilt", "zoom", "moving", "preset_id", "preset_name"):
+            if key in position:
+                setattr(metrics.ptz_position, key, position[key])
+    if "motion_detected" in status:
+        motion = bool(status["motion_detected"])
+        if count_motion and motion:
+            if not metrics.motion_detected:
+                # Each onset of motion counts as one event
+                event_counters.record(metrics.camera_id, MOTION)
+            metrics.motion_last_detected = datetime.now()
+        metrics.motion_detected = motion
+
+    temperature = metrics.temperature
+    return (
+        metrics.status,
+        metrics.last_error,
+        round(temperature, 1) if temperature is not None else None,
+        metrics.signal_strength,
+        metrics.motion_detected,
+        metrics.ptz_position.astuple(),
+    )
+
+
+def _apply_detections(
+    metrics: CameraMetrics, detections: List[Dict[str, Any]], last_start: Optional[float]
+) -> Optional[float]:
+    """Record the detections a camera listed that started after ``last_start``.
+
+    Each detection is counted once, at its own start time, however many polls
+    list it and however long the polls are apart.
+
+    Returns:
+        The start time of the newest detection seen so far
+    """
+    newest = last_start
+    for event in detections:
+        start = event.get("start_time")
+        if start is None or (last_start is not None and start <= last_start):
+            continue
+        event_counters.record(metrics.camera_id, MOTION, float(start))
+        newest = start if newest is None else max(newest, start)
+    ends = [
+        event.get("end_time") or event["start_time"]
+        for event in detections
+        if event.get("start_time")
+    ]
+    if ends:
+        metrics.motion_last_detected = datetime.fromtimestamp(max(ends))
+    return newest
+
+
+async def _read_camera(camera) -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]:
+    """Status of a camera, and its motion detections if it can list them."""
+    get_detections = getattr(camera, "get_detections", None)
+    # Detections first: they update the motion state the status reports
+    detections = await get_detections() if get_detections is not None else None
+    return await camera.get_status(), detections
+
+
+@dataclass
+class _PollState:
+    """Adaptive polling state of one camera."""
+
+    interval: float
+    next_due: float = 0.0
+    fingerprint: Optional[tuple] = None
+    consecutive_errors: int = 0
+    last_detection: Optional[float] = None
 
 
 class MetricsCollector:
-    """Collect and aggregate camera metrics"""
+    """Collect and aggregate camera metrics
 
-    def __init__(self, tapo_client):
+    Every registered camera is polled concurrently with a per-camera timeout.
+    Each camera has its own polling interval: it is halved when the camera's
+    metrics change or polling fails and grows by half when they stay the same,
+    within ``min_interval`` and ``max_interval``. A random jitter keeps
+    cameras from synchronising. ``max_polls_per_second`` bounds the total poll
+    rate: as the fleet grows the shortest allowed interval grows with it.
+    """
+
+    def __init__(
+        self,
+        tapo_client,
+        poll_interval: float = 30.0,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        timeout: float = 10.0,
+        jitter: float = 0.1,
+        max_concurrency: int = 16,
+        max_polls_per_second: float = 10.0,
+        history: Optional[MetricsHistory] = None,
+        registry: Optional[MetricsRegistry] = None,
+        sample_sources: Optional[List[Callable[[], Iterable[Sample]]]] = None,
+    ):
+        """Initialize the collector.
+
+        Args:
+            tapo_client: Camera source with a ``cameras`` mapping of camera id to
+                camera (such as ``CameraManager``)
+            poll_interval: Initial polling interval of a camera in seconds
+            min_interval: Shortest polling interval in seconds
+            max_interval: Longest polling interval in seconds
+            timeout: Seconds after which a camera poll is abandoned
+            jitter: Random variation applied to each interval (0.1 = +/-10%)
+            max_concurrency: Maximum number of polls in flight at once
+            max_polls_per_second: Upper bound on the total poll rate
+            history: Ring-buffer history every poll is recorded into. Defaults
+                to one week at 30-second resolution.
+            registry: Prometheus registry the camera gauges are exported to.
+                Defaults to the global registry.
+            sample_sources: Callables returning further (name, labels, value)
+                samples, recorded once per history resolution. Defaults to the
+                smart plug and weather station readings.
+        """
         self.tapo_client = tapo_client
         self.metrics: Dict[str, CameraMetrics] = {}
+        self.poll_interval = poll_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.jitter = jitter
+        self.max_polls_per_second = max_polls_per_second
+        self.history = history if history is not None else MetricsHistory()
+        self._series_prefixes: Dict[tuple, str] = {}
+        self.registry = registry if registry is not None else prometheus_registry
+        self.sample_sources = sample_sources
+        self._next_source_sample = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._poll_state: Dict[str, _PollState] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
         self._running = False
         self._task = None
 
@@ -103,156 +446,293 @@ class MetricsCollector:
             return
 
         self._running = False
+        tasks = list(self._in_flight.values())
         if self._task:
-            self._task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self._task
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._in_flight.clear()
         logger.info("Metrics collection service stopped")
 
+    @property
+    def interval_floor(self) -> float:
+        """Shortest interval allowed for the current fleet size."""
+        return max(self.min_interval, len(self.metrics) / self.max_polls_per_second)
+
+    def get_poll_interval(self, camera_id: str) -> Optional[float]:
+        """Current polling interval of a camera in seconds."""
+        state = self._poll_state.get(camera_id)
+        return state.interval if state else None
+
+    def register_camera(
+        self, camera_id: str, name: str = "", ip_address: str = ""
+    ) -> CameraMetrics:
+        """Register a camera for polling."""
+        if camera_id not in self.metrics:
+            self.metrics[camera_id] = CameraMetrics(
+                camera_id=camera_id, name=name or camera_id, ip_address=ip_address
+            )
+            interval = min(max(self.poll_interval, self.interval_floor), self.max_interval)
+            # Spread first polls over the jitter window instead of all at once
+            self._poll_state[camera_id] = _PollState(
+                interval=interval,
+                next_due=time.monotonic() + random.uniform(0, self.jitter * interval),  # nosec B311
+            )
+        return self.metrics[camera_id]
+
+    def unregister_camera(self, camera_id: str) -> None:
+        """Stop polling a camera and drop its metrics."""
+        camera_metrics = self.metrics.pop(camera_id, None)
+        if camera_metrics is not None:
+            for name in _METRIC_HELP:
+                gauge = self.registry.get(name)
+                if gauge is not None:
+                    gauge.remove(camera_id, camera_metrics.name)
+        self._poll_state.pop(camera_id, None)
+        task = self._in_flight.pop(camera_id, None)
+        if task:
+            task.cancel()
+
+    def sync_cameras(self) -> None:
+        """Register new cameras of the camera source and drop removed ones."""
+        cameras = getattr(self.tapo_client, "cameras", None)
+        if cameras is None:
+            return
+        for camera_id, camera in cameras.items():
+            if camera_id not in self.metrics:
+                params = getattr(getattr(camera, "config", None), "params", {}) or {}
+                self.register_camera(
+                    camera_id, ip_address=str(params.get("host") or params.get("ip_address") or "")
+                )
+        for camera_id in set(self.metrics) - set(cameras):
+            self.unregister_camera(camera_id)
+
     async def _collect_loop(self):
-        """Background task to collect metrics at regular intervals"""
+        """Background task polling each camera when its interval is due"""
         while self._running:
             try:
-                await self.collect_metrics()
-                await asyncio.sleep(30)  # Collect every 30 seconds
+                self.sync_cameras()
+                now = time.monotonic()
+                for camera_id, state in list(self._poll_state.items()):
+                    if state.next_due <= now and camera_id not in self._in_flight:
+                        task = asyncio.ensure_future(self.poll_camera(camera_id))
+                        self._in_flight[camera_id] = task
+                        task.add_done_callback(
+                            lambda _, camera_id=camera_id: self._in_flight.pop(camera_id, None)
+                        )
+                if now >= self._next_source_sample:
+                    self.record_source_samples()
+                    self._next_source_sample = now + self.history.resolution
+                next_due = min(
+                    (state.next_due for state in self._poll_state.values()), default=now + 1.0
+                )
+                # Wake at least every second to pick up camera changes
+                await asyncio.sleep(min(max(next_due - now, 0.05), 1.0))
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.exception(f"Error in metrics collection: {e}")
-                await asyncio.sleep(30)  # Wait before retry
+                await asyncio.sleep(1.0)
 
     async def collect_metrics(self):
-        """Collect metrics from all cameras"""
-        # This would be implemented to collect actual metrics from Tapo cameras
-        # For now, we'll just update the last_seen timestamp
-        for _camera_id, metrics in self.metrics.items():
-            if metrics.status == CameraStatus.ONLINE:
-                metrics.last_seen = datetime.now()
+        """Collect metrics from all cameras concurrently"""
+        self.sync_cameras()
+        await asyncio.gather(*(self.poll_camera(camera_id) for camera_id in list(self.metrics)))
+
+    async def poll_camera(self, camera_id: str) -> bool:
+        """Poll one camera and reschedule it.
+
+        Returns:
+            bool: True if the poll succeeded
+        """
+        metrics = self.metrics.get(camera_id)
+        state = self._poll_state.get(camera_id)
+        cameras = getattr(self.tapo_client, "cameras", None) or {}
+        camera = cameras.get(camera_id)
+        if metrics is None or state is None:
+            return False
+
+        async with self._semaphore:
+            try:
+                if camera is None:
+                    raise LookupError(f"Camera {camera_id} is not available")
+                status, detections = await asyncio.wait_for(_read_camera(camera), self.timeout)
+            except asyncio.TimeoutError:
+                error = f"Status poll timed out after {self.timeout:.0f}s"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            else:
+                error = None
+
+        if error is None:
+            fingerprint = _apply_status(metrics, status, count_motion=detections is None)
+            if detections is not None:
+                state.last_detection = _apply_detections(metrics, detections, state.last_detection)
+            changed = state.fingerprint is not None and fingerprint != state.fingerprint
+            state.fingerprint = fingerprint
+            state.consecutive_errors = 0
+        else:
+            metrics.status = CameraStatus.ERROR
+            metrics.last_error = error
+            state.consecutive_errors += 1
+            changed = True
+            logger.debug("Metrics poll of %s failed: %s", camera_id, error)
+        self.record_samples(camera_id)
+
+        floor = self.interval_floor
+        interval = state.interval * 0.5 if changed else state.interval * 1.5
+        state.interval = min(max(interval, floor), max(self.max_interval, floor))
+        jitter = random.uniform(-self.jitter, self.jitter)  # nosec B311
+        state.next_due = time.monotonic() + state.interval * (1 + jitter)
+        return error is None
+
+    def _samples(self, camera_id: str, camera_metrics: CameraMetrics) -> Iterator[Sample]:
+        """Yield the (metric name, labels, value) samples of one camera"""
+        base = {"camera_id": camera_id, "name": camera_metrics.name}
+
+        # Status metric
+        yield (
+            "camera_status",
+            {**base, "model": camera_metrics.model, "status": camera_metrics.status.value},
+            1 if camera_metrics.status == CameraStatus.ONLINE else 0,
+        )
+
+        # Temperature metric if available
+        if camera_metrics.temperature is not None:
+            yield "camera_temperature", base, camera_metrics.temperature
+
+        # Motion detection metric
+        yield "motion_detected", base, 1 if camera_metrics.motion_detected else 0
+
+        # Network metrics if available
+        if camera_metrics.network_rx is not None:
+            yield "network_rx_bytes", base, camera_metrics.network_rx
+        if camera_metrics.network_tx is not None:
+            yield "network_tx_bytes", base, camera_metrics.network_tx
+
+        # Signal strength if available
+        if camera_metrics.signal_strength is not None:
+            yield "signal_strength_dbm", base, camera_metrics.signal_strength
+
+        # PTZ metrics if supported
+        if camera_metrics.ptz_supported:
+            position = camera_metrics.ptz_position
+            for axis in ["pan", "tilt", "zoom"]:
+                yield f"ptz_{axis}", base, getattr(position, axis)
+            yield "ptz_moving", base, 1 if position.moving else 0
+            if position.preset_id is not None:
+                yield (
+                    "ptz_preset",
+                    {
+                        **base,
+                        "preset_id": str(position.preset_id),
+                        "preset_name": position.preset_name or "",
+                    },
+                    position.preset_id,
+                )
+
+    def record_samples(self, camera_id: str, timestamp: Optional[float] = None) -> None:
+        """Record the current samples of a camera in the history and the Prometheus registry
+
+        Series are keyed by camera id and name only, so a change of status or
+        preset continues the same series instead of starting a new one.
+        """
+        camera_metrics = self.metrics.get(camera_id)
+        if camera_metrics is None:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        base = {"camera_id": camera_id, "name": camera_metrics.name}
+        for name, _labels, value in self._samples(camera_id, camera_metrics):
+            self.history.record(name, base, value, timestamp)
+            self._gauge(name).labels(camera_id, camera_metrics.name).set(value)
+
+    def record_source_samples(self, timestamp: Optional[float] = None) -> None:
+        """Record the samples of the non-camera sample sources (energy, weather)"""
+        if self.sample_sources is None:
+            self.sample_sources = _tool_sample_sources()
+        timestamp = time.time() if timestamp is None else timestamp
+        for source in self.sample_sources:
+            try:
+                for name, labels, value in source():
+                    self.history.record(name, labels, value, timestamp)
+                    self.registry.gauge(name, name, tuple(labels)).labels(**labels).set(value)
+            except Exception as e:
+                logger.debug("Sample source %r failed: %s", source, e)
+
+    def _gauge(self, name: str) -> Gauge:
+        return self.registry.gauge(name, _METRIC_HELP.get(name, name), ("camera_id", "name"))
 
     def get_grafana_metrics(self) -> Dict[str, Any]:
         """Format metrics for Grafana consumption"""
         timestamp = datetime.now().isoformat()
-
-        # Convert all metrics to Grafana-compatible format
-        metrics = {"status": "success", "data": {"resultType": "matrix", "result": []}}
-
-        # Add each metric as a separate time series
+        result = [
+            {"metric": {"__name__": name, **labels}, "values": [[timestamp, value]]}
+            for camera_id, camera_metrics in self.metrics.items()
+            for name, labels, value in self._samples(camera_id, camera_metrics)
+        ]
+        return {"status": "success", "data": {"resultType": "matrix", "result": result}}
+
+    def get_grafana_metrics_json(self) -> bytes:
+        """Render :meth:`get_grafana_metrics` directly as JSON bytes
+
+        The ``{"metric": {...}, "values": [[`` prefix of each series is encoded
+        once and cached, so a request only formats the timestamp and values.
+        """
+        timestamp = json.dumps(datetime.now().isoformat())
+        prefixes = self._series_prefixes
+        if len(prefixes) > 10000:  # label churn (status, model, presets)
+            prefixes.clear()
+        parts = []
         for camera_id, camera_metrics in self.metrics.items():
-            # Add status metric
-            self._add_metric(
-                metrics,
-                "camera_status",
-                {
-                    "camera_id": camera_id,
-                    "name": camera_metrics.name,
-                    "model": camera_metrics.model,
-                    "status": camera_metrics.status.value,
-                },
-                timestamp,
-                1 if camera_metrics.status == CameraStatus.ONLINE else 0,
-            )
-
-            # Add temperature metric if available
-            if camera_metrics.temperature is not None:
-                self._add_metric(
-                    metrics,
-                    "camera_temperature",
-                    {"camera_id": camera_id, "name": camera_metrics.name},
-                    timestamp,
-                    camera_metrics.temperature,
-                )
-
-            # Add motion detection metric
-            self._add_metric(
-                metrics,
-                "motion_detected",
-                {"camera_id": camera_id, "name": camera_metrics.name},
-                timestamp,
-                1 if camera_metrics.motion_detected else 0,
-            )
+            for name, labels, value in self._samples(camera_id, camera_metrics):
+                key = (name, *labels.values())
+                prefix = prefixes.get(key)
+                if prefix is None:
+                    metric = json.dumps({"__name__": name, **labels}, separators=(",", ":"))
+                    prefix = prefixes[key] = f'{{"metric":{metric},"values":[['
+                parts.append(f"{prefix}{timestamp},{_json_number(value)}]]}}")
+        body = ",".join(parts)
+        return f'{{"status":"success","data":{{"resultType":"matrix","result":[{body}]}}}}'.encode()
+
+    def query_range(
+        self, query: str, start: float, end: float, step: float, aggregation: str = "avg"
+    ) -> Dict[str, Any]:
+        """Evaluate a range query against the metrics history in Prometheus format
+
+        Raises:
+            ValueError: If the query or aggregation is not supported
+        """
+        return {
+            "status": "success",
+            "data": {
+                "resultType": "matrix",
+                "result": self.history.query_range(query, start, end, step, aggregation),
+            },
+        }
 
-            # Add network metrics if available
-            if camera_metrics.network_rx is not None:
-                self._add_metric(
-                    metrics,
-                    "network_rx_bytes",
-                    {"camera_id": camera_id, "name": camera_metrics.name},
-                    timestamp,
-                    camera_metrics.network_rx,
-                )
 
-            if camera_metrics.network_tx is not None:
-                self._add_metric(
-                    metrics,
-                    "network_tx_bytes",
-                    {"camera_id": camera_id, "name": camera_metrics.name},
-                    timestamp,
-                    camera_metrics.network_tx,
-                )
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
 
-            # Add signal strength if available
-            if camera_metrics.signal_strength is not None:
-                self._add_metric(
-                    metrics,
-                    "signal_strength_dbm",
-                    {"camera_id": camera_id, "name": camera_metrics.name},
-                    timestamp,
-                    camera_metrics.signal_strength,
-                )
 
-            # Add PTZ metrics if supported
-            if camera_metrics.ptz_supported:
-                # PTZ Position
-                for axis in ["pan", "tilt", "zoom"]:
-                    if hasattr(camera_metrics.ptz_position, axis):
-                        self._add_metric(
-                            metrics,
-                            f"ptz_{axis}",
-                            {"camera_id": camera_id, "name": camera_metrics.name},
-                            timestamp,
-                            getattr(camera_metrics.ptz_position, axis),
-                        )
+def _parse_time(value: str) -> float:
+    """Parse a Unix timestamp or RFC 3339 time into seconds since the epoch"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
 
-                # PTZ Moving state
-                self._add_metric(
-                    metrics,
-                    "ptz_moving",
-                    {"camera_id": camera_id, "name": camera_metrics.name},
-                    timestamp,
-                    1 if camera_metrics.ptz_position.moving else 0,
-                )
 
-                # PTZ Preset
-                if camera_metrics.ptz_position.preset_id is not None:
-                    self._add_metric(
-                        metrics,
-                        "ptz_preset",
-                        {
-                            "camera_id": camera_id,
-                            "name": camera_metrics.name,
-                            "preset_id": str(camera_metrics.ptz_position.preset_id),
-                            "preset_name": camera_metrics.ptz_position.preset_name or "",
-                        },
-                        timestamp,
-                        camera_metrics.ptz_position.preset_id,
-                    )
-
-        return metrics
-
-    def _add_metric(
-        self,
-        metrics: Dict[str, Any],
-        metric_name: str,
-        labels: Dict[str, str],
-        timestamp: str,
-        value: Union[int, float],
-    ) -> None:
-        """Add a metric to the Grafana response"""
-        metric = {
-            "metric": {"__name__": metric_name, **labels},
-            "values": [[timestamp, value]],
-        }
-        metrics["data"]["result"].append(metric)
+def _parse_duration(value: str) -> float:
+    """Parse a step given in seconds or as a Prometheus duration such as ``5m``"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    for unit in sorted(_DURATION_UNITS, key=len, reverse=True):
+        if value.endswith(unit):
+            return float(value[: -len(unit)]) * _DURATION_UNITS[unit]
+    raise ValueError(f"Invalid duration: {value}")
 
 
 class MetricsServer:
@@ -265,43 +745,112 @@ class MetricsServer:
         port: int = 8080,
     ):
         self.metrics_collector = metrics_collector
+        self.datasource = GrafanaDatasource(metrics_collector.history)
         self.host = host
         self.port = port
         self._server = None
 
-    async def start(self):
-        """Start the metrics server"""
-        try:
-            import uvicorn
-            from fastapi import FastAPI
-            from fastapi.middleware.cors import CORSMiddleware
-
-            app = FastAPI(title="Tapo Camera MCP Metrics")
-
-            # Enable CORS
-            app.add_middleware(
-                CORSMiddleware,
-                allow_origins=["*"],
-                allow_credentials=True,
-                allow_methods=["*"],
-                allow_headers=["*"],
+    def create_app(self):
+        """Create the FastAPI application serving the metrics endpoints"""
+        from fastapi import Body, FastAPI
+        from fastapi.middleware.cors import CORSMiddleware
+        from fastapi.responses import JSONResponse, Response
+
+        app = FastAPI(title="Tapo Camera MCP Metrics")
+
+        # Enable CORS
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["*"],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+        @app.get("/api/health")
+        async def health_check():
+            return {"status": "ok"}
+
+        @app.get("/api/metrics")
+        async def get_metrics():
+            return Response(
+                content=self.metrics_collector.get_grafana_metrics_json(),
+                media_type="application/json",
+            )
+
+        @app.get("/api/v1/query_range")
+        async def query_range(
+            query: str,
+            start: str,
+            end: str,
+            step: str = "30s",
+            agg: str = "avg",
+        ):
+            """Prometheus-compatible range query over the metrics history"""
+            try:
+                result = self.metrics_collector.query_range(
+                    query, _parse_time(start), _parse_time(end), _parse_duration(step), agg
+                )
+                return Response(content=dumps(result), media_type="application/json")
+            except ValueError as e:
+                return JSONResponse(
+                    status_code=400,
+                    content={"status": "error", "errorType": "bad_data", "error": str(e)},
+                )
+
+        def bad_request(error: Exception):
+            return JSONResponse(status_code=400, content={"error": str(error)})
+
+        @app.get("/grafana/")
+        async def grafana_datasource_test():
+            """Connection test of the Grafana JSON datasource"""
+            return {"status": "ok"}
+
+        @app.post("/grafana/search")
+        async def grafana_search(request: Dict[str, Any] = Body(default={})):
+            """Series available to the Grafana JSON datasource"""
+            return self.datasource.search(request.get("target") or "")
+
+        @app.post("/grafana/query")
+        async def grafana_query(request: Dict[str, Any] = Body(...)):
+            """Bucketed, downsampled time series for Grafana panels"""
+            try:
+                result = self.datasource.query(request)
+            except (KeyError, ValueError) as e:
+                return bad_request(e)
+            return Response(content=dumps(result), media_type="application/json")
+
+        @app.post("/grafana/annotations")
+        async def grafana_annotations(request: Dict[str, Any] = Body(...)):
+            """Event annotations (motion, alarm, energy) for Grafana panels"""
+            try:
+                return self.datasource.annotations(request)
+            except (KeyError, ValueError) as e:
+                return bad_request(e)
+
+        @app.get("/metrics")
+        async def prometheus_metrics():
+            """Prometheus text exposition of all registered metrics"""
+            return Response(
+                content=self.metrics_collector.registry.render(), media_type=CONTENT_TYPE
             )
 
-            @app.get("/api/health")
-            async def health_check():
-                return {"status": "ok"}
+        @app.get("/api/cameras")
+        async def list_cameras():
+            cameras = {
+                camera_id: metrics.to_dict()
+                for camera_id, metrics in self.metrics_collector.metrics.items()
+            }
+            return Response(content=dumps(cameras), media_type="application/json")
 
-            @app.get("/api/metrics")
-            async def get_metrics():
-                return self.metrics_collector.get_grafana_metrics()
+        return app
 
-            @app.get("/api/cameras")
-            async def list_cameras():
-                return {
-                    camera_id: metrics.to_dict()
-                    for camera_id, metrics in self.metrics_collector.metrics.items()
-                }
+    async def start(self):
+        """Start the metrics server"""
+        try:
+            import uvicorn
 
+            app = self.create_app()
             config = uvicorn.Config(app, host=self.host, port=self.port, log_level="info")
             self._server = uvicorn.Server(config)
             await self._server.serve()
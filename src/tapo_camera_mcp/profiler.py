@@ -0,0 +1,169 @@
+"""
+On-demand statistical profiler.
+
+A background thread samples the stacks of all threads -- including the one
+running the event loop -- every few milliseconds with ``sys._current_frames()``
+for a fixed duration. Nothing is traced, so the profiled code runs at full
+speed and the cost is one stack walk per thread and sample.
+
+The result is a collapsed-stack profile (``thread;outer;...;inner count`` per
+line), which flamegraph.pl, speedscope and Grafana's flame graph panel read
+directly, plus a summary of the hottest functions.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .exceptions import DiagnosticsBusyError
+
+MAX_DURATION = 120.0
+
+
+def _frame_label(code, cache: Dict[Any, str]) -> str:
+    label = cache.get(code)
+    if label is None:
+        path = code.co_filename.replace(os.sep, "/").split("/")
+        location = "/".join(path[-2:])
+        label = cache[code] = f"{code.co_name} ({location}:{code.co_firstlineno})".replace(";", ":")
+    return label
+
+
+class Profile:
+    """Stack samples collected by :class:`SamplingProfiler`."""
+
+    def __init__(self, duration: float, interval: float):
+        self.duration = duration
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+
+    def add(self, thread_name: str, frames: List[str]) -> None:
+        """Add one sampled stack (outermost frame first)."""
+        self.stacks[";".join([thread_name, *frames])] += 1
+        if frames:
+            self.self_counts[frames[-1]] += 1
+            for frame in set(frames):
+                self.total_counts[frame] += 1
+
+    def collapsed(self) -> str:
+        """The profile in collapsed-stack format, one stack per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """The functions most often on top of a stack."""
+        stack_samples = sum(self.stacks.values()) or 1
+        return [
+            {
+                "function": function,
+                "self_samples": count,
+                "self_percent": round(100 * count / stack_samples, 2),
+                "total_percent": round(100 * self.total_counts[function] / stack_samples, 2),
+            }
+            for function, count in self.self_counts.most_common(limit)
+        ]
+
+    def to_dict(self, top: int = 20, include_collapsed: bool = True) -> Dict[str, Any]:
+        """Summary of the profile, optionally with the collapsed stacks."""
+        result: Dict[str, Any] = {
+            "duration_seconds": round(self.duration, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+            "top_functions": self.top(top),
+        }
+        if include_collapsed:
+            result["collapsed"] = self.collapsed()
+        return result
+
+
+class SamplingProfiler:
+    """Sample the stacks of all threads at a fixed interval."""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        """Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples
+            max_depth: Innermost frames kept per stack
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._labels: Dict[Any, str] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether a profile is being collected."""
+        return self._lock.locked()
+
+    def run(
+        self,
+        duration: float,
+        interval: Optional[float] = None,
+        loop_thread_id: Optional[int] = None,
+    ) -> Profile:
+        """Sample all threads for ``duration`` seconds (blocking).
+
+        Raises:
+            DiagnosticsBusyError: If another profile is being collected
+        """
+        if not self._lock.acquire(blocking=False):
+            raise DiagnosticsBusyError("A profile is already being collected")
+        try:
+            duration = min(max(duration, 0.0), MAX_DURATION)
+            return self._sample(duration, interval or self.interval, loop_thread_id)
+        finally:
+            self._lock.release()
+
+    def _sample(self, duration: float, interval: float, loop_thread_id: Optional[int]) -> Profile:
+        profile = Profile(duration, interval)
+        own_id = threading.get_ident()
+        labels = self._labels
+        start = time.perf_counter()
+        deadline = start + duration
+        next_sample = start
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, top_frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                name = names.get(thread_id, f"thread-{thread_id}")
+                if thread_id == loop_thread_id:
+                    name = f"event-loop ({name})"
+                frames = []
+                frame = top_frame
+                while frame is not None and len(frames) < self.max_depth:
+                    frames.append(_frame_label(frame.f_code, labels))
+                    frame = frame.f_back
+                frames.reverse()
+                profile.add(name, frames)
+            profile.samples += 1
+            next_sample += interval
+            now = time.perf_counter()
+            if next_sample >= deadline:
+                break
+            if next_sample > now:
+                time.sleep(next_sample - now)
+            else:
+                next_sample = now  # fell behind: skip the missed samples
+        profile.duration = time.perf_counter() - start
+        return profile
+
+    async def profile(self, duration: float, interval: Optional[float] = None) -> Profile:
+        """Collect a profile without blocking the event loop.
+
+        The thread calling this (the event loop's) is labelled in the stacks.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.run, duration, interval, threading.get_ident())
+
+
+# Global instance
+profiler = SamplingProfiler()
@@ -0,0 +1,346 @@
+"""
+Prometheus text exposition with pre-rendered output.
+
+Metrics are registered once in a :class:`MetricsRegistry`. Every labelled
+child renders its own sample lines and caches the text until its value
+changes, and the registry caches the complete exposition body until any child
+changes. A scrape of an unchanged registry is therefore a copy of cached
+bytes, and a scrape after a few updates only re-renders the changed children,
+so scrape latency stays flat with thousands of series.
+
+Label names, values and label sets are interned, so the many children sharing
+camera ids or tool names share their strings.
+"""
+
+import math
+import sys
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+_label_sets: Dict[LabelValues, LabelValues] = {}
+
+
+def _intern_labels(values: Iterable[str]) -> LabelValues:
+    """Intern a tuple of label values (and each value in it)."""
+    key = tuple(sys.intern(str(value)) for value in values)
+    return _label_sets.setdefault(key, key)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Child:
+    """One labelled series of a metric; caches its rendered lines."""
+
+    __slots__ = ("_metric", "_prefix", "_text", "_value")
+
+    def __init__(self, metric: "_Metric", values: LabelValues):
+        self._metric = metric
+        self._prefix = metric.name + _label_text(metric.labelnames, values) + " "
+        self._text: Optional[str] = None
+        self._value = 0.0
+
+    @property
+    def value(self) -> float:
+        """Current value."""
+        return self._value
+
+    def _changed(self) -> None:
+        self._text = None
+        self._metric.registry._dirty = True
+
+    def render(self) -> str:
+        if self._text is None:
+            self._text = self._prefix + format_value(self._value) + "\n"
+        return self._text
+
+
+class CounterChild(_Child):
+    """A monotonically increasing counter."""
+
+    __slots__ = ()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._metric.registry._lock:
+            self._value += amount
+            self._changed()
+
+
+class GaugeChild(_Child):
+    """A value that can go up and down."""
+
+    __slots__ = ()
+
+    def set(self, value: float) -> None:
+        """Set the gauge; unchanged values do not invalidate the rendered output."""
+        if value == self._value:
+            return
+        with self._metric.registry._lock:
+            self._value = value
+            self._changed()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        with self._metric.registry._lock:
+            self._value += amount
+            self._changed()
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        self.inc(-amount)
+
+
+class HistogramChild(_Child):
+    """Observations counted into cumulative buckets."""
+
+    __slots__ = ("_bucket_prefixes", "_count", "_counts", "_suffix", "_sum")
+
+    def __init__(self, metric: "Histogram", values: LabelValues):
+        super().__init__(metric, values)
+        names = (*metric.labelnames, "le")
+        self._bucket_prefixes = [
+            f"{metric.name}_bucket{_label_text(names, (*values, format_value(bound)))} "
+            for bound in (*metric.buckets, math.inf)
+        ]
+        self._suffix = _label_text(metric.labelnames, values) + " "
+        self._counts = [0] * (len(metric.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        """Sum of all observations."""
+        return self._sum
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        index = bisect_left(self._metric.buckets, value)
+        with self._metric.registry._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+            self._changed()
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within buckets."""
+        if not self._count:
+            return math.nan
+        rank = q * self._count
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip((*self._metric.buckets, math.inf), self._counts):
+            if cumulative + count >= rank and count:
+                if math.isinf(bound):
+                    return lower
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return lower
+
+    def render(self) -> str:
+        if self._text is None:
+            lines = []
+            cumulative = 0
+            for prefix, count in zip(self._bucket_prefixes, self._counts):
+                cumulative += count
+                lines.append(f"{prefix}{cumulative}\n")
+            name = self._metric.name
+            lines.append(f"{name}_sum{self._suffix}{format_value(self._sum)}\n")
+            lines.append(f"{name}_count{self._suffix}{self._count}\n")
+            self._text = "".join(lines)
+        return self._text
+
+
+class _Metric:
+    """A named metric family with a fixed set of label names."""
+
+    type_name = "untyped"
+    child_class = _Child
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ):
+        self.registry = registry
+        self.name = sys.intern(name)
+        self.documentation = documentation
+        self.labelnames = _intern_labels(labelnames)
+        help_text = documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        self.header = f"# HELP {name} {help_text}\n# TYPE {name} {self.type_name}\n"
+        self._children: Dict[LabelValues, _Child] = {}
+
+    def labels(self, *values: str, **labels: str):
+        """Return the child series for a label set, creating it on first use."""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {list(self.labelnames)}")
+        child = self._children.get(tuple(str(value) for value in values))
+        if child is None:
+            key = _intern_labels(values)
+            with self.registry._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self.child_class(self, key)
+                    self._children[key] = child
+                    self.registry._dirty = True
+        return child
+
+    def remove(self, *values: str, **labels: str) -> None:
+        """Drop the child series of a label set."""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        with self.registry._lock:
+            if self._children.pop(tuple(str(value) for value in values), None) is not None:
+                self.registry._dirty = True
+
+    def children(self) -> List[Tuple[Dict[str, str], _Child]]:
+        """Label sets and child series of this metric."""
+        return [
+            (dict(zip(self.labelnames, values)), child)
+            for values, child in list(self._children.items())
+        ]
+
+    def render(self) -> str:
+        if not self._children:
+            return ""
+        return self.header + "".join(child.render() for child in list(self._children.values()))
+
+
+class Counter(_Metric):
+    """Counter metric family."""
+
+    type_name = "counter"
+    child_class = CounterChild
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the unlabelled counter."""
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """Gauge metric family."""
+
+    type_name = "gauge"
+    child_class = GaugeChild
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Histogram metric family."""
+
+    type_name = "histogram"
+    child_class = HistogramChild
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        super().__init__(registry, name, documentation, labelnames)
+
+    def observe(self, value: float) -> None:
+        """Record an observation in the unlabelled histogram."""
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    """Registry rendering its metrics in Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.RLock()
+        self._dirty = True
+        self._body = b""
+
+    def _register(self, cls, name: str, documentation: str, labelnames, **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(self, name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+                self._dirty = True
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered differently")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register (or return the already registered) counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register (or return the already registered) gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register (or return the already registered) histogram."""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Return a registered metric by name."""
+        return self._metrics.get(name)
+
+    def render(self) -> bytes:
+        """Render the exposition body, reusing the previous one if nothing changed."""
+        if not self._dirty:
+            return self._body
+        with self._lock:
+            self._dirty = False
+            self._body = "".join(metric.render() for metric in self._metrics.values()).encode()
+            return self._body
+
+
+# Global instance
+registry = MetricsRegistry()
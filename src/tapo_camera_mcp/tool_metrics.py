@@ -0,0 +1,122 @@
+"""
+Per-tool call metrics.
+
+Every registered MCP tool is wrapped by :meth:`ToolMetrics.instrument`, which
+counts calls and errors and records the call latency in a histogram. The
+histogram uses log-linear buckets in the style of HDR histograms: each power of
+two between 100 µs and about two minutes is split into four sub-buckets, so no
+bucket is wider than a quarter of its lower bound and p50/p99 stay meaningful
+from fast metadata tools to slow captures. The metrics live in the Prometheus
+registry and appear on the ``/metrics`` endpoint.
+"""
+
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .prometheus import MetricsRegistry
+from .prometheus import registry as prometheus_registry
+
+
+def hdr_buckets(
+    lowest: float = 0.0001, highest: float = 120.0, sub_buckets: int = 4
+) -> List[float]:
+    """Log-linear bucket bounds: ``sub_buckets`` linear steps per power of two."""
+    bounds = []
+    base = lowest
+    while base < highest:
+        step = base / sub_buckets
+        bounds.extend(round(base + step * index, 9) for index in range(sub_buckets))
+        base *= 2
+    bounds.append(round(base, 9))
+    return bounds
+
+
+LATENCY_BUCKETS = tuple(hdr_buckets())
+
+
+def _is_error(result: Any) -> bool:
+    """Whether a tool result reports a failure (the wrappers return errors as results)."""
+    if isinstance(result, dict):
+        return bool(result.get("is_error")) or result.get("success") is False
+    return bool(getattr(result, "is_error", False))
+
+
+class ToolMetrics:
+    """Call counts, error counts and latency histograms per tool."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry if registry is not None else prometheus_registry
+        self.calls = self.registry.counter("mcp_tool_calls_total", "MCP tool calls", ["tool"])
+        self.errors = self.registry.counter(
+            "mcp_tool_errors_total", "MCP tool calls that failed", ["tool"]
+        )
+        self.latency = self.registry.histogram(
+            "mcp_tool_duration_seconds", "MCP tool call latency", ["tool"], LATENCY_BUCKETS
+        )
+
+    def record(self, tool_name: str, duration: float, error: bool = False) -> None:
+        """Record one call of a tool."""
+        self.calls.labels(tool_name).inc()
+        if error:
+            self.errors.labels(tool_name).inc()
+        self.latency.labels(tool_name).observe(duration)
+
+    def instrument(self, tool_name: str, func: Callable) -> Callable:
+        """Wrap a tool function so every call is measured.
+
+        The wrapper keeps the signature and docstring of ``func``, so FastMCP
+        derives the same tool schema from it.
+        """
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException:
+                    self.record(tool_name, time.perf_counter() - start, error=True)
+                    raise
+                self.record(tool_name, time.perf_counter() - start, _is_error(result))
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                self.record(tool_name, time.perf_counter() - start, error=True)
+                raise
+            self.record(tool_name, time.perf_counter() - start, _is_error(result))
+            return result
+
+        return wrapper
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Calls, errors and latency quantiles (in milliseconds) of every called tool."""
+        errors = {labels["tool"]: child.value for labels, child in self.errors.children()}
+        result = {}
+        for labels, child in sorted(self.latency.children(), key=lambda item: item[0]["tool"]):
+            tool_name = labels["tool"]
+            calls = child.count
+            if not calls:
+                continue
+            result[tool_name] = {
+                "calls": calls,
+                "errors": int(errors.get(tool_name, 0)),
+                "error_rate": round(errors.get(tool_name, 0) / calls, 4),
+                "mean_ms": round(child.sum / calls * 1000, 3),
+                "p50_ms": round(child.quantile(0.5) * 1000, 3),
+                "p90_ms": round(child.quantile(0.9) * 1000, 3),
+                "p99_ms": round(child.quantile(0.99) * 1000, 3),
+            }
+        return result
+
+
+# Global instance
+tool_metrics = ToolMetrics()
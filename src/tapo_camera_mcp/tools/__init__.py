@@ -33,10 +33,6 @@ from tapo_camera_mcp.tools.discovery import discover_tools
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Re-export functions from base_tool
-get_tool = _get_tool
-get_all_tools = _get_all_tools
-
 
 def discover_tools_wrapper(package: Optional[str] = None) -> List[Type[BaseTool]]:
     """Discover and import all tools in the specified package.
@@ -111,10 +107,6 @@ def discover_tools_in_path(package_path: str, package_name: str) -> None:
             logger.exception(f"Failed to import tool module {full_module_name}: {e}")
 
 
-# Re-export functions from base_tool
-get_tool = _get_tool
-get_all_tools = _get_all_tools
-
 # Global flag to prevent multiple calls
 _tools_registered = False
 
@@ -128,6 +120,9 @@ def import_consolidated_tools():
     """
     global _tools_registered
 
+    if _tools_registered:
+        return
+
     try:
         # Check if we already have consolidated tools registered
         if len(_tool_registry) >= 16:
@@ -192,10 +187,24 @@ def import_consolidated_tools():
         # Fallback to old discovery method if needed
         logger.warning("Falling back to old discovery method...")
         discover_tools()
+        _tools_registered = True
+
 
+def get_tool(name: str) -> Optional[Type[BaseTool]]:
+    """Get a registered tool by name, importing the tool modules on first use."""
+    import_consolidated_tools()
+    return _get_tool(name)
 
-# Import only consolidated tools (skip old discovery)
-import_consolidated_tools()
+
+def get_all_tools() -> List[Type[BaseTool]]:
+    """Get all registered tools, importing the tool modules on first use.
+
+    The modules are not imported with the package, so that the server can
+    register tools from the prebuilt manifest (see ``tools.manifest``) and
+    import each tool module only when the tool is first called.
+    """
+    import_consolidated_tools()
+    return _get_all_tools()
 
 __all__ = [
     "BaseTool",
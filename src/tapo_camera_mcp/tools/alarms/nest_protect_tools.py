@@ -7,11 +7,13 @@ enabling real-time monitoring and alert correlation with camera systems.
 
 import asyncio
 import logging
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
-from ...tools.base_tool import BaseTool, ToolCategory, tool
+from ...event_counters import ALARM, event_counters
+from ...tools.base_tool import BaseTool, CachePolicy, ToolCategory, tool
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,7 @@ class NestProtectManager:
     def __init__(self):
         self.devices: Dict[str, NestProtectDevice] = {}
         self.alerts: List[NestProtectAlert] = []
+        self._seen_alert_ids: set = set()
         self._initialized = False
 
     async def initialize(self, google_account: Dict[str, str]) -> bool:
@@ -160,9 +163,21 @@ class NestProtectManager:
         ]
 
         alerts = [NestProtectAlert(**alert_data) for alert_data in sample_alerts]
-        self.alerts.extend(alerts)
+        for alert in alerts:
+            if alert.alert_id not in self._seen_alert_ids:
+                self._seen_alert_ids.add(alert.alert_id)
+                self.alerts.append(alert)
+                self._count_alert(alert)
         return alerts
 
+    def _count_alert(self, alert: NestProtectAlert) -> None:
+        """Count a newly seen alert in the per-device alarm event counters."""
+        try:
+            timestamp = datetime.fromisoformat(alert.timestamp.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            timestamp = None
+        event_counters.record(alert.device_id, ALARM, timestamp)
+
     async def trigger_test(self, device_id: str) -> bool:
         """Trigger a test on a Nest Protect device."""
         try:
@@ -202,6 +217,7 @@ class GetNestProtectStatusTool(BaseTool):
             "Get status and health information for all Nest Protect smoke and CO detectors"
         )
         category = ToolCategory.SECURITY
+        cache = CachePolicy(ttl=30, invalidated_by=("test_nest_protect_device", "nest_protect"))
 
     async def execute(self) -> Dict[str, Any]:
         """Execute the tool to get Nest Protect device status."""
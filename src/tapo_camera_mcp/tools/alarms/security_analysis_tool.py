@@ -215,9 +215,10 @@ class SecurityAnalysisTool(BaseTool):
         # Sort events by timestamp
         events.sort(key=lambda x: x["timestamp"])
 
-        # Find correlations
+        # Find correlations, sending those of each event as soon as they are known
         correlations = []
         for i, event in enumerate(events):
+            found = len(correlations)
             for j, other_event in enumerate(events[i + 1 :], i + 1):
                 time_diff = abs(event["timestamp"] - other_event["timestamp"])
                 if time_diff <= 300:  # Within 5 minutes
@@ -234,6 +235,14 @@ class SecurityAnalysisTool(BaseTool):
                                 ),
                             }
                         )
+            if len(correlations) > found:
+                await self.send_partial(
+                    {"event_id": event["event_id"], "correlations": correlations[found:]},
+                    progress=i + 1,
+                    total=len(events),
+                )
+            else:
+                await self.report_progress(i + 1, len(events))
 
         # Generate insights
         insights = []
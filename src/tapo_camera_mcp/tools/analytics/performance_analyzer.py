@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from ...tool_metrics import tool_metrics
 from ...tools.base_tool import BaseTool, ToolCategory, tool
 
 logger = logging.getLogger(__name__)
@@ -83,9 +84,9 @@ class PerformanceAnalyzerTool(BaseTool):
         analysis_results = {
             "timestamp": time.time(),
             "analysis_type": "full_performance",
-            "camera_operations": await self._analyze_camera_operations(),
-            "system_resources": await self._analyze_system_resources(),
-            "network_performance": await self._analyze_network_performance(),
+            "camera_operations": await self._camera_operations_analysis(),
+            "system_resources": await self._system_resources_analysis(),
+            "network_performance": await self._network_performance_analysis(),
             "recommendations": await self._generate_recommendations(),
         }
 
@@ -98,17 +99,28 @@ class PerformanceAnalyzerTool(BaseTool):
     async def _camera_operations_analysis(self) -> Dict[str, Any]:
         """Analyze camera operation performance."""
         try:
-            # Simulate camera operations analysis
+            # Measured calls of every tool since the server started
             operations = [
-                {"name": "connect", "avg_duration_ms": 150, "success_rate": 0.95},
-                {"name": "capture_image", "avg_duration_ms": 800, "success_rate": 0.92},
-                {"name": "get_stream", "avg_duration_ms": 200, "success_rate": 0.98},
-                {"name": "ptz_move", "avg_duration_ms": 1200, "success_rate": 0.88},
+                {
+                    "name": name,
+                    "calls": stats["calls"],
+                    "avg_duration_ms": stats["mean_ms"],
+                    "p50_duration_ms": stats["p50_ms"],
+                    "p99_duration_ms": stats["p99_ms"],
+                    "success_rate": round(1 - stats["error_rate"], 4),
+                }
+                for name, stats in tool_metrics.snapshot().items()
             ]
+            if not operations:
+                return {"operations": [], "statistics": {"total_operations": 0}}
 
-            total_operations = len(operations)
-            avg_duration = sum(op["avg_duration_ms"] for op in operations) / total_operations
-            avg_success_rate = sum(op["success_rate"] for op in operations) / total_operations
+            total_operations = sum(op["calls"] for op in operations)
+            avg_duration = (
+                sum(op["avg_duration_ms"] * op["calls"] for op in operations) / total_operations
+            )
+            avg_success_rate = (
+                sum(op["success_rate"] * op["calls"] for op in operations) / total_operations
+            )
 
             return {
                 "operations": operations,
@@ -10,8 +10,9 @@ This tool provides intelligent automation capabilities including:
 
 import logging
 import time
+import weakref
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, ClassVar, Dict, List
 
 from pydantic import BaseModel, Field
 
@@ -65,8 +66,14 @@ class SmartAutomationTool(BaseTool):
         class Parameters:
             action: str = Field(..., description="Action to perform")
 
+    # Live instances, so memory diagnostics can size their histories
+    instances: ClassVar["weakref.WeakValueDictionary[int, SmartAutomationTool]"] = (
+        weakref.WeakValueDictionary()
+    )
+
     def __init__(self):
         super().__init__()
+        SmartAutomationTool.instances[id(self)] = self
         self._rules: Dict[str, AutomationRule] = {}
         self._schedules: Dict[str, AutomationSchedule] = {}
         self._automation_history: List[Dict[str, Any]] = []
@@ -8,10 +8,12 @@ with FastMCP 2.12 compatibility.
 import inspect
 import logging
 from enum import Enum
-from typing import Any, Awaitable, Dict, List, Optional, Type, Union
+from typing import Any, Awaitable, Dict, List, NamedTuple, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel, ConfigDict
 
+from .progress import current_reporter
+
 logger = logging.getLogger(__name__)
 
 
@@ -123,6 +125,21 @@ class ToolDefinition(BaseModel):
     model_config = ConfigDict(use_enum_values=True)
 
 
+class CachePolicy(NamedTuple):
+    """Result caching of a read-only tool, declared as ``Meta.cache``.
+
+    Successful results are reused for ``ttl`` seconds per combination of the
+    ``key`` parameters (all parameters if None). Calls of the tools named in
+    ``invalidated_by`` drop the cached results. If ``only`` maps parameters to
+    values, only calls with one of those values for each of them are cached.
+    """
+
+    ttl: float
+    key: Optional[Tuple[str, ...]] = None
+    invalidated_by: Tuple[str, ...] = ()
+    only: Optional[Dict[str, Tuple[Any, ...]]] = None
+
+
 class BaseTool(BaseModel):
     """Base class for all Tapo Camera MCP tools.
 
@@ -172,6 +189,31 @@ class BaseTool(BaseModel):
         """
         raise NotImplementedError("Subclasses must implement execute method")
 
+    async def report_progress(
+        self,
+        progress: Optional[float] = None,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Send a progress notification to the client of the running call.
+
+        Without ``progress`` the progress advances by one step.
+        """
+        await current_reporter().report(progress, total, message)
+
+    async def send_partial(
+        self,
+        item: Any,
+        progress: Optional[float] = None,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Send one partial result to the client as soon as it is available.
+
+        Without ``progress`` each partial result advances the progress by one step.
+        """
+        await current_reporter().partial(item, progress, total, message)
+
 
 def tool(
     name: Optional[str] = None,
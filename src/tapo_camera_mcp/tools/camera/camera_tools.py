@@ -11,7 +11,7 @@ from typing import Any, Dict, Literal, Optional
 from pydantic import ConfigDict, Field
 
 from tapo_camera_mcp.exceptions import AuthenticationError, ConnectionError
-from tapo_camera_mcp.tools.base_tool import BaseTool, ToolCategory, register_tool, tool
+from tapo_camera_mcp.tools.base_tool import BaseTool, CachePolicy, ToolCategory, register_tool, tool
 from tapo_camera_mcp.validation import (
     ToolValidationError,
     validate_camera_name,
@@ -60,6 +60,19 @@ class ListCamerasTool(BaseTool):
         name = "list_cameras"
         description = "List all registered cameras and their status"
         category = ToolCategory.CAMERA
+        cache = CachePolicy(
+            ttl=30,
+            invalidated_by=(
+                "add_camera",
+                "remove_camera",
+                "connect_camera",
+                "disconnect_camera",
+                "set_active_camera",
+                "camera_management",
+                "camera_connection",
+                "manage_camera_groups",
+            ),
+        )
 
         class Parameters:
             pass
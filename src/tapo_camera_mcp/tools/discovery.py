@@ -53,12 +53,13 @@ def is_tool_class(obj: Any) -> bool:
         return False
 
 
-def discover_tools(package: str = "tapo_camera_mcp.tools") -> List[Type[Any]]:
+def discover_tools(package: str = "tapo_camera_mcp.tools", rescan: bool = False) -> List[Type[Any]]:
     """
     Discover and return all available tools from the specified package.
 
     Args:
         package: The package to search for tools (default: 'tapo_camera_mcp.tools')
+        rescan: Also return the tools of modules processed by an earlier call
 
     Returns:
         List of tool classes that can be registered with the MCP server.
@@ -87,7 +88,7 @@ def discover_tools(package: str = "tapo_camera_mcp.tools") -> List[Type[Any]]:
 
                 try:
                     # Skip already imported modules to avoid re-processing
-                    if name in _imported_modules:
+                    if name in _imported_modules and not rescan:
                         continue
 
                     logger.debug(f"Importing module: {name}")
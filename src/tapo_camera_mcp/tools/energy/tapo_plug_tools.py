@@ -11,7 +11,8 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
-from ...tools.base_tool import BaseTool, ToolCategory, tool
+from ...event_counters import ENERGY, event_counters
+from ...tools.base_tool import BaseTool, CachePolicy, ToolCategory, tool
 
 logger = logging.getLogger(__name__)
 
@@ -276,6 +277,8 @@ class TapoPlugManager:
                 return False
 
             device = self.devices[device_id]
+            if device.power_state != power_state:
+                event_counters.record(device_id, ENERGY)
             device.power_state = power_state
             device.current_power = 0.0 if not power_state else device.current_power
             device.last_seen = datetime.now().isoformat()
@@ -287,6 +290,16 @@ class TapoPlugManager:
             logger.exception("Failed to toggle device %s: %s", device_id, e)
             return False
 
+    def samples(self) -> List[tuple]:
+        """Current (metric name, labels, value) samples of all plugs for the metrics history."""
+        result = []
+        for device_id, device in self.devices.items():
+            labels = {"device_id": device_id, "name": device.name}
+            result.append(("plug_power_watts", labels, device.current_power))
+            result.append(("plug_power_state", labels, 1 if device.power_state else 0))
+            result.append(("plug_daily_energy_kwh", labels, device.daily_energy))
+        return result
+
     async def get_energy_usage_history(
         self, device_id: Optional[str] = None, hours: int = 24
     ) -> List[EnergyUsageData]:
@@ -345,6 +358,15 @@ class GetSmartPlugStatusTool(BaseTool):
             "Get status and energy consumption information for all Tapo smart plug devices"
         )
         category = ToolCategory.UTILITY
+        cache = CachePolicy(
+            ttl=10,
+            invalidated_by=(
+                "control_smart_plug",
+                "set_tapo_p115_energy_saving_mode",
+                "set_energy_automation",
+                "energy_management",
+            ),
+        )
 
     async def execute(self) -> Dict[str, Any]:
         """Execute the tool to get smart plug status."""
@@ -1,9 +1,9 @@
 """Grafana metrics collection tool."""
 
-import asyncio
 from datetime import datetime
 from typing import Any, Dict
 
+from ...event_counters import ALARM, ENERGY, MOTION, event_counters
 from ..base_tool import BaseTool, ToolCategory
 
 
@@ -18,8 +18,10 @@ class GrafanaMetricsTool(BaseTool):
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """Collect all camera metrics for Grafana consumption."""
         try:
-            # Get camera manager instance
-            camera_manager = self.get_camera_manager()
+            from ...core.server import TapoCameraServer
+
+            server = await TapoCameraServer.get_instance()
+            camera_manager = server.camera_manager
 
             metrics = {
                 "timestamp": datetime.utcnow().isoformat() + "Z",
@@ -29,6 +31,8 @@ class GrafanaMetricsTool(BaseTool):
                     "total_cameras": len(camera_manager.cameras),
                     "alerts_pending": 0,
                     "recordings_active": 0,
+                    "alarm_events_24h": self._total_events(ALARM),
+                    "energy_events_24h": self._total_events(ENERGY),
                     "vienna_context": {
                         "timezone": "Europe/Vienna",
                         "season": self._get_vienna_season(),
@@ -42,14 +46,17 @@ class GrafanaMetricsTool(BaseTool):
             for camera_id, camera in camera_manager.cameras.items():
                 try:
                     # Get camera status and info
-                    status = await camera.get_device_info()
+                    status = await camera.get_status()
+                    last_motion = event_counters.last_event(camera_id, MOTION)
 
                     camera_metrics = {
-                        "status": "online" if status.get("online", False) else "offline",
+                        "status": "online" if status.get("connected", False) else "offline",
                         "uptime_minutes": status.get("uptime", 0) // 60,
-                        "motion_events_1h": await self._get_motion_events(camera_id, hours=1),
-                        "motion_events_24h": await self._get_motion_events(camera_id, hours=24),
-                        "last_motion_time": await self._get_last_motion_time(camera_id),
+                        "motion_events_1h": int(event_counters.count(camera_id, MOTION, 3600)),
+                        "motion_events_24h": int(
+                            event_counters.count(camera_id, MOTION, 24 * 3600)
+                        ),
+                        "last_motion_time": last_motion.isoformat() if last_motion else None,
                         "recording_active": status.get("recording", False),
                         "temperature_celsius": status.get("temperature", 25.0),
                         "signal_strength_dbm": status.get("wifi_signal", -50),
@@ -109,51 +116,11 @@ class GrafanaMetricsTool(BaseTool):
         month = datetime.now().month
         return month >= 10 or month <= 5
 
-    async def _get_motion_events(self, camera_id: str, hours: int) -> int:
-        """Get motion event count for specified time period."""
-        try:
-            from tapo_camera_mcp.core.server import TapoCameraServer
-
-            server = await TapoCameraServer.get_instance()
-
-            if hasattr(server, "camera_manager") and server.camera_manager:
-                camera = server.camera_manager.cameras.get(camera_id)
-                if camera and hasattr(camera, "_camera") and camera._camera:
-                    # Get real motion events from camera
-                    motion_data = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: camera._camera.getMotionDetection()
-                    )
-
-                    # Extract motion event count from camera response
-                    # This is a simplified implementation - real cameras may have different APIs
-                    events = motion_data.get("motion_detection", {}).get("events", [])
-
-                    # Filter events by time period
-                    from datetime import datetime, timedelta
-
-                    cutoff_time = datetime.now() - timedelta(hours=hours)
-                    recent_events = [
-                        event
-                        for event in events
-                        if datetime.fromisoformat(event.get("timestamp", "1970-01-01"))
-                        > cutoff_time
-                    ]
-
-                    return len(recent_events)
-
-            # Fallback: return 0 if no real data available
-            return 0
-
-        except Exception:
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.exception("Failed to get motion events for %s", camera_id)
-            return 0
-
-    async def _get_last_motion_time(self, camera_id: str) -> str:
-        """Get timestamp of last motion detection."""
-        # TODO: Implement from actual camera logs
-        # For now, return recent time - replace with actual implementation
-        recent_time = datetime.utcnow().replace(minute=45, second=23)
-        return recent_time.isoformat() + "Z"
+    def _total_events(self, event_type: str, window_seconds: int = 24 * 3600) -> int:
+        """Count events of one type over all sources in the trailing window."""
+        return int(
+            sum(
+                event_counters.count(source, event_type, window_seconds)
+                for source in event_counters.sources(event_type)
+            )
+        )
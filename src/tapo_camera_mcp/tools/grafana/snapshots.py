@@ -1,49 +1,83 @@
 """Grafana live camera snapshot tool - MANDATORY FOR VIDEO/IMAGES."""
 
-import base64
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from pydantic import Field
 
 from ..base_tool import BaseTool, ToolCategory
 
 
 class GrafanaSnapshotsTool(BaseTool):
-    """Tool for capturing live camera snapshots for Grafana image panels."""
+    """Tool for capturing live camera snapshots for Grafana image panels.
+
+    The image is not inlined in the result: it is put in the blob store and
+    the result refers to it by resource URI (``tapo://snapshots/<sha256>``)
+    and REST path, which stay readable for the store's TTL.
+    """
 
     class Meta:
         name: str = "get_camera_snapshot"
         description: str = (
-            "Capture live camera snapshot for Grafana image panels - MANDATORY FOR VIDEO/IMAGES"
+            "Capture live camera snapshot for Grafana image panels - MANDATORY FOR VIDEO/IMAGES. "
+            "Returns a tapo://snapshots/<sha256> resource URI and REST URL of the JPEG"
         )
         category: ToolCategory = ToolCategory.UTILITY
 
+        class Parameters:
+            camera_id: str = Field(..., description="Camera to capture")
+            width: Optional[int] = Field(None, description="Maximum image width in pixels")
+            height: Optional[int] = Field(None, description="Maximum image height in pixels")
+            max_age: Optional[float] = Field(
+                None, description="Oldest cached frame in seconds to accept before capturing live"
+            )
+
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """Capture a snapshot from the specified camera."""
         try:
             camera_id = kwargs.get("camera_id")
-            quality = kwargs.get("quality", "medium")
             width = kwargs.get("width")
             height = kwargs.get("height")
 
             if not camera_id:
                 raise ValueError("camera_id is required")
 
-            # Get camera instance
-            camera = self.get_camera_manager().get_camera(camera_id)
-            if not camera:
+            from ...core.server import TapoCameraServer
+            from ...media.scheduler import snapshot_scheduler
+
+            # Serve the scheduler's latest frame; capture live only if it is stale
+            server = await TapoCameraServer.get_instance()
+            if camera_id not in server.camera_manager.cameras:
                 raise ValueError(f"Camera {camera_id} not found")
 
-            # Capture snapshot
-            image_data = await camera.get_snapshot(quality=quality, width=width, height=height)
+            frame = await snapshot_scheduler.latest(
+                camera_id, kwargs.get("max_age"), camera_manager=server.camera_manager
+            )
+            if frame is None:
+                raise RuntimeError(f"Camera {camera_id} did not return an image")
+            image_data = frame.data
+            if width or height:
+                from ...media.thumbnails import thumbnail_service
+
+                thumb = await thumbnail_service.get(
+                    frame.data, width, height, source_id=frame.source_id
+                )
+                image_data = thumb.data
+
+            # Refer to the image instead of inlining it
+            from ...media.blob_store import blob_store
 
-            # Convert to base64 for web display
-            image_base64 = base64.b64encode(image_data).decode("utf-8")
+            blob = blob_store.put(image_data, "image/jpeg", kind="snapshots")
 
             return {
                 "success": True,
                 "data": {
-                    "image": f"data:image/jpeg;base64,{image_base64}",
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                    "image": blob.reference(),
+                    "timestamp": datetime.utcfromtimestamp(
+                        frame.captured_at.timestamp()
+                    ).isoformat()
+                    + "Z",
+                    "age": round(frame.age, 3),
                     "camera_id": camera_id,
                     "format": "jpeg",
                 },
@@ -0,0 +1,213 @@
+"""
+Tool invocation.
+
+The MCP server registers one wrapper function per manifest entry. The wrapper
+carries an ``inspect.Signature`` built from the entry's parameter schema, so
+no source code is generated, and hands every call to the ``ToolInvoker`` of
+its tool class. On the first call the invoker imports the tool class and
+works out once how to call it:
+
+- arguments that are fields of the tool model are validated by constructing
+  the tool, so such calls get an instance of their own;
+- the other arguments are validated with a model compiled once from the
+  tool's ``Meta.Parameters`` and passed to ``execute`` -- or to ``_run`` for
+  tools that only implement ``_run`` -- of an instance shared by all calls.
+  Tools that keep state of their own (private attributes or an ``__init__``
+  of their own) get a new instance per call instead, so concurrent calls
+  cannot overwrite each other's state.
+"""
+
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Type
+
+from pydantic import BaseModel, create_model
+
+from .base_tool import BaseTool, ToolResult
+from .manifest import parameter_fields, resolve_tool
+from .progress import request_reporter, run_with_reporter
+from .result_cache import result_cache
+
+logger = logging.getLogger(__name__)
+
+_PARAMETER_KINDS = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+
+_invokers: Dict[tuple, "ToolInvoker"] = {}
+
+
+def is_stateless(tool_cls: Type[Any]) -> bool:
+    """Whether calls can share one instance of a tool class.
+
+    A tool that declares private attributes or sets up attributes in an
+    ``__init__`` of its own may keep per-call state on ``self``.
+    """
+    if getattr(tool_cls, "__private_attributes__", None):
+        return False
+    base_classes = set(BaseTool.__mro__)
+    return all("__init__" not in vars(cls) for cls in tool_cls.__mro__ if cls not in base_classes)
+
+
+class ToolInvoker:
+    """Calls the tool class of a manifest entry with the arguments of a tool call."""
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.entry = entry
+        self.name = entry["name"]
+        self.tool_cls: Optional[Type[Any]] = None
+        self.method_name = "execute"
+        self._call_names: Set[str] = set()
+        self._call_model: Optional[Type[BaseModel]] = None
+        self._shared: Optional[Any] = None
+        self._shareable = False
+        self._construct: Callable[..., Any] = dict
+        self._initialize = False
+
+    def _prepare(self) -> None:
+        """Import the tool class and compile the validator of its call arguments."""
+        tool_cls = resolve_tool(self.entry)
+        if getattr(tool_cls, "execute", None) is BaseTool.execute and hasattr(tool_cls, "_run"):
+            self.method_name = "_run"
+        method = getattr(tool_cls, self.method_name, None)
+        if method is None:
+            raise ValueError(f"Tool {self.name} has no execute method")
+
+        params = list(inspect.signature(method).parameters.values())[1:]
+        accepts_any = any(param.kind == inspect.Parameter.VAR_KEYWORD for param in params)
+        accepted = {param.name for param in params if param.kind in _PARAMETER_KINDS}
+        model_fields = getattr(tool_cls, "model_fields", {})
+        call_fields = {
+            name: field
+            for name, field in parameter_fields(tool_cls).items()
+            if name not in model_fields and (accepts_any or name in accepted)
+        }
+        self._call_names = set(call_fields) | (accepted - set(model_fields))
+        if call_fields:
+            try:
+                self._call_model = create_model(f"{tool_cls.__name__}Arguments", **call_fields)
+            except Exception as e:
+                logger.debug(f"Passing the arguments of {self.name} unvalidated: {e}")
+
+        if isinstance(tool_cls, type) and issubclass(tool_cls, BaseModel):
+            self._construct = tool_cls.model_validate
+        else:
+            self._construct = lambda args: tool_cls(**args)
+        self._initialize = callable(getattr(tool_cls, "initialize", None))
+        self._shareable = is_stateless(tool_cls)
+        self.tool_cls = tool_cls
+
+    async def _instance(self, field_args: Dict[str, Any]) -> Any:
+        """A tool instance for a call, shared unless the call sets fields or the tool has state."""
+        if not field_args and self._shared is not None:
+            return self._shared
+        instance = self._construct(field_args)
+        if self._initialize:
+            result = instance.initialize()
+            if inspect.isawaitable(result):
+                await result
+        if not field_args and self._shareable:
+            self._shared = instance
+        return instance
+
+    async def __call__(self, arguments: Dict[str, Any]) -> Any:
+        """Run the tool with the arguments of one call and return its raw result."""
+        if self.tool_cls is None:
+            self._prepare()
+
+        if not self._call_names:
+            field_args, call_args = arguments, {}
+        else:
+            field_args = {k: v for k, v in arguments.items() if k not in self._call_names}
+            call_args = {k: v for k, v in arguments.items() if k in self._call_names}
+        if self._call_model is not None:
+            validated = self._call_model.model_validate(call_args)
+            call_args = {name: getattr(validated, name) for name in self._call_model.model_fields}
+
+        instance = await self._instance(field_args)
+        result = getattr(instance, self.method_name)(**call_args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+def get_invoker(entry: Dict[str, Any]) -> ToolInvoker:
+    """The invoker of the tool class of a manifest entry, created once per class."""
+    key = (entry["module"], entry["class"])
+    invoker = _invokers.get(key)
+    if invoker is None:
+        invoker = _invokers[key] = ToolInvoker(entry)
+    return invoker
+
+
+def signature_from_schema(schema: Dict[str, Any]) -> inspect.Signature:
+    """Keyword-only signature of a JSON parameter schema, required parameters first."""
+    properties = schema.get("properties", {})
+    required = set(schema.get("required", []))
+    names = [name for name in properties if name in required]
+    names += [name for name in properties if name not in required]
+    return inspect.Signature(
+        [
+            inspect.Parameter(
+                name,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=inspect.Parameter.empty
+                if name in required
+                else properties[name].get("default"),
+            )
+            for name in names
+        ]
+    )
+
+
+def to_response(result: Any) -> Dict[str, Any]:
+    """Turn the result of a tool into the dictionary returned to the MCP client."""
+    if isinstance(result, ToolResult):
+        return {"content": result.content, "is_error": result.is_error}
+    if isinstance(result, dict):
+        return result
+    return {"content": str(result), "is_error": False}
+
+
+def build_tool_wrapper(
+    entry: Dict[str, Any],
+    run_in: Optional[Callable[[Awaitable[Any]], Awaitable[Any]]] = None,
+) -> Callable:
+    """Create the function FastMCP calls for a manifest entry.
+
+    ``run_in`` takes the tool's coroutine and returns an awaitable of its
+    result, to run tools on an event loop other than the caller's. Progress
+    the tool reports is sent to the client of the MCP request, and results
+    of tools declaring a cache policy are served from ``result_cache``.
+    """
+    invoker = get_invoker(entry)
+    properties = entry["parameters"].get("properties", {})
+    required = set(entry["parameters"].get("required", []))
+    # Optional parameters without a default in the schema are left to the tool
+    unset = {
+        name for name in properties if name not in required and "default" not in properties[name]
+    }
+
+    result_cache.register(entry)
+
+    async def tool_wrapper(**kwargs):
+        arguments = {k: v for k, v in kwargs.items() if not (v is None and k in unset)}
+        cached = result_cache.get(invoker.name, arguments)
+        if cached is not None:
+            return cached
+        try:
+            call = run_with_reporter(request_reporter(), invoker(arguments))
+            result = to_response(await (call if run_in is None else run_in(call)))
+            result_cache.record(invoker.name, arguments, result)
+            return result
+        except Exception as e:
+            error_msg = f"Error executing tool {invoker.name}: {e}"
+            logger.exception(error_msg)
+            result = {"content": error_msg, "is_error": True}
+            # A failed call of a mutating tool may still have changed something
+            result_cache.record(invoker.name, arguments, result)
+            return result
+
+    tool_wrapper.__signature__ = signature_from_schema(entry["parameters"])
+    tool_wrapper.__name__ = tool_wrapper.__qualname__ = entry["name"]
+    tool_wrapper.__doc__ = entry["description"] or "Tool execution"
+    tool_wrapper.invoker = invoker
+    return tool_wrapper
@@ -0,0 +1,174 @@
+"""
+Prebuilt tool manifest.
+
+Discovering tools means importing every module under ``tapo_camera_mcp.tools``
+and, with them, their heavy dependencies. The manifest records what the MCP
+server needs to list the tools -- name, description, category, parameter
+schema and import path -- so the server can register every tool from a JSON
+file and import a tool's module only when the tool is first called.
+
+Regenerate the manifest after adding or changing a tool::
+
+    python -m tapo_camera_mcp.tools.manifest
+
+``--check`` exits non-zero when the checked-in manifest is out of date.
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+from .discovery import discover_tools
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = Path(__file__).with_name("tool_manifest.json")
+MANIFEST_VERSION = 1
+
+_classes: Dict[Tuple[str, str], Type[Any]] = {}
+
+
+def parameter_fields(tool_cls: Type[Any]) -> Dict[str, Tuple[Any, Any]]:
+    """(annotation, default or FieldInfo) of each parameter the tool accepts."""
+    meta = getattr(tool_cls, "Meta", None)
+    params_class = getattr(meta, "Parameters", None)
+    if isinstance(params_class, type) and issubclass(params_class, BaseModel):
+        return {
+            name: (field.annotation, field) for name, field in params_class.model_fields.items()
+        }
+    if params_class is not None:
+        annotations = getattr(params_class, "__annotations__", {})
+        return {
+            name: (annotations.get(name, Any), getattr(params_class, name))
+            for name in dir(params_class)
+            if not name.startswith("_") and not callable(getattr(params_class, name))
+        }
+    return {name: (field.annotation, field) for name, field in tool_cls.model_fields.items()}
+
+
+def parameter_schema(tool_cls: Type[Any]) -> Dict[str, Any]:
+    """JSON schema of the parameters of a tool class."""
+    fields = parameter_fields(tool_cls)
+    try:
+        model = create_model(f"{tool_cls.__name__}Parameters", **fields)
+        schema = model.model_json_schema()
+    except Exception as e:
+        logger.debug(f"Could not build a parameter schema for {tool_cls.__name__}: {e}")
+        return {"type": "object", "properties": {name: {} for name in fields}}
+    schema.pop("title", None)
+    for prop in schema.get("properties", {}).values():
+        prop.pop("title", None)
+    return schema
+
+
+def manifest_entry(tool_cls: Type[Any]) -> Dict[str, Any]:
+    """Describe a tool class for the manifest."""
+    meta = tool_cls.Meta
+    category = getattr(meta, "category", None)
+    entry = {
+        "name": getattr(meta, "name", tool_cls.__name__.replace("Tool", "").lower()),
+        "description": getattr(meta, "description", "") or "",
+        "category": getattr(category, "value", category),
+        "module": tool_cls.__module__,
+        "class": tool_cls.__qualname__,
+        "parameters": parameter_schema(tool_cls),
+    }
+    cache = getattr(meta, "cache", None)
+    if cache is not None:
+        properties = entry["parameters"].get("properties", {})
+        entry["cache"] = {
+            "ttl": cache.ttl,
+            "key": list(properties if cache.key is None else cache.key),
+            "invalidated_by": list(cache.invalidated_by),
+        }
+        if cache.only:
+            entry["cache"]["only"] = {name: list(values) for name, values in cache.only.items()}
+    return entry
+
+
+def entries_from_classes(tools: List[Type[Any]]) -> List[Dict[str, Any]]:
+    """Manifest entries of tool classes, keeping the first class of each name."""
+    entries: Dict[str, Dict[str, Any]] = {}
+    for tool_cls in tools:
+        if getattr(tool_cls, "Meta", None) is None:
+            continue
+        entry = manifest_entry(tool_cls)
+        if entry["name"] not in entries:
+            entries[entry["name"]] = entry
+            _classes[(entry["module"], entry["class"])] = tool_cls
+    return sorted(entries.values(), key=lambda entry: entry["name"])
+
+
+def build_manifest(package: str = "tapo_camera_mcp.tools") -> Dict[str, Any]:
+    """Discover all tools of a package and build the manifest."""
+    return {
+        "version": MANIFEST_VERSION,
+        "tools": entries_from_classes(discover_tools(package, rescan=True)),
+    }
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Optional[List[Dict[str, Any]]]:
+    """The tool entries of a manifest, or None if it is missing or unreadable."""
+    try:
+        manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Tool manifest {path} is not available: {e}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.warning(f"Tool manifest {path} has an unsupported version")
+        return None
+    return manifest["tools"]
+
+
+def write_manifest(path: Path = MANIFEST_PATH) -> Dict[str, Any]:
+    """Regenerate the manifest file."""
+    manifest = build_manifest()
+    Path(path).write_text(render_manifest(manifest), encoding="utf-8")
+    return manifest
+
+
+def render_manifest(manifest: Dict[str, Any]) -> str:
+    """The manifest as stable, diff-friendly JSON."""
+    return json.dumps(manifest, indent=2, sort_keys=True, default=str) + "\n"
+
+
+def resolve_tool(entry: Dict[str, Any]) -> Type[Any]:
+    """Import the module of a manifest entry and return its tool class."""
+    key = (entry["module"], entry["class"])
+    tool_cls = _classes.get(key)
+    if tool_cls is None:
+        tool_cls = importlib.import_module(entry["module"])
+        for part in entry["class"].split("."):
+            tool_cls = getattr(tool_cls, part)
+        _classes[key] = tool_cls
+    return tool_cls
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Regenerate or check the tool manifest."""
+    parser = argparse.ArgumentParser(description="Generate the tool manifest")
+    parser.add_argument("--check", action="store_true", help="Fail if the manifest is stale")
+    parser.add_argument("--output", type=Path, default=MANIFEST_PATH, help="Manifest file")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        current = args.output.read_text(encoding="utf-8") if args.output.exists() else ""
+        if current != render_manifest(build_manifest()):
+            sys.stderr.write(
+                f"{args.output} is out of date; run python -m tapo_camera_mcp.tools.manifest\n"
+            )
+            return 1
+        return 0
+    manifest = write_manifest(args.output)
+    sys.stdout.write(f"Wrote {len(manifest['tools'])} tools to {args.output}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+Media Tools
+
+Tools for working with stored recordings and snapshots.
+"""
+
+from .clip_export_tool import ExportClipTool
+from .timelapse_tool import CreateTimelapseTool
+
+__all__ = ["CreateTimelapseTool", "ExportClipTool"]
@@ -0,0 +1,86 @@
+"""Clip export tool for stored recordings."""
+
+import logging
+from typing import Any, Dict, Optional
+
+from pydantic import Field
+
+from ...exceptions import StorageError
+from ...media.clips import clip_exporter, parse_datetime
+from ..base_tool import BaseTool, ToolCategory
+
+logger = logging.getLogger(__name__)
+
+
+class ExportClipTool(BaseTool):
+    """Export a time range of a camera's recordings as a single video file.
+
+    The overlapping recording segments are cut at keyframes and joined by stream
+    copy, so no video is re-encoded.
+
+    Parameters:
+        camera_id: Camera whose recordings to export
+        start_time: Start of the range (ISO 8601)
+        end_time: End of the range (ISO 8601)
+        output_path: Optional destination file inside recordings/exports
+
+    Returns:
+        Dict with the output path, size and number of joined segments
+    """
+
+    class Meta:
+        name = "export_clip"
+        description = (
+            "Export a camera's recordings between two times as one video file "
+            "(stream copy, no re-encode)"
+        )
+        category = ToolCategory.MEDIA
+
+        class Parameters:
+            camera_id: str = Field(..., description="Camera whose recordings to export")
+            start_time: str = Field(
+                ..., description="Start of the range in ISO 8601, e.g. 2024-05-01T14:02:00"
+            )
+            end_time: str = Field(
+                ..., description="End of the range in ISO 8601, e.g. 2024-05-01T14:07:00"
+            )
+            output_path: Optional[str] = Field(
+                None, description="File inside recordings/exports (defaults to a generated name)"
+            )
+
+    camera_id: str
+    start_time: str
+    end_time: str
+    output_path: Optional[str] = None
+
+    async def execute(self) -> Dict[str, Any]:
+        """Export the requested clip."""
+        try:
+            start = parse_datetime(self.start_time)
+            end = parse_datetime(self.end_time)
+
+            result = None
+            async for progress in clip_exporter.export(
+                self.camera_id, start, end, output_path=self.output_path
+            ):
+                await self.report_progress(
+                    progress.progress, 1.0, progress.message or progress.stage
+                )
+                result = progress
+
+            return {
+                "success": True,
+                "camera_id": self.camera_id,
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+                "output_path": result.output_path,
+                "size_bytes": result.bytes_written,
+                "segments": result.segments,
+                "message": result.message,
+            }
+
+        except (StorageError, ValueError) as e:
+            return {"success": False, "error": str(e), "camera_id": self.camera_id}
+        except Exception as e:
+            logger.exception("Clip export failed for %s", self.camera_id)
+            return {"success": False, "error": f"Clip export failed: {e}"}
@@ -0,0 +1,90 @@
+"""Timelapse tool for stored snapshots."""
+
+import logging
+from typing import Any, Dict, Optional
+
+from pydantic import Field
+
+from ...exceptions import StorageError
+from ...media.clips import parse_datetime
+from ...media.timelapse import timelapse_builder
+from ..base_tool import BaseTool, ToolCategory
+
+logger = logging.getLogger(__name__)
+
+
+class CreateTimelapseTool(BaseTool):
+    """Build a timelapse video from a camera's stored snapshots.
+
+    Parameters:
+        camera_id: Camera whose snapshots to use
+        start_time: Start of the window (ISO 8601)
+        end_time: End of the window (ISO 8601)
+        fps: Frames per second of the video
+        width: Maximum video width in pixels
+        output_path: Optional destination file inside recordings/timelapses
+
+    Returns:
+        Dict with the output path and the number of frames written
+    """
+
+    class Meta:
+        name = "create_timelapse"
+        description = "Build a timelapse video from a camera's stored snapshots for a time window"
+        category = ToolCategory.MEDIA
+
+        class Parameters:
+            camera_id: str = Field(..., description="Camera whose snapshots to use")
+            start_time: str = Field(
+                ..., description="Start of the window in ISO 8601, e.g. 2024-05-01T00:00:00"
+            )
+            end_time: str = Field(
+                ..., description="End of the window in ISO 8601, e.g. 2024-05-02T00:00:00"
+            )
+            fps: int = Field(24, ge=1, le=120, description="Frames per second of the video")
+            width: int = Field(1280, ge=16, description="Maximum video width in pixels")
+            output_path: Optional[str] = Field(
+                None, description="File inside recordings/timelapses (defaults to a generated name)"
+            )
+
+    camera_id: str
+    start_time: str
+    end_time: str
+    fps: int = 24
+    width: int = 1280
+    output_path: Optional[str] = None
+
+    async def execute(self) -> Dict[str, Any]:
+        """Build the requested timelapse."""
+        try:
+            start = parse_datetime(self.start_time)
+            end = parse_datetime(self.end_time)
+
+            result = None
+            async for progress in timelapse_builder.build(
+                self.camera_id,
+                start,
+                end,
+                output_path=self.output_path,
+                fps=self.fps,
+                width=self.width,
+            ):
+                await self.report_progress(
+                    progress.progress, 1.0, progress.message or progress.stage
+                )
+                result = progress
+
+            return {
+                "success": True,
+                "camera_id": self.camera_id,
+                "output_path": result.output_path,
+                "frames": result.frames_written,
+                "total_snapshots": result.total_frames,
+                "message": result.message,
+            }
+
+        except (StorageError, ValueError) as e:
+            return {"success": False, "error": str(e), "camera_id": self.camera_id}
+        except Exception as e:
+            logger.exception("Timelapse failed for %s", self.camera_id)
+            return {"success": False, "error": f"Timelapse failed: {e}"}
@@ -5,9 +5,10 @@ This module provides tools for discovering and onboarding various device types
 including Tapo P115 smart plugs, Nest Protect devices, Ring alarms, and USB webcams.
 """
 
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +16,8 @@ from ...tools.base_tool import BaseTool, ToolCategory, tool
 
 logger = logging.getLogger(__name__)
 
+DEVICE_TYPES = ("tapo_p115", "usb_webcams", "nest_protect", "ring_devices")
+
 
 class DiscoveredDevice(BaseModel):
     """Model for discovered devices during onboarding."""
@@ -51,15 +54,35 @@ class DeviceDiscoveryManager:
         self.discovered_devices: List[DiscoveredDevice] = []
         self.onboarding_state = OnboardingState()
 
-    async def discover_all_devices(self) -> Dict[str, List[DiscoveredDevice]]:
-        """Discover all available devices on the network."""
+    async def discover_all_devices(
+        self, on_found: Optional[Callable[[str, List[DiscoveredDevice]], Awaitable[None]]] = None
+    ) -> Dict[str, List[DiscoveredDevice]]:
+        """Discover all available devices on the network.
+
+        The device types are discovered concurrently; ``on_found`` is called
+        with the devices of each type as soon as that type's discovery ends.
+        """
         try:
-            discovery_results = {
-                "tapo_p115": await self._discover_tapo_p115_devices(),
-                "usb_webcams": await self._discover_usb_webcams(),
-                "nest_protect": await self._discover_nest_protect_devices(),
-                "ring_devices": await self._discover_ring_devices(),
-            }
+            discoverers = dict(
+                zip(
+                    DEVICE_TYPES,
+                    (
+                        self._discover_tapo_p115_devices,
+                        self._discover_usb_webcams,
+                        self._discover_nest_protect_devices,
+                        self._discover_ring_devices,
+                    ),
+                )
+            )
+
+            async def discover(device_type: str) -> List[DiscoveredDevice]:
+                devices = await discoverers[device_type]()
+                if on_found is not None:
+                    await on_found(device_type, devices)
+                return devices
+
+            found = await asyncio.gather(*(discover(device_type) for device_type in discoverers))
+            discovery_results = dict(zip(discoverers, found))
 
             # Flatten all discovered devices
             all_devices = []
@@ -317,9 +340,16 @@ class DiscoverDevicesTool(BaseTool):
         category = ToolCategory.UTILITY
 
     async def execute(self) -> Dict[str, Any]:
-        """Execute device discovery."""
+        """Execute device discovery, sending each device type's devices as they are found."""
         try:
-            discovery_results = await discovery_manager.discover_all_devices()
+
+            async def on_found(device_type: str, devices: List[DiscoveredDevice]) -> None:
+                await self.send_partial(
+                    {"device_type": device_type, "devices": [device.dict() for device in devices]},
+                    total=len(DEVICE_TYPES),
+                )
+
+            discovery_results = await discovery_manager.discover_all_devices(on_found)
 
             if "error" in discovery_results:
                 return {"error": discovery_results["error"]}
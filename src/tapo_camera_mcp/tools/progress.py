@@ -0,0 +1,128 @@
+"""
+Progress notifications and partial results of tool calls.
+
+Long-running tools report how far they got with ``BaseTool.report_progress``
+and hand out results as soon as they have them with ``BaseTool.send_partial``.
+While a tool runs, its wrapper installs a ``ProgressReporter`` for the MCP
+request. The reporter forwards both as MCP progress notifications -- a partial
+result travels as JSON in the notification message -- and keeps the partial
+results. When the client did not ask for progress, or the tool runs outside
+an MCP request, nothing is sent.
+"""
+
+import asyncio
+import json
+import logging
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+_current: "ContextVar[Optional[ProgressReporter]]" = ContextVar("tool_progress", default=None)
+
+
+class ProgressReporter:
+    """Progress and partial results of one tool call."""
+
+    def __init__(
+        self, send: Optional[Send] = None, loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        self._send = send
+        self._loop = loop
+        self.progress = 0.0
+        self.partials: List[Any] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Whether notifications reach a client."""
+        return self._send is not None
+
+    async def report(
+        self,
+        progress: Optional[float] = None,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Send a progress notification; without ``progress`` it advances by one.
+
+        Progress never goes backwards, as the protocol requires.
+        """
+        self.progress = self.progress + 1 if progress is None else max(self.progress, progress)
+        if self._send is None:
+            return
+        try:
+            notification = self._send(self.progress, total, message)
+            if self._loop is None or self._loop is asyncio.get_running_loop():
+                await notification
+            else:
+                # The session belongs to the transport's loop (direct mode runs tools elsewhere)
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(notification, self._loop)
+                )
+        except Exception as e:
+            logger.debug(f"Progress notifications disabled for this call: {e}")
+            self._send = None
+
+    async def partial(
+        self,
+        item: Any,
+        progress: Optional[float] = None,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Keep a partial result and send it to the client with the progress."""
+        self.partials.append(item)
+        if message is None and self._send is not None:
+            message = json.dumps(item, default=str)
+        await self.report(progress, total, message)
+
+
+def current_reporter() -> ProgressReporter:
+    """The reporter of the running tool call, or a silent one."""
+    reporter = _current.get()
+    return reporter if reporter is not None else ProgressReporter()
+
+
+def request_reporter() -> ProgressReporter:
+    """A reporter sending to the client of the current MCP request.
+
+    The request's session and progress token are captured here, on the
+    transport's loop, so the reporter also works from another thread's loop.
+    Tools called by another tool, e.g. from a batch, get a silent reporter.
+    """
+    if _current.get() is not None:
+        return ProgressReporter()
+    try:
+        from fastmcp.server.dependencies import get_context
+
+        context = get_context()
+        request = context.request_context
+        token = request.meta.progressToken if request and request.meta else None
+    except (ImportError, RuntimeError):
+        return ProgressReporter()
+    if token is None:
+        return ProgressReporter()
+
+    session, request_id = context.session, context.request_id
+
+    async def send(progress: float, total: Optional[float], message: Optional[str]) -> None:
+        await session.send_progress_notification(
+            progress_token=token,
+            progress=progress,
+            total=total,
+            message=message,
+            related_request_id=request_id,
+        )
+
+    return ProgressReporter(send, asyncio.get_running_loop())
+
+
+async def run_with_reporter(reporter: ProgressReporter, call: Awaitable[Any]) -> Any:
+    """Await a tool call with ``reporter`` as its current reporter."""
+    token = _current.set(reporter)
+    try:
+        return await call
+    finally:
+        _current.reset(token)
@@ -0,0 +1,145 @@
+"""
+Result cache of read-only tools.
+
+A tool opts in by declaring a ``CachePolicy`` as ``Meta.cache``; the policy
+is recorded in the tool manifest and enforced by the tool wrappers, so a
+cached call never reaches the tool. Successful results are reused for ``ttl``
+seconds per combination of the policy's key parameters, and any call of a
+tool listed in ``invalidated_by`` drops all cached results of the tool. A
+policy with ``only`` caches just the calls whose parameters have the listed
+values; the other calls always run.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..prometheus import MetricsRegistry
+from ..prometheus import registry as prometheus_registry
+
+
+class _Policy:
+    __slots__ = ("defaults", "key", "only", "ttl")
+
+    def __init__(
+        self,
+        ttl: float,
+        key: List[str],
+        defaults: Dict[str, Any],
+        only: Optional[Dict[str, List[Any]]] = None,
+    ):
+        self.ttl = ttl
+        self.key = key
+        self.defaults = defaults
+        self.only = only or {}
+
+    def applies(self, arguments: Dict[str, Any]) -> bool:
+        """Whether a call with these arguments is cached."""
+        return all(
+            arguments.get(name, self.defaults.get(name)) in values
+            for name, values in self.only.items()
+        )
+
+
+def _cacheable(result: Any) -> bool:
+    """Whether a result reports success (errors come back as results)."""
+    return isinstance(result, dict) and not (
+        result.get("is_error") or result.get("success") is False or "error" in result
+    )
+
+
+class ResultCache:
+    """TTL cache of tool results keyed by tool name and key parameters."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        registry = registry if registry is not None else prometheus_registry
+        self.hits = registry.counter(
+            "mcp_tool_cache_hits_total", "MCP tool calls answered from the result cache", ["tool"]
+        )
+        self.misses = registry.counter(
+            "mcp_tool_cache_misses_total", "Cacheable MCP tool calls that ran the tool", ["tool"]
+        )
+        self.enabled = True
+        self._policies: Dict[str, _Policy] = {}
+        self._invalidates: Dict[str, List[str]] = {}
+        self._entries: Dict[str, Dict[str, Tuple[float, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, entry: Dict[str, Any]) -> None:
+        """Apply the cache policy of a manifest entry, if it declares one."""
+        policy = entry.get("cache")
+        if not policy:
+            return
+        properties = entry["parameters"].get("properties", {})
+        defaults = {name: prop["default"] for name, prop in properties.items() if "default" in prop}
+        with self._lock:
+            self._policies[entry["name"]] = _Policy(
+                float(policy["ttl"]), policy["key"], defaults, policy.get("only")
+            )
+            for mutating_tool in policy.get("invalidated_by", []):
+                dependents = self._invalidates.setdefault(mutating_tool, [])
+                if entry["name"] not in dependents:
+                    dependents.append(entry["name"])
+
+    def _key(self, policy: _Policy, arguments: Dict[str, Any]) -> str:
+        values = [arguments.get(name, policy.defaults.get(name)) for name in policy.key]
+        return json.dumps(values, sort_keys=True, default=str)
+
+    def get(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[Any]:
+        """The cached result of a call, or None if it has to run."""
+        policy = self._policies.get(tool_name)
+        if policy is None or not self.enabled or not policy.applies(arguments):
+            return None
+        key = self._key(policy, arguments)
+        cached = self._entries.get(tool_name, {}).get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.hits.labels(tool_name).inc()
+            return cached[1]
+        self.misses.labels(tool_name).inc()
+        return None
+
+    def record(self, tool_name: str, arguments: Dict[str, Any], result: Any) -> None:
+        """Keep the result of a call that ran and drop what the call invalidates."""
+        for dependent in self._invalidates.get(tool_name, ()):
+            self.invalidate(dependent)
+        policy = self._policies.get(tool_name)
+        if policy is None or not self.enabled or not _cacheable(result):
+            return
+        if not policy.applies(arguments):
+            return
+        expires = time.monotonic() + policy.ttl
+        with self._lock:
+            entries = self._entries.setdefault(tool_name, {})
+            entries[self._key(policy, arguments)] = (expires, result)
+            # Drop expired results of the tool so keys cannot pile up
+            now = time.monotonic()
+            for key in [k for k, (e, _) in entries.items() if e <= now]:
+                del entries[key]
+
+    def invalidate(self, tool_name: Optional[str] = None) -> None:
+        """Drop the cached results of a tool, or of all tools."""
+        with self._lock:
+            if tool_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(tool_name, None)
+
+    def policies(self) -> Dict[str, Dict[str, Any]]:
+        """The registered policies and the number of cached results of each tool."""
+        return {
+            name: {
+                "ttl": policy.ttl,
+                "key": policy.key,
+                "only": policy.only,
+                "cached": len(self._entries.get(name, {})),
+                "invalidated_by": sorted(
+                    tool for tool, dependents in self._invalidates.items() if name in dependents
+                ),
+            }
+            for name, policy in sorted(self._policies.items())
+        }
+
+
+# Global instance
+result_cache = ResultCache()
@@ -0,0 +1,126 @@
+"""
+Batch execution of tool calls.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from tapo_camera_mcp.tool_metrics import tool_metrics
+from tapo_camera_mcp.tools.base_tool import BaseTool, ToolCategory, tool
+from tapo_camera_mcp.tools.invoker import build_tool_wrapper
+from tapo_camera_mcp.tools.manifest import load_manifest
+
+logger = logging.getLogger(__name__)
+
+BATCH_TOOL_NAME = "batch_execute"
+MAX_CALLS = 100
+
+_wrappers: Dict[str, Callable] = {}
+
+
+class BatchCall(BaseModel):
+    """One tool call of a batch."""
+
+    tool: str = Field(..., description="Name of the tool to call")
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="Tool arguments")
+
+
+@functools.lru_cache(maxsize=None)
+def _entries() -> Dict[str, Dict[str, Any]]:
+    """Manifest entries by tool name."""
+    return {entry["name"]: entry for entry in load_manifest() or []}
+
+
+def _wrapper(tool_name: str) -> Optional[Callable]:
+    """The wrapper of a manifest tool, or None if there is no such tool."""
+    if tool_name not in _wrappers:
+        entry = _entries().get(tool_name)
+        if entry is None:
+            return None
+        _wrappers[tool_name] = build_tool_wrapper(entry)
+    return _wrappers[tool_name]
+
+
+@tool(name=BATCH_TOOL_NAME)
+class BatchExecuteTool(BaseTool):
+    """Run many tool calls in one request.
+
+    The calls run concurrently, at most ``concurrency`` at a time, and each
+    one is cancelled after ``timeout`` seconds of running. Results come back
+    in the order of the calls; a failing call reports its error in its own
+    result and does not affect the others. Each result is also sent as a
+    progress notification as soon as its call ends.
+    """
+
+    class Meta:
+        name = BATCH_TOOL_NAME
+        description = (
+            "Run a list of tool calls (tool name and arguments) concurrently in one request, "
+            "e.g. the status of every camera; results are returned in order with per-call errors"
+        )
+        category = ToolCategory.SYSTEM
+
+        class Parameters:
+            calls: List[BatchCall] = Field(
+                ..., description=f"Tool calls to run, at most {MAX_CALLS}"
+            )
+            concurrency: int = Field(4, description="Calls running at the same time")
+            timeout: float = Field(30.0, description="Seconds before a single call is cancelled")
+
+    calls: List[BatchCall]
+    concurrency: int = 4
+    timeout: float = 30.0
+
+    async def _call(self, index: int, call: BatchCall, slots: asyncio.Semaphore) -> Dict[str, Any]:
+        item: Dict[str, Any] = {"index": index, "tool": call.tool}
+        wrapper = None if call.tool == BATCH_TOOL_NAME else _wrapper(call.tool)
+        if wrapper is None:
+            item.update(success=False, error=f"Unknown tool: {call.tool}")
+            await self.send_partial(item, total=len(self.calls))
+            return item
+
+        async with slots:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(wrapper(**call.arguments), self.timeout)
+            except asyncio.TimeoutError:
+                result = {"content": f"Timed out after {self.timeout:g} s", "is_error": True}
+            except Exception as e:
+                result = {"content": f"Error executing tool {call.tool}: {e}", "is_error": True}
+            duration = time.perf_counter() - start
+
+        failed = bool(result.get("is_error")) or result.get("success") is False
+        tool_metrics.record(call.tool, duration, failed)
+        item.update(success=not failed, duration_ms=round(duration * 1000, 2))
+        if failed and result.get("is_error"):
+            item["error"] = result.get("content")
+        else:
+            item["result"] = result
+        await self.send_partial(item, total=len(self.calls))
+        return item
+
+    async def execute(self) -> Dict[str, Any]:
+        """Run the calls and collect their results in order."""
+        if len(self.calls) > MAX_CALLS:
+            return {
+                "success": False,
+                "error": f"Too many calls: {len(self.calls)} (at most {MAX_CALLS})",
+            }
+        slots = asyncio.Semaphore(max(self.concurrency, 1))
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._call(index, call, slots) for index, call in enumerate(self.calls))
+        )
+        failed = sum(1 for item in results if not item["success"])
+        return {
+            "success": failed == 0,
+            "total": len(results),
+            "failed": failed,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "results": results,
+        }
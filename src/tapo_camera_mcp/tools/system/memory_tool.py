@@ -0,0 +1,62 @@
+"""
+Memory growth and leak report tool.
+"""
+
+import logging
+from typing import Any, Dict
+
+from pydantic import Field
+
+from tapo_camera_mcp.memory_diagnostics import memory_diagnostics
+from tapo_camera_mcp.tools.base_tool import BaseTool, ToolCategory, tool
+
+logger = logging.getLogger(__name__)
+
+
+@tool(name="memory_report")
+class MemoryReportTool(BaseTool):
+    """Report memory growth of the running server and where it comes from.
+
+    ``start`` begins recording allocations with tracemalloc and takes a first
+    snapshot; each ``report`` takes another snapshot and lists the allocation
+    sites and files that grew the most, together with the RSS growth and the
+    sizes of the known per-camera structures. ``stop`` ends the tracing.
+    """
+
+    class Meta:
+        name = "memory_report"
+        description = (
+            "Memory leak report: RSS growth, growth of per-camera structures and, "
+            "after action=start, the allocation sites that grew between snapshots"
+        )
+        category = ToolCategory.SYSTEM
+
+        class Parameters:
+            action: str = Field("report", description="One of: start, report, stop")
+            limit: int = Field(10, description="Entries per list in the report")
+            frames: int = Field(1, description="Stack frames recorded per allocation on start")
+
+    action: str = "report"
+    limit: int = 10
+    frames: int = 1
+
+    async def execute(self) -> Dict[str, Any]:
+        """Start or stop allocation tracing, or build a leak report."""
+        try:
+            if self.action == "start":
+                memory_diagnostics.start_tracing(max(self.frames, 1))
+            elif self.action == "stop":
+                memory_diagnostics.stop_tracing()
+                return {"success": True, "tracing": False}
+            elif self.action != "report":
+                return {
+                    "success": False,
+                    "error": f"Invalid action: {self.action}. Must be 'start', 'report' or 'stop'",
+                }
+            return {
+                "success": True,
+                "report": memory_diagnostics.report(self.limit, snapshot=self.action == "report"),
+            }
+        except Exception as e:
+            logger.exception("Memory report failed")
+            return {"success": False, "error": f"Memory report failed: {e}"}
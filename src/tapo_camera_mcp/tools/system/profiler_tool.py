@@ -0,0 +1,59 @@
+"""
+On-demand sampling profiler tool.
+"""
+
+import logging
+from typing import Any, Dict
+
+from pydantic import Field
+
+from tapo_camera_mcp.exceptions import DiagnosticsBusyError
+from tapo_camera_mcp.profiler import profiler
+from tapo_camera_mcp.tools.base_tool import BaseTool, ToolCategory, tool
+
+logger = logging.getLogger(__name__)
+
+
+@tool(name="profile_server")
+class ProfilerTool(BaseTool):
+    """Profile the running server with a statistical sampling profiler.
+
+    Samples the stacks of all threads, including the event loop, for a number
+    of seconds and returns the hottest functions together with a collapsed-stack
+    profile that flame graph tools can render.
+    """
+
+    class Meta:
+        name = "profile_server"
+        description = (
+            "Sample all threads and the event loop for N seconds and return the hot "
+            "functions and a collapsed-stack (flame graph) profile"
+        )
+        category = ToolCategory.SYSTEM
+
+        class Parameters:
+            duration: float = Field(10.0, description="Seconds to profile (at most 120)")
+            interval_ms: float = Field(5.0, description="Milliseconds between stack samples")
+            top: int = Field(20, description="Number of hot functions to summarise")
+            include_collapsed: bool = Field(
+                True, description="Whether to include the collapsed stacks"
+            )
+
+    duration: float = 10.0
+    interval_ms: float = 5.0
+    top: int = 20
+    include_collapsed: bool = True
+
+    async def execute(self) -> Dict[str, Any]:
+        """Collect a profile of the running server."""
+        try:
+            result = await profiler.profile(self.duration, max(self.interval_ms, 1.0) / 1000)
+        except DiagnosticsBusyError as e:
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            logger.exception("Profiling failed")
+            return {"success": False, "error": f"Profiling failed: {e}"}
+        return {
+            "success": True,
+            "profile": result.to_dict(self.top, self.include_collapsed),
+        }
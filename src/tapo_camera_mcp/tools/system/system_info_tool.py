@@ -15,7 +15,9 @@ from typing import Any, Dict, Optional
 import psutil
 from pydantic import BaseModel, Field
 
-from ...tools.base_tool import BaseTool, ToolCategory, tool
+from ...loop_monitor import loop_monitor
+from ...tool_metrics import tool_metrics
+from ...tools.base_tool import BaseTool, CachePolicy, ToolCategory, tool
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +27,11 @@ class SystemInfoTool(BaseTool):
     """System information and monitoring tool.
 
     Provides unified system information operations including system details,
-    log retrieval, and health monitoring.
+    log retrieval, health monitoring, per-tool call metrics, and event loop lag.
 
     Parameters:
-        operation: Type of system operation (info, logs, health).
+        operation: Type of system operation (info, logs, health, tool_metrics,
+            event_loop).
         log_level: Log level for logs operation (debug, info, warning, error).
         log_lines: Number of log lines to retrieve.
         health_check_type: Type of health check (full, quick, services).
@@ -40,12 +43,20 @@ class SystemInfoTool(BaseTool):
     class Meta:
         name = "system_info"
         description = (
-            "Unified system information operations including info, logs, and health monitoring"
+            "Unified system information operations including info, logs, health monitoring, "
+            "per-tool call counts and latency percentiles, and event loop lag and stalls"
         )
         category = ToolCategory.SYSTEM
+        # The other operations report live diagnostics
+        cache = CachePolicy(ttl=5, key=("operation",), only={"operation": ("info",)})
 
         class Parameters(BaseModel):
-            operation: str = Field(..., description="System operation: 'info', 'logs', 'health'")
+            operation: str = Field(
+                ...,
+                description=(
+                    "System operation: 'info', 'logs', 'health', 'tool_metrics', 'event_loop'"
+                ),
+            )
             log_level: Optional[str] = Field(
                 "info", description="Log level: 'debug', 'info', 'warning', 'error'"
             )
@@ -71,9 +82,26 @@ class SystemInfoTool(BaseTool):
                 return await self._get_logs(log_level, log_lines)
             if operation == "health":
                 return await self._health_check(health_check_type)
+            if operation == "tool_metrics":
+                return {
+                    "success": True,
+                    "operation": "tool_metrics",
+                    "tools": tool_metrics.snapshot(),
+                    "timestamp": time.time(),
+                }
+            if operation == "event_loop":
+                return {
+                    "success": True,
+                    "operation": "event_loop",
+                    "event_loop": loop_monitor.report(),
+                    "timestamp": time.time(),
+                }
             return {
                 "success": False,
-                "error": f"Invalid operation: {operation}. Must be 'info', 'logs', or 'health'",
+                "error": (
+                    f"Invalid operation: {operation}. "
+                    "Must be 'info', 'logs', 'health', 'tool_metrics', or 'event_loop'"
+                ),
                 "timestamp": time.time(),
             }
 
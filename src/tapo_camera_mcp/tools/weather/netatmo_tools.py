@@ -11,10 +11,31 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
-from ...tools.base_tool import BaseTool, ToolCategory, tool
+from ...tools.base_tool import BaseTool, CachePolicy, ToolCategory, tool
 
 logger = logging.getLogger(__name__)
 
+# Latest numeric readings per (station_id, module type)
+_latest_readings: Dict[tuple, Dict[str, Any]] = {}
+
+_READING_METRICS = {
+    "temperature": "weather_temperature_celsius",
+    "humidity": "weather_humidity_percent",
+    "co2": "weather_co2_ppm",
+    "noise": "weather_noise_db",
+    "pressure": "weather_pressure_mbar",
+}
+
+
+def netatmo_samples() -> List[tuple]:
+    """Latest (metric name, labels, value) samples of all stations for the metrics history."""
+    return [
+        (metric, {"station_id": station_id, "module": module}, readings[field])
+        for (station_id, module), readings in list(_latest_readings.items())
+        for field, metric in _READING_METRICS.items()
+        if isinstance(readings.get(field), (int, float))
+    ]
+
 
 class NetatmoModule(BaseModel):
     """Netatmo weather module data model."""
@@ -89,6 +110,7 @@ class GetNetatmoStationsTool(BaseTool):
         name = "get_netatmo_stations"
         description = "Get all available Netatmo weather stations with module information"
         category = ToolCategory.WEATHER
+        cache = CachePolicy(ttl=60)
 
         class Parameters(BaseModel):
             include_offline: bool = Field(default=False, description="Include offline stations")
@@ -212,6 +234,8 @@ class GetNetatmoWeatherDataTool(BaseTool):
 
             # Simulate weather data retrieval
             weather_data = await self._get_station_data(station_id, module_type)
+            for module, readings in weather_data.items():
+                _latest_readings[(station_id, module)] = readings
 
             return {
                 "success": True,
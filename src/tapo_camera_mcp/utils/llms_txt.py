@@ -6,11 +6,10 @@ providing a structured way to document APIs and tools for large language models.
 """
 
 from datetime import datetime
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import Dict, List, Optional, TypedDict, Union
 
-import pkg_resources
-
 
 class ToolMetadata(TypedDict, total=False):
     """Metadata structure for API tools."""
@@ -60,8 +59,8 @@ class LLMsTxtGenerator:
             str: Package version string
         """
         try:
-            return pkg_resources.get_distribution("tapo-camera-mcp").version
-        except pkg_resources.DistributionNotFound:
+            return version("tapo-camera-mcp")
+        except PackageNotFoundError:
             return self.VERSION
 
     def generate_navigation(self) -> str:
@@ -1,39 +1,71 @@
-"""DINOv3 model integration for advanced image analysis."""
+"""DINOv3 model integration for advanced image analysis.
 
-from typing import Dict, List, Union
+The model is loaded lazily: constructing a :class:`DINOv3Processor` is cheap
+and imports neither torch nor transformers. The weights are loaded on the
+first inference or by an explicit :meth:`DINOv3Processor.load` (warmup), so
+processes that never analyse images never pay for the model.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, List, Union
 
 import numpy as np
-import torch
 from PIL import Image
 
+if TYPE_CHECKING:
+    import torch
+
+logger = logging.getLogger(__name__)
+
 
 class DINOv3Processor:
     """Processor for DINOv3 model inference."""
 
     def __init__(self, model_name: str = "facebook/dinov2-base"):
-        """Initialize DINOv3 model.
+        """Initialize DINOv3 processor without loading the model.
 
         Args:
             model_name: Name of the DINOv3 model variant to use.
                        Options: 'facebook/dinov2-small', 'facebook/dinov2-base', 'facebook/dinov2-large'
         """
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model_name = model_name
+        self.device = None
         self.model = None
         self.transform = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the model has been loaded."""
+        return self.model is not None
+
+    def load(self) -> "DINOv3Processor":
+        """Load the model if it is not loaded yet (thread-safe, idempotent)."""
+        if self.model is None:
+            with self._lock:
+                if self.model is None:
+                    self._initialize_model()
+        return self
 
-        # Initialize model and transforms
-        self._initialize_model()
+    async def warmup(self) -> None:
+        """Load the model in a worker thread without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.load)
 
     def _initialize_model(self):
         """Load the DINOv3 model and initialize transforms."""
-        from transformers import AutoImageProcessor, AutoModel
-
         try:
+            import torch
+            from transformers import AutoImageProcessor, AutoModel
+
+            logger.info("Loading vision model %s", self.model_name)
+            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
             # Load model and processor
             self.processor = AutoImageProcessor.from_pretrained(self.model_name)
-            self.model = AutoModel.from_pretrained(self.model_name).to(self.device)
-            self.model.eval()
+            model = AutoModel.from_pretrained(self.model_name).to(device)
+            model.eval()
 
             # Initialize transforms
             from torchvision import transforms
@@ -46,12 +78,13 @@ class DINOv3Processor:
                     transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
                 ]
             )
+            self.device = device
+            self.model = model  # set last: other threads treat a model as fully loaded
 
         except Exception as e:
             raise RuntimeError(f"Failed to initialize DINOv3 model: {e!s}") from e
 
-    @torch.no_grad()
-    def extract_features(self, image: Union[Image.Image, str, np.ndarray]) -> torch.Tensor:
+    def extract_features(self, image: Union[Image.Image, str, np.ndarray]) -> "torch.Tensor":
         """Extract features from an image using DINOv3.
 
         Args:
@@ -60,8 +93,9 @@ class DINOv3Processor:
         Returns:
             torch.Tensor: Extracted features (1, feature_dim)
         """
-        if self.model is None:
-            raise RuntimeError("Model not initialized. Call _initialize_model() first.")
+        import torch
+
+        self.load()
 
         # Convert input to PIL Image if needed
         if isinstance(image, str):
@@ -98,6 +132,8 @@ class DINOv3Processor:
         feat2 = self.extract_features(image2)
 
         # Calculate cosine similarity
+        import torch
+
         cos = torch.nn.CosineSimilarity(dim=1, eps=1e-6)
         similarity = cos(feat1, feat2).item()
 
@@ -124,6 +160,8 @@ class DINOv3Processor:
         query_feat = self.extract_features(query_image)
 
         # Calculate similarities with all images
+        import torch
+
         similarities = []
         for img_path in image_paths:
             try:
@@ -139,5 +177,5 @@ class DINOv3Processor:
         return [{"path": path, "similarity": float(sim)} for path, sim in similarities[:top_k]]
 
 
-# Global instance for easy access
+# Global instance for easy access (the model is loaded on first use)
 dinov3_processor = DINOv3Processor()
@@ -0,0 +1,61 @@
+"""
+Diagnostics API endpoints.
+
+Provides token-protected REST endpoints for profiling the running server and
+reporting its memory growth.
+The endpoints are disabled unless ``diagnostics.token`` is set in the
+configuration; requests must send the token as ``Authorization: Bearer``.
+"""
+
+import logging
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from ...config import get_config
+from ...exceptions import DiagnosticsBusyError
+from ...memory_diagnostics import memory_diagnostics
+from ...profiler import MAX_DURATION, profiler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/diagnostics", tags=["diagnostics"])
+
+
+def require_diagnostics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Reject requests without the configured diagnostics token."""
+    token = (get_config().get("diagnostics") or {}).get("token")
+    if not token:
+        raise HTTPException(status_code=404, detail="Diagnostics endpoints are disabled")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(supplied.strip(), str(token)):
+        raise HTTPException(status_code=401, detail="Invalid diagnostics token")
+
+
+@router.get("/profile", dependencies=[Depends(require_diagnostics_token)])
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=MAX_DURATION, description="Seconds to profile"),
+    interval_ms: float = Query(5.0, ge=1, description="Milliseconds between stack samples"),
+    output: str = Query(
+        "json", alias="format", pattern="^(json|collapsed)$", description="json or collapsed"
+    ),
+    top: int = Query(20, ge=1, le=500, description="Hot functions to summarise"),
+):
+    """Sample all threads and the event loop and return the profile."""
+    try:
+        result = await profiler.profile(seconds, interval_ms / 1000)
+    except DiagnosticsBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    if output == "collapsed":
+        return PlainTextResponse(result.collapsed())
+    return result.to_dict(top)
+
+
+@router.get("/memory", dependencies=[Depends(require_diagnostics_token)])
+async def memory(
+    limit: int = Query(10, ge=1, le=100, description="Entries per list in the report"),
+):
+    """Report RSS growth, structure growth and, while tracing, allocation-site growth."""
+    return memory_diagnostics.report(limit)
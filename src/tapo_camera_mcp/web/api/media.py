@@ -0,0 +1,131 @@
+"""
+Media API endpoints for stored recordings.
+
+Provides REST API endpoints for exporting clips from the recordings directory,
+building timelapses from stored snapshots, tracking the resulting jobs and
+reading the binary results tools refer to.
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+
+from ...exceptions import StorageError
+from ...media.blob_store import blob_store
+from ...media.clips import clip_exporter
+from ...media.jobs import job_manager
+from ...media.timelapse import timelapse_builder
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/media", tags=["media"])
+
+
+class ClipExportRequest(BaseModel):
+    """Request model for a clip export."""
+
+    camera_id: str = Field(..., description="Camera whose recordings to export")
+    start_time: datetime = Field(..., description="Start of the range")
+    end_time: datetime = Field(..., description="End of the range")
+    output_path: Optional[str] = Field(
+        None, description="Optional destination file inside the recordings/exports directory"
+    )
+
+
+class TimelapseRequest(BaseModel):
+    """Request model for a timelapse job."""
+
+    camera_id: str = Field(..., description="Camera whose snapshots to use")
+    start_time: datetime = Field(..., description="Start of the window")
+    end_time: datetime = Field(..., description="End of the window")
+    fps: int = Field(24, ge=1, le=120, description="Frames per second of the video")
+    width: int = Field(1280, ge=16, description="Maximum video width in pixels")
+    output_path: Optional[str] = Field(
+        None, description="Optional destination file inside the recordings/timelapses directory"
+    )
+
+
+@router.post("/clips/export")
+async def export_clip(request: ClipExportRequest) -> StreamingResponse:
+    """Export a clip, streaming progress updates as newline-delimited JSON."""
+
+    async def progress_stream():
+        try:
+            async for progress in clip_exporter.export(
+                request.camera_id,
+                request.start_time,
+                request.end_time,
+                output_path=request.output_path,
+            ):
+                yield json.dumps(progress.to_dict()) + "\n"
+        except (StorageError, ValueError) as e:
+            yield json.dumps({"stage": "error", "message": str(e)}) + "\n"
+        except Exception as e:
+            logger.exception("Clip export failed for %s", request.camera_id)
+            yield json.dumps({"stage": "error", "message": f"Clip export failed: {e}"}) + "\n"
+
+    return StreamingResponse(progress_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/timelapses")
+async def create_timelapse(request: TimelapseRequest) -> Dict[str, Any]:
+    """Start a timelapse job; poll ``/api/media/jobs/{job_id}`` for progress."""
+    if request.end_time <= request.start_time:
+        raise HTTPException(status_code=422, detail="end_time must be after start_time")
+
+    job = job_manager.start(
+        "timelapse",
+        timelapse_builder.build(
+            request.camera_id,
+            request.start_time,
+            request.end_time,
+            output_path=request.output_path,
+            fps=request.fps,
+            width=request.width,
+        ),
+    )
+    return job.to_dict()
+
+
+@router.get("/jobs")
+async def list_jobs(kind: Optional[str] = None) -> List[Dict[str, Any]]:
+    """List media jobs, optionally filtered by kind."""
+    return [job.to_dict() for job in job_manager.list(kind)]
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Dict[str, Any]:
+    """Get the status and progress of a media job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a running media job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return {"job_id": job_id, "cancelled": job_manager.cancel(job_id)}
+
+
+@router.get("/blobs/{digest}")
+async def get_blob(digest: str) -> Response:
+    """Bytes of a tool result from the blob store, addressed by SHA-256."""
+    blob = blob_store.get(digest)
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Blob not found or expired")
+    max_age = max(int(blob.expires_at - time.time()), 0)
+    return Response(
+        blob.data,
+        media_type=blob.mime_type,
+        headers={"Cache-Control": f"private, max-age={max_age}, immutable", "ETag": f'"{digest}"'},
+    )
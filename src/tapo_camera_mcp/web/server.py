@@ -317,26 +317,44 @@ class WebServer:
                 return {"error": str(e)}
 
         @self.app.get("/api/cameras/{camera_id}/snapshot")
-        async def get_camera_snapshot(camera_id: str):
-            """Get camera snapshot."""
+        async def get_camera_snapshot(
+            camera_id: str,
+            max_age: Optional[float] = None,
+            width: Optional[int] = None,
+            height: Optional[int] = None,
+        ):
+            """Get camera snapshot.
+
+            Served from the latest-frame cache; a live capture is made only when
+            the cached frame is missing or older than ``max_age`` seconds. With
+            ``width``/``height`` a cached thumbnail no larger than that is returned.
+            """
             try:
                 from tapo_camera_mcp.core.server import TapoCameraServer
+                from tapo_camera_mcp.media.scheduler import snapshot_scheduler
 
                 server = await TapoCameraServer.get_instance()
 
                 if hasattr(server, "camera_manager") and server.camera_manager:
-                    camera = server.camera_manager.cameras.get(camera_id)
-                    if camera:
-                        image = await camera.capture_still()
-
-                        # Convert to bytes
-                        import io
-
-                        buffer = io.BytesIO()
-                        image.save(buffer, format="JPEG", quality=75)
-                        image_bytes = buffer.getvalue()
-
-                        return Response(content=image_bytes, media_type="image/jpeg")
+                    if camera_id in server.camera_manager.cameras:
+                        frame = await snapshot_scheduler.latest(
+                            camera_id, max_age, camera_manager=server.camera_manager
+                        )
+                        if frame is None:
+                            return Response(content="Snapshot failed", status_code=502)
+                        data = frame.data
+                        if width or height:
+                            from tapo_camera_mcp.media.thumbnails import thumbnail_service
+
+                            thumb = await thumbnail_service.get(
+                                frame.data, width, height, source_id=frame.source_id
+                            )
+                            data = thumb.data
+                        return Response(
+                            content=data,
+                            media_type="image/jpeg",
+                            headers={"X-Frame-Age": f"{frame.age:.1f}"},
+                        )
 
                 return Response(content="Camera not found", status_code=404)
             except Exception as e:
@@ -394,9 +412,13 @@ class WebServer:
                 return {"error": str(e)}
 
         # Include API routes
+        from .api.diagnostics import router as diagnostics_router
+        from .api.media import router as media_router
         from .api.onboarding import router as onboarding_router
         from .api.weather import router as weather_router
 
+        self.app.include_router(diagnostics_router)
+        self.app.include_router(media_router)
         self.app.include_router(onboarding_router)
         self.app.include_router(weather_router)
 
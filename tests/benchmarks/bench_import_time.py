@@ -0,0 +1,136 @@
+"""
+Import-time benchmark with a regression budget.
+
+Imports each entry point in a fresh interpreter with ``python -X importtime``,
+prints the slowest modules and the cost per top-level package, and fails when
+an entry point exceeds its time budget or loads a dependency it must not
+(camera clients, ML frameworks).
+
+Run with::
+
+    python tests/benchmarks/bench_import_time.py [--runs N] [--top N] [module ...]
+
+The exit status is 1 when a budget is exceeded.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+# Camera clients are imported when a camera of their type is configured,
+# the vision stack when an image is analysed
+HEAVY = ("cv2", "pytapo", "ring_doorbell", "aiohttp", "torch", "transformers", "torchvision")
+
+# Entry point -> (budget in milliseconds, modules it must not import)
+BUDGETS = {
+    "tapo_camera_mcp": (400, (*HEAVY, "fastmcp", "PIL")),
+    "tapo_camera_mcp.cli": (800, (*HEAVY, "fastmcp")),
+    "tapo_camera_mcp.camera.manager": (500, HEAVY),
+    "tapo_camera_mcp.core.server": (3000, HEAVY),
+}
+
+
+class ImportRecord(NamedTuple):
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class ImportProfile(NamedTuple):
+    """Import timings of one entry point."""
+
+    module: str
+    total_us: int
+    records: List[ImportRecord]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse the ``import time:`` lines written to stderr by ``-X importtime``."""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def profile_import(module: str, runs: int = 5) -> ImportProfile:
+    """Import a module in ``runs`` fresh interpreters and keep the fastest run."""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    best: Optional[ImportProfile] = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        records = parse_importtime(result.stderr)
+        total = sum(record.self_us for record in records)
+        if best is None or total < best.total_us:
+            best = ImportProfile(module, total, records)
+    return best
+
+
+def by_package(records: Sequence[ImportRecord]) -> Dict[str, int]:
+    """Self time per top-level package, in microseconds."""
+    totals: Dict[str, int] = defaultdict(int)
+    for record in records:
+        totals[record.module.split(".", 1)[0]] += record.self_us
+    return dict(totals)
+
+
+def check_budget(profile: ImportProfile) -> List[str]:
+    """Budget violations of an entry point."""
+    budget_ms, forbidden = BUDGETS.get(profile.module, (None, ()))
+    imported = {record.module.split(".", 1)[0] for record in profile.records}
+    problems = [f"imports {name}" for name in forbidden if name in imported]
+    if budget_ms is not None and profile.total_us / 1000 > budget_ms:
+        problems.append(f"took {profile.total_us / 1000:.0f} ms (budget {budget_ms} ms)")
+    return problems
+
+
+def _report(profile: ImportProfile, top: int) -> List[str]:
+    problems = check_budget(profile)
+    status = "FAIL" if problems else "ok"
+    print(f"\n{profile.module}: {profile.total_us / 1000:.1f} ms [{status}]")
+    for problem in problems:
+        print(f"  ! {problem}")
+    print("  slowest modules (self ms / cumulative ms):")
+    for record in sorted(profile.records, key=lambda r: r.self_us, reverse=True)[:top]:
+        print(
+            f"    {record.self_us / 1000:8.1f} {record.cumulative_us / 1000:9.1f}  {record.module}"
+        )
+    print("  per package (self ms):")
+    packages = sorted(by_package(profile.records).items(), key=lambda item: item[1], reverse=True)
+    for package, self_us in packages[:top]:
+        print(f"    {self_us / 1000:8.1f}  {package}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS), help="Entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters per entry point")
+    parser.add_argument("--top", type=int, default=10, help="Modules and packages listed")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        failed |= bool(_report(profile_import(module, args.runs), args.top))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Microbenchmark: metrics serialization for a fleet of 500 cameras.
+
+Compares the previous dataclass/``asdict`` based serialization and per-series
+dict building followed by ``json.dumps`` with the slotted ``CameraMetrics``
+serializer and the pre-encoded Grafana JSON path.
+
+Run with::
+
+    python tests/benchmarks/bench_metrics_serialization.py [cameras]
+"""
+
+import json
+import os
+import sys
+import timeit
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.metrics_service import (
+    CameraMetrics,
+    CameraStatus,
+    MetricsCollector,
+    PTZPosition,
+    dumps,
+)
+from tapo_camera_mcp.prometheus import MetricsRegistry
+
+
+@dataclass
+class _LegacyPTZPosition:
+    pan: float = 0.0
+    tilt: float = 0.0
+    zoom: float = 0.0
+    moving: bool = False
+    preset_id: Optional[int] = None
+    preset_name: Optional[str] = None
+
+
+@dataclass
+class _LegacyCameraMetrics:
+    """The dataclass layout CameraMetrics had before it used __slots__."""
+
+    camera_id: str
+    name: str
+    ip_address: str
+    model: str = ""
+    firmware: str = ""
+    status: CameraStatus = CameraStatus.OFFLINE
+    last_seen: Optional[datetime] = None
+    uptime_seconds: int = 0
+    temperature: Optional[float] = None
+    motion_detected: bool = False
+    motion_last_detected: Optional[datetime] = None
+    motion_zones: List[Dict[str, Any]] = field(default_factory=list)
+    cpu_usage: Optional[float] = None
+    memory_usage: Optional[float] = None
+    network_rx: Optional[int] = None
+    network_tx: Optional[int] = None
+    signal_strength: Optional[int] = None
+    last_error: Optional[str] = None
+    custom_metadata: Dict[str, Any] = field(default_factory=dict)
+    ptz_supported: bool = False
+    ptz_position: _LegacyPTZPosition = field(default_factory=_LegacyPTZPosition)
+    ptz_presets: Dict[int, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for key in ["last_seen", "motion_last_detected"]:
+            if data[key]:
+                data[key] = data[key].isoformat()
+        data["status"] = data["status"].value
+        return data
+
+
+def _fields(index: int) -> Dict[str, Any]:
+    return {
+        "camera_id": f"cam{index}",
+        "name": f"Camera {index}",
+        "ip_address": f"10.0.{index // 256}.{index % 256}",
+        "model": "C200",
+        "status": CameraStatus.ONLINE,
+        "last_seen": datetime(2024, 5, 1, 12, 0, 0),
+        "temperature": 40.0 + index % 7,
+        "network_rx": 1000 * index,
+        "network_tx": 500 * index,
+        "signal_strength": -50 - index % 30,
+        "ptz_supported": True,
+        "motion_zones": [{"name": "door", "coordinates": [[0, 0], [50, 50]]}],
+    }
+
+
+def _legacy_grafana(metrics: Dict[str, _LegacyCameraMetrics]) -> bytes:
+    timestamp = datetime.now().isoformat()
+    result = []
+    for camera_id, camera in metrics.items():
+        for name, value in (
+            ("camera_status", 1),
+            ("camera_temperature", camera.temperature),
+            ("motion_detected", 0),
+            ("network_rx_bytes", camera.network_rx),
+            ("network_tx_bytes", camera.network_tx),
+            ("signal_strength_dbm", camera.signal_strength),
+            ("ptz_pan", camera.ptz_position.pan),
+            ("ptz_tilt", camera.ptz_position.tilt),
+            ("ptz_zoom", camera.ptz_position.zoom),
+            ("ptz_moving", 0),
+        ):
+            result.append(
+                {
+                    "metric": {"__name__": name, "camera_id": camera_id, "name": camera.name},
+                    "values": [[timestamp, value]],
+                }
+            )
+    return json.dumps(
+        {"status": "success", "data": {"resultType": "matrix", "result": result}}
+    ).encode()
+
+
+def _report(label: str, legacy, current, number: int) -> None:
+    before = min(timeit.repeat(legacy, number=number, repeat=5)) / number
+    after = min(timeit.repeat(current, number=number, repeat=5)) / number
+    print(
+        f"{label:<28} legacy {before * 1000:8.2f} ms   current {after * 1000:8.2f} ms   "
+        f"speedup {before / after:5.1f}x"
+    )
+
+
+def main(cameras: int = 500) -> None:
+    legacy = {f"cam{i}": _LegacyCameraMetrics(**_fields(i)) for i in range(cameras)}
+    collector = MetricsCollector(SimpleNamespace(cameras={}), registry=MetricsRegistry())
+    for index in range(cameras):
+        fields = _fields(index)
+        collector.metrics[fields["camera_id"]] = CameraMetrics(**fields, ptz_position=PTZPosition())
+
+    print(f"{cameras} cameras")
+    _report(
+        "to_dict",
+        lambda: [camera.to_dict() for camera in legacy.values()],
+        lambda: [camera.to_dict() for camera in collector.metrics.values()],
+        number=20,
+    )
+    _report(
+        "/api/cameras body",
+        lambda: json.dumps({k: c.to_dict() for k, c in legacy.items()}).encode(),
+        lambda: dumps({k: c.to_dict() for k, c in collector.metrics.items()}),
+        number=20,
+    )
+    _report(
+        "/api/metrics body",
+        lambda: _legacy_grafana(legacy),
+        collector.get_grafana_metrics_json,
+        number=20,
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
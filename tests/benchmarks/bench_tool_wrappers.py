@@ -0,0 +1,214 @@
+"""
+Tool wrapper benchmark.
+
+Compares the wrapper functions the MCP server used to generate with ``exec``
+-- one source string per tool, a new tool instance per call -- with the
+signature-based wrappers of ``tapo_camera_mcp.tools.invoker``:
+
+- registration: building the wrappers of every manifest tool and adding
+  them to a FastMCP server;
+- per call: awaiting the wrapper of a trivial tool, so the time measured is
+  the wrapper's own overhead (validation, instance creation, dispatch), both
+  on the caller's loop and, as in direct mode, on the background loop;
+- cached calls: a read tool waiting 2 ms on its device, called with and
+  without a cache policy (``Meta.cache``).
+
+Run with::
+
+    python tests/benchmarks/bench_tool_wrappers.py [--calls N] [--runs N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from fastmcp import FastMCP
+from pydantic import BaseModel, Field
+
+from tapo_camera_mcp.core.sync_runner import background_loop
+from tapo_camera_mcp.tools.base_tool import BaseTool, CachePolicy, ToolCategory, ToolResult
+from tapo_camera_mcp.tools.invoker import build_tool_wrapper
+from tapo_camera_mcp.tools.manifest import entries_from_classes, load_manifest, resolve_tool
+
+
+class EchoFieldsTool(BaseTool):
+    """Trivial tool taking its parameters as model fields."""
+
+    class Meta:
+        name = "bench_echo_fields"
+        description = "Echo a value"
+        category = ToolCategory.UTILITY
+
+    value: int = Field(0, description="Value to echo")
+
+    async def execute(self) -> Dict[str, Any]:
+        return {"value": self.value}
+
+
+class EchoRunTool(BaseTool):
+    """Trivial portmanteau tool taking its parameters in ``_run``."""
+
+    class Meta:
+        name = "bench_echo_run"
+        description = "Echo a value"
+        category = ToolCategory.UTILITY
+
+        class Parameters(BaseModel):
+            value: int = Field(0, description="Value to echo")
+
+    async def _run(self, value: int = 0) -> Dict[str, Any]:
+        return {"value": value}
+
+
+class DeviceReadTool(BaseTool):
+    """Read tool whose device answers after 2 ms."""
+
+    class Meta:
+        name = "bench_device_read"
+        description = "Read a device"
+        category = ToolCategory.UTILITY
+
+    device: str = Field("plug", description="Device to read")
+
+    async def execute(self) -> Dict[str, Any]:
+        await asyncio.sleep(0.002)
+        return {"device": self.device, "power": 12.5}
+
+
+class CachedDeviceReadTool(DeviceReadTool):
+    """The same read tool with a cache policy."""
+
+    class Meta:
+        name = "bench_cached_device_read"
+        description = "Read a device"
+        category = ToolCategory.UTILITY
+        cache = CachePolicy(ttl=3600)
+
+
+def legacy_wrapper(entry: Dict[str, Any]) -> Callable:
+    """The exec-generated wrapper the server built before the invoker existed."""
+    schema = entry["parameters"]
+    properties = schema.get("properties", {})
+    required = set(schema.get("required", []))
+    param_names = [name for name in properties if name in required]
+    param_names += [name for name in properties if name not in required]
+    defaults = {name: properties[name].get("default") for name in param_names}
+    param_signature = ", ".join(
+        name if name in required else f"{name}=defaults[{name!r}]" for name in param_names
+    )
+    kwargs_lines = "\n".join(f"        kwargs['{name}'] = {name}" for name in param_names)
+    func_code = f"""
+async def tool_wrapper({param_signature}):
+    try:
+        kwargs = {{}}
+{kwargs_lines}
+        tool_instance = resolve_tool(entry)(**kwargs)
+        if hasattr(tool_instance, 'initialize') and callable(tool_instance.initialize):
+            if asyncio.iscoroutinefunction(tool_instance.initialize):
+                await tool_instance.initialize()
+            else:
+                tool_instance.initialize()
+        if hasattr(tool_instance, 'execute'):
+            execute_method = tool_instance.execute
+            if asyncio.iscoroutinefunction(execute_method):
+                result = await execute_method()
+            else:
+                result = execute_method()
+            if isinstance(result, ToolResult):
+                return {{"content": result.content, "is_error": result.is_error}}
+            elif isinstance(result, dict):
+                return result
+            else:
+                return {{"content": str(result), "is_error": False}}
+        else:
+            raise ValueError("Tool has no execute method")
+    except Exception as e:
+        return {{"content": "Error executing tool: {{}}".format(e), "is_error": True}}
+"""
+    local_vars = {
+        "entry": entry,
+        "defaults": defaults,
+        "resolve_tool": resolve_tool,
+        "asyncio": asyncio,
+        "ToolResult": ToolResult,
+    }
+    exec(func_code, local_vars)  # nosec B102
+    wrapper = local_vars["tool_wrapper"]
+    wrapper.__doc__ = entry["description"]
+    return wrapper
+
+
+def time_registration(entries: List[Dict[str, Any]], factory: Callable, runs: int) -> float:
+    """Fastest time, in milliseconds, to build and register the wrappers of all entries."""
+    best = float("inf")
+    for _ in range(runs):
+        mcp = FastMCP("bench")
+        start = time.perf_counter()
+        for entry in entries:
+            registered = mcp.tool(entry["name"], description=entry["description"])(factory(entry))
+            registered.parameters = entry["parameters"]
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def time_calls(wrapper: Callable, arguments: Dict[str, Any], calls: int) -> float:
+    """Mean time of one wrapper call, in microseconds."""
+    result = await wrapper(**arguments)
+    if result.get("is_error"):
+        raise RuntimeError(result["content"])
+    start = time.perf_counter()
+    for _ in range(calls):
+        await wrapper(**arguments)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def run(calls: int, runs: int) -> None:
+    entries = load_manifest() or []
+    print(f"Registration of {len(entries)} tools (best of {runs}):")
+    legacy_ms = time_registration(entries, legacy_wrapper, runs)
+    current_ms = time_registration(entries, build_tool_wrapper, runs)
+    print(f"  exec wrappers      {legacy_ms:8.2f} ms")
+    print(f"  signature wrappers {current_ms:8.2f} ms")
+
+    fields_entry, run_entry = entries_from_classes([EchoFieldsTool, EchoRunTool])
+    print(f"\nPer-call overhead ({calls} calls):")
+    cases = [
+        ("fields tool, no arguments", legacy_wrapper(fields_entry), fields_entry, {}),
+        ("fields tool, value=1", legacy_wrapper(fields_entry), fields_entry, {"value": 1}),
+    ]
+    for label, legacy, entry, arguments in cases:
+        legacy_us = await time_calls(legacy, arguments, calls)
+        current_us = await time_calls(build_tool_wrapper(entry), arguments, calls)
+        print(f"  {label:30} exec {legacy_us:7.2f} us  signature {current_us:7.2f} us")
+    # The exec wrappers could not call _run tools at all
+    run_us = await time_calls(build_tool_wrapper(run_entry), {"value": 1}, calls)
+    print(f"  {'_run tool, value=1':30} exec     n/a     signature {run_us:7.2f} us")
+    direct_wrapper = build_tool_wrapper(run_entry, background_loop.run_async)
+    direct_us = await time_calls(direct_wrapper, {"value": 1}, calls)
+    background_loop.stop()
+    print(f"  {'_run tool, background loop':30} exec     n/a     signature {direct_us:7.2f} us")
+
+    cached_entry, device_entry = entries_from_classes([DeviceReadTool, CachedDeviceReadTool])
+    print(f"\nRead tool with a 2 ms device round trip ({calls} cached calls):")
+    uncached_us = await time_calls(build_tool_wrapper(device_entry), {}, min(calls, 200))
+    cached_us = await time_calls(build_tool_wrapper(cached_entry), {}, calls)
+    print(f"  {'no cache policy':30} {uncached_us:9.2f} us")
+    print(f"  {'cached':30} {cached_us:9.2f} us")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="Calls per case")
+    parser.add_argument("--runs", type=int, default=5, help="Registration runs")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.calls, args.runs))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tapo_camera_mcp import TapoCameraMCP
 from tapo_camera_mcp.core.models import TapoCameraConfig
+from tapo_camera_mcp.tools.result_cache import result_cache
 
 # Test configuration
 TEST_CONFIG = {
@@ -89,6 +90,14 @@ def test_image() -> bytes:
     )
 
 
+@pytest.fixture(autouse=True)
+def empty_result_cache():
+    """Start every test without tool results cached by an earlier one."""
+    result_cache.invalidate()
+    yield
+    result_cache.invalidate()
+
+
 # Test utilities
 def assert_dict_contains(d: Dict[Any, Any], sub_d: Dict[Any, Any]) -> None:
     """Assert that dictionary d contains all key-value pairs from sub_d."""
@@ -0,0 +1,119 @@
+"""
+Tests for the batch_execute tool.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import pytest
+from pydantic import Field
+
+from tapo_camera_mcp.tools.base_tool import BaseTool, ToolCategory
+from tapo_camera_mcp.tools.invoker import build_tool_wrapper
+from tapo_camera_mcp.tools.manifest import entries_from_classes
+from tapo_camera_mcp.tools.system import batch_tool
+from tapo_camera_mcp.tools.system.batch_tool import BatchExecuteTool
+
+running = []
+
+
+class SleepTool(BaseTool):
+    """Sleeps, then echoes the delay."""
+
+    class Meta:
+        name = "test_batch_sleep"
+        description = "Sleep"
+        category = ToolCategory.UTILITY
+
+    delay: float = Field(0.0, description="Seconds to sleep")
+
+    async def execute(self) -> Dict[str, Any]:
+        running.append(self.delay)
+        await asyncio.sleep(self.delay)
+        running.remove(self.delay)
+        return {"success": True, "delay": self.delay}
+
+
+class FailingTool(BaseTool):
+    """Always raises."""
+
+    class Meta:
+        name = "test_batch_fail"
+        description = "Fail"
+        category = ToolCategory.UTILITY
+
+    async def execute(self) -> Dict[str, Any]:
+        raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def test_tools(monkeypatch):
+    for entry in entries_from_classes([SleepTool, FailingTool]):
+        monkeypatch.setitem(batch_tool._wrappers, entry["name"], build_tool_wrapper(entry))
+
+
+async def test_results_keep_the_call_order():
+    """Calls finishing in any order come back in the order they were given."""
+    calls = [{"tool": "test_batch_sleep", "arguments": {"delay": d}} for d in (0.05, 0.0, 0.02)]
+    result = await BatchExecuteTool(calls=calls).execute()
+
+    assert result["success"] is True
+    assert [item["result"]["delay"] for item in result["results"]] == [0.05, 0.0, 0.02]
+    assert [item["index"] for item in result["results"]] == [0, 1, 2]
+
+
+async def test_concurrency_is_limited():
+    """No more than `concurrency` calls run at the same time."""
+    peak = []
+    calls = [{"tool": "test_batch_sleep", "arguments": {"delay": 0.02}}] * 6
+
+    async def watch():
+        while True:
+            peak.append(len(running))
+            await asyncio.sleep(0.005)
+
+    watcher = asyncio.ensure_future(watch())
+    start = time.perf_counter()
+    result = await BatchExecuteTool(calls=calls, concurrency=2).execute()
+    elapsed = time.perf_counter() - start
+    watcher.cancel()
+
+    assert result["failed"] == 0
+    assert max(peak) == 2
+    assert elapsed >= 0.06
+
+
+async def test_errors_and_timeouts_are_reported_per_call():
+    """Failures, timeouts and unknown tools only fail their own item."""
+    calls = [
+        {"tool": "test_batch_sleep", "arguments": {"delay": 0}},
+        {"tool": "test_batch_fail"},
+        {"tool": "test_batch_sleep", "arguments": {"delay": 5}},
+        {"tool": "no_such_tool"},
+        {"tool": "batch_execute", "arguments": {"calls": []}},
+    ]
+    result = await BatchExecuteTool(calls=calls, timeout=0.05).execute()
+    items = result["results"]
+
+    assert result["success"] is False
+    assert result["failed"] == 4
+    assert items[0]["success"] is True
+    assert "boom" in items[1]["error"]
+    assert "Timed out" in items[2]["error"]
+    assert "Unknown tool" in items[3]["error"]
+    assert "Unknown tool" in items[4]["error"]
+
+
+async def test_manifest_tools_are_callable():
+    """Tools are looked up in the tool manifest."""
+    calls = [{"tool": "system_info", "arguments": {"operation": "tool_metrics"}}]
+    result = await BatchExecuteTool(calls=calls).execute()
+
+    assert result["results"][0]["success"] is True
+    assert result["results"][0]["result"]["operation"] == "tool_metrics"
@@ -0,0 +1,103 @@
+"""
+Tests for the blob store and the resources and endpoints serving it.
+"""
+
+import importlib
+import os
+import sys
+import time
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastmcp import Client, FastMCP
+
+from tapo_camera_mcp.core.resources import register_resources
+from tapo_camera_mcp.media.blob_store import BlobStore, parse_blob_uri
+from tapo_camera_mcp.web.api import media
+
+# The package exports the blob_store instance under the module's name
+blob_store_module = importlib.import_module("tapo_camera_mcp.media.blob_store")
+
+
+def test_identical_content_is_stored_once():
+    """Content is addressed by its hash; putting it again renews it."""
+    store = BlobStore(ttl=60)
+    first = store.put(b"frame", "image/jpeg")
+    second = store.put(b"frame", "image/jpeg")
+
+    assert first.digest == second.digest
+    assert first.uri == f"tapo://snapshots/{first.digest}"
+    assert second.expires_at >= first.expires_at
+    assert store.stats()["blobs"] == 1
+    assert store.size == len(b"frame")
+
+
+def test_expired_blobs_are_gone(monkeypatch):
+    """Blobs cannot be read once their TTL has passed."""
+    store = BlobStore(ttl=10)
+    blob = store.put(b"frame")
+    now = time.time()
+    monkeypatch.setattr(blob_store_module.time, "time", lambda: now + 11)
+
+    assert store.get(blob.digest) is None
+    assert store.size == 0
+
+
+def test_least_recently_used_blobs_are_evicted():
+    """Above max_bytes, the least recently read blobs go first."""
+    store = BlobStore(max_bytes=10)
+    a = store.put(b"aaaa")
+    b = store.put(b"bbbb")
+    store.get(a.digest)
+    c = store.put(b"cccc")
+
+    assert store.get(b.digest) is None
+    assert store.get(a.digest) is not None
+    assert store.get(c.digest) is not None
+
+
+def test_reference_and_uri():
+    """Tools return a reference instead of the data."""
+    blob = BlobStore().put(b"frame")
+    reference = blob.reference()
+
+    assert reference["url"] == f"/api/media/blobs/{blob.digest}"
+    assert reference["size"] == 5
+    assert parse_blob_uri(reference["uri"]) == ("snapshots", blob.digest)
+    with pytest.raises(ValueError):
+        parse_blob_uri("https://example.com/x")
+
+
+async def test_blobs_are_mcp_resources(monkeypatch):
+    """Clients read the bytes through the resource template."""
+    store = BlobStore()
+    monkeypatch.setattr(blob_store_module, "blob_store", store)
+    blob = store.put(b"\xff\xd8jpeg")
+    mcp = FastMCP("test")
+    register_resources(mcp)
+
+    async with Client(mcp) as client:
+        contents = await client.read_resource(blob.uri)
+        assert contents[0].mimeType == "image/jpeg"
+        with pytest.raises(Exception, match="unknown or has expired"):
+            await client.read_resource("tapo://snapshots/" + "0" * 64)
+
+
+def test_blobs_are_served_over_rest(monkeypatch):
+    """The REST endpoint returns the bytes with their MIME type."""
+    store = BlobStore()
+    monkeypatch.setattr(media, "blob_store", store)
+    blob = store.put(b"\xff\xd8jpeg")
+    app = FastAPI()
+    app.include_router(media.router)
+    client = TestClient(app)
+
+    response = client.get(blob.reference()["url"])
+    assert response.status_code == 200
+    assert response.content == b"\xff\xd8jpeg"
+    assert response.headers["content-type"] == "image/jpeg"
+    assert client.get("/api/media/blobs/unknown").status_code == 404
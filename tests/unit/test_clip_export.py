@@ -0,0 +1,232 @@
+"""
+Tests for clip export from stored recordings.
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.exceptions import StorageError
+from tapo_camera_mcp.media.clips import (
+    ClipExporter,
+    RecordingSegment,
+    build_concat_script,
+    clip_duration,
+    confine_output_path,
+    parse_datetime,
+    parse_recording_timestamp,
+    recording_camera_id,
+)
+
+HAS_FFMPEG = shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+def _touch(path: Path, mtime: datetime) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\x00")
+    os.utime(path, (mtime.timestamp(), mtime.timestamp()))
+    return path
+
+
+def test_parse_recording_timestamp():
+    """Timestamps are recognised in the common file name layouts."""
+    expected = datetime(2024, 5, 1, 14, 2, 0)
+    assert parse_recording_timestamp("front_door_20240501_140200.mp4") == expected
+    assert parse_recording_timestamp("20240501T140200.mkv") == expected
+    assert parse_recording_timestamp("2024-05-01_14-02-00.mp4") == expected
+    assert parse_recording_timestamp("clip.mp4") is None
+
+
+def test_parse_datetime_accepts_utc_suffix():
+    """A trailing Z is converted to naive local time."""
+    parsed = parse_datetime("2024-05-01T14:02:00Z")
+    assert parsed.tzinfo is None
+    assert parsed == datetime.fromisoformat("2024-05-01T14:02:00+00:00").astimezone().replace(
+        tzinfo=None
+    )
+
+
+async def test_find_segments_selects_overlapping_files(tmp_path, monkeypatch):
+    """Only segments overlapping the range are returned, in start order."""
+    base = datetime(2024, 5, 1, 14, 0, 0)
+    camera_dir = tmp_path / "front_door"
+    for minute in (0, 5, 10, 15):
+        start = base + timedelta(minutes=minute)
+        _touch(camera_dir / f"{start:%Y%m%d_%H%M%S}.mp4", start + timedelta(minutes=5))
+    _touch(camera_dir / "notes.txt", base)
+
+    exporter = ClipExporter(recordings_dir=tmp_path)
+    probed = []
+
+    async def fake_probe(path):
+        probed.append(path.name)
+        return 300.0
+
+    monkeypatch.setattr(exporter, "_probe_duration", fake_probe)
+
+    segments = await exporter.find_segments(
+        "front_door", base + timedelta(minutes=2), base + timedelta(minutes=7)
+    )
+
+    assert [segment.start for segment in segments] == [base, base + timedelta(minutes=5)]
+    # Files that ended before the range or start after it are never probed
+    assert len(probed) == 2
+
+
+def test_concat_script_trims_first_and_last_segment(tmp_path):
+    """The first segment gets an inpoint and the last an outpoint."""
+    base = datetime(2024, 5, 1, 14, 0, 0)
+    segments = [
+        RecordingSegment(path=tmp_path / "a.mp4", start=base, duration=300.0),
+        RecordingSegment(
+            path=tmp_path / "b.mp4", start=base + timedelta(minutes=5), duration=300.0
+        ),
+    ]
+    start = base + timedelta(minutes=2)
+    end = base + timedelta(minutes=7)
+
+    script = build_concat_script(segments, start, end)
+
+    assert script.splitlines() == [
+        "ffconcat version 1.0",
+        f"file '{(tmp_path / 'a.mp4').resolve()}'",
+        "inpoint 120.000",
+        f"file '{(tmp_path / 'b.mp4').resolve()}'",
+        "outpoint 120.000",
+    ]
+    assert clip_duration(segments, start, end) == 300.0
+
+
+async def test_export_rejects_empty_range(tmp_path):
+    """An end before the start is rejected before any work is done."""
+    exporter = ClipExporter(recordings_dir=tmp_path)
+    start = datetime(2024, 5, 1, 14, 0, 0)
+    with pytest.raises(ValueError):
+        async for _ in exporter.export("front_door", start, start):
+            pass
+
+
+@pytest.mark.parametrize(
+    ("camera_id", "output_path"),
+    [("../secrets", None), ("front_door", "/etc/passwd.mp4"), ("front_door", "../x.mp4")],
+)
+async def test_export_stays_inside_its_directories(tmp_path, camera_id, output_path):
+    """Camera ids and output paths cannot point outside the media directories."""
+    exporter = ClipExporter(recordings_dir=tmp_path)
+    start = datetime(2024, 5, 1, 14, 0, 0)
+    with pytest.raises(ValueError):
+        async for _ in exporter.export(camera_id, start, start + timedelta(minutes=1), output_path):
+            pass
+
+
+def test_output_paths_are_resolved_in_the_exports_dir(tmp_path):
+    """Relative output paths land in the directory; other extensions are rejected."""
+    exports = tmp_path / "exports"
+    assert confine_output_path("clip.mp4", exports, {".mp4"}) == exports.resolve() / "clip.mp4"
+    with pytest.raises(ValueError):
+        confine_output_path(str(exports / "notes"), exports, {".mp4"})
+
+
+def test_flat_recordings_match_the_whole_camera_id(tmp_path):
+    """Recordings of cameras whose id starts with another camera's id are not mixed in."""
+    start = datetime(2024, 5, 1, 14, 0, 0)
+    for camera_id in ("front", "front_yard", "front2"):
+        _touch(tmp_path / f"{camera_id}_{start:%Y%m%d_%H%M%S}.mp4", start)
+
+    assert recording_camera_id("front_yard_20240501_140000.mp4") == "front_yard"
+    assert [path.name for path in ClipExporter(tmp_path)._candidate_files("front")] == [
+        "front_20240501_140000.mp4"
+    ]
+
+
+async def test_ffmpeg_that_cannot_start_leaves_no_partial_file(tmp_path, monkeypatch):
+    """The partial output is removed even if FFmpeg never ran."""
+    start = datetime(2024, 5, 1, 14, 0, 0)
+    exporter = ClipExporter(recordings_dir=tmp_path, ffmpeg_path="false")
+    segment = RecordingSegment(path=tmp_path / "front_door.mp4", start=start, duration=60)
+
+    async def find_segments(*args):
+        return [segment]
+
+    async def missing_ffmpeg(*args, **kwargs):
+        raise FileNotFoundError("ffmpeg")
+
+    monkeypatch.setattr(exporter, "find_segments", find_segments)
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", missing_ffmpeg)
+
+    with pytest.raises(FileNotFoundError):
+        async for _ in exporter.export("front_door", start, start + timedelta(seconds=30)):
+            pass
+    assert list(exporter.exports_dir.iterdir()) == []
+
+
+async def test_failed_export_keeps_existing_files(tmp_path, monkeypatch):
+    """A failing FFmpeg run removes only its own partial output."""
+    start = datetime(2024, 5, 1, 14, 0, 0)
+    exporter = ClipExporter(recordings_dir=tmp_path, ffmpeg_path="false")
+    segment = RecordingSegment(path=tmp_path / "front_door.mp4", start=start, duration=60)
+
+    async def find_segments(*args):
+        return [segment]
+
+    monkeypatch.setattr(exporter, "find_segments", find_segments)
+    existing = exporter.exports_dir / "kept.mp4"
+    existing.parent.mkdir(parents=True)
+    existing.write_bytes(b"earlier export")
+
+    with pytest.raises(StorageError):
+        async for _ in exporter.export(
+            "front_door", start, start + timedelta(seconds=30), "kept.mp4"
+        ):
+            pass
+    assert existing.read_bytes() == b"earlier export"
+    assert list(exporter.exports_dir.iterdir()) == [existing]
+
+
+@pytest.mark.skipif(not HAS_FFMPEG, reason="FFmpeg is not installed")
+async def test_export_joins_segments_by_stream_copy(tmp_path):
+    """Two generated segments are exported into one clip."""
+    base = datetime(2024, 5, 1, 14, 0, 0)
+    camera_dir = tmp_path / "front_door"
+    camera_dir.mkdir()
+    for index in range(2):
+        start = base + timedelta(seconds=4 * index)
+        path = camera_dir / f"{start:%Y%m%d_%H%M%S}.mp4"
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "testsrc=duration=4:size=160x120:rate=10",
+                "-g",
+                "10",
+                str(path),
+            ],
+            check=True,
+        )
+        os.utime(path, ((start + timedelta(seconds=4)).timestamp(),) * 2)
+
+    exporter = ClipExporter(recordings_dir=tmp_path)
+    updates = [
+        update
+        async for update in exporter.export(
+            "front_door", base + timedelta(seconds=1), base + timedelta(seconds=7)
+        )
+    ]
+
+    assert updates[0].stage == "planning"
+    assert updates[-1].stage == "done"
+    assert updates[-1].segments == 2
+    assert Path(updates[-1].output_path).stat().st_size > 0
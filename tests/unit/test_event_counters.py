@@ -0,0 +1,74 @@
+"""
+Tests for the sliding-window event counters.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.event_counters import MOTION, EventCounters, WindowCounter, event_counters
+from tapo_camera_mcp.metrics_service import MetricsCollector
+from tapo_camera_mcp.prometheus import MetricsRegistry
+
+T0 = 1_700_000_040  # minute aligned
+
+
+def test_windowed_counts_expire_old_buckets():
+    """Counts cover the trailing window and drop events that slide out of it."""
+    counters = EventCounters()
+    for minute in range(0, 120, 10):
+        counters.record("porch", MOTION, T0 + minute * 60)
+
+    now = T0 + 119 * 60
+    assert counters.count("porch", MOTION, 3600, now) == 6
+    assert counters.count("porch", MOTION, 24 * 3600, now) == 12
+    assert counters.rate("porch", MOTION, 3600, now) == 6
+    assert counters.count("porch", MOTION, 3600, now + 23 * 3600) == 0
+    assert counters.count("porch", MOTION, 24 * 3600, now + 24 * 3600) == 0
+    assert counters.count("garage", MOTION, 3600, now) == 0
+
+
+def test_wraparound_reuses_buckets():
+    """Buckets reused after a long gap start from zero."""
+    counter = WindowCounter(bucket_seconds=60, buckets=10)
+    counter.add(T0, 5)
+    counter.add(T0 + 25 * 60)
+    assert counter.total(600, T0 + 25 * 60) == 1
+    counter.add(T0)  # older than the covered span
+    assert counter.total(600, T0 + 25 * 60) == 1
+    assert counter.last_event == T0 + 25 * 60
+
+
+def test_summary_and_sources():
+    """Summaries expose the 1h/24h counts and the last event time."""
+    counters = EventCounters()
+    counters.record("porch", MOTION, T0)
+    counters.record("plug", "energy", T0)
+
+    summary = counters.summary("porch", MOTION, now=T0 + 60)
+    assert summary["motion_events_1h"] == 1
+    assert summary["motion_events_24h"] == 1
+    assert summary["last_motion_time"] is not None
+    assert counters.sources(MOTION) == ["porch"]
+    assert counters.sources() == ["plug", "porch"]
+
+
+async def test_collector_counts_motion_onsets():
+    """Only transitions into motion are counted, not every poll reporting it."""
+    states = iter([False, True, True, False, True])
+
+    class Camera:
+        async def get_status(self):
+            return {"connected": True, "motion_detected": next(states)}
+
+    client = SimpleNamespace(cameras={"motion-cam": Camera()})
+    collector = MetricsCollector(client, registry=MetricsRegistry())
+    collector.sync_cameras()
+    before = event_counters.count("motion-cam", MOTION, 3600)
+    for _ in range(5):
+        await collector.poll_camera("motion-cam")
+
+    assert event_counters.count("motion-cam", MOTION, 3600) - before == 2
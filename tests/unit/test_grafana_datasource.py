@@ -0,0 +1,127 @@
+"""
+Tests for the Grafana JSON datasource endpoints.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.event_counters import MOTION, EventCounters
+from tapo_camera_mcp.grafana_datasource import GrafanaDatasource
+from tapo_camera_mcp.metrics_history import MetricsHistory
+from tapo_camera_mcp.metrics_service import MetricsCollector, MetricsServer
+from tapo_camera_mcp.prometheus import MetricsRegistry
+
+T0 = 1_699_999_200  # hour aligned
+
+
+def _range(seconds: int):
+    return {"from": T0 * 1000, "to": (T0 + seconds) * 1000}
+
+
+def _history() -> MetricsHistory:
+    history = MetricsHistory(resolution=30)
+    for index in range(120):  # one hour at 30 s
+        history.record("plug_power_watts", {"device_id": "tv"}, index, T0 + 30 * index)
+        history.record("plug_power_watts", {"device_id": "fridge"}, 100, T0 + 30 * index)
+    history.record("weather_temperature_celsius", {"station_id": "s1"}, 21.5, T0)
+    return history
+
+
+def test_query_downsamples_to_max_data_points():
+    """Series are bucketed so no target returns more than maxDataPoints points."""
+    datasource = GrafanaDatasource(_history(), EventCounters())
+    result = datasource.query(
+        {
+            "range": _range(3600),
+            "maxDataPoints": 6,
+            "targets": [
+                {"target": 'plug_power_watts{device_id="tv"}', "refId": "A", "data": {"agg": "max"}}
+            ],
+        }
+    )
+
+    assert len(result) == 1
+    assert result[0]["target"] == 'plug_power_watts{device_id="tv"}'
+    assert result[0]["refId"] == "A"
+    datapoints = result[0]["datapoints"]
+    assert len(datapoints) <= 6
+    assert datapoints[0] == [19, T0 * 1000]
+    assert datapoints[-1][0] == 119
+
+
+def test_step_respects_interval_and_resolution():
+    """The bucket width is a multiple of the history resolution."""
+    datasource = GrafanaDatasource(MetricsHistory(resolution=30), EventCounters())
+    assert datasource.step(0, 600, 0, 1000) == 30
+    assert datasource.step(0, 3600, 0, 50) == 90
+    assert datasource.step(0, 600, 45_000, 1000) == 60
+
+
+def test_search_and_annotations():
+    """Search lists names and selectors; annotations come from event buckets."""
+    counters = EventCounters()
+    counters.record("porch", MOTION, T0 + 10)
+    counters.record("porch", MOTION, T0 + 20)
+    counters.record("garage", MOTION, T0 + 600)
+    datasource = GrafanaDatasource(_history(), counters)
+
+    assert "weather_temperature_celsius" in datasource.search()
+    assert datasource.search("fridge") == ['plug_power_watts{device_id="fridge"}']
+
+    annotations = datasource.annotations(
+        {"range": _range(3600), "annotation": {"query": 'motion{source_id="porch"}'}}
+    )
+    assert [(item["time"], item["text"]) for item in annotations] == [
+        (T0 * 1000, "2 motion events")
+    ]
+    assert len(datasource.annotations({"range": _range(3600), "annotation": {}})) == 2
+
+
+def test_datasource_endpoints():
+    """The metrics server exposes the datasource under /grafana."""
+    collector = MetricsCollector(
+        SimpleNamespace(cameras={}),
+        history=_history(),
+        registry=MetricsRegistry(),
+        sample_sources=[],
+    )
+    client = TestClient(MetricsServer(collector).create_app())
+
+    assert client.get("/grafana/").status_code == 200
+    assert "plug_power_watts" in client.post("/grafana/search", json={"target": ""}).json()
+
+    response = client.post(
+        "/grafana/query",
+        json={
+            "range": _range(3600),
+            "maxDataPoints": 10,
+            "targets": [{"target": "plug_power_watts"}],
+        },
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    bad = client.post("/grafana/query", json={"targets": [{"target": "x"}]})
+    assert bad.status_code == 400
+
+
+def test_source_samples_are_recorded():
+    """Energy and weather sources are recorded alongside camera samples."""
+    collector = MetricsCollector(
+        SimpleNamespace(cameras={}),
+        history=MetricsHistory(),
+        registry=MetricsRegistry(),
+        sample_sources=[lambda: [("plug_power_watts", {"device_id": "tv"}, 80.0)]],
+    )
+    collector.record_source_samples(T0)
+
+    [(labels, ring)] = collector.history.select("plug_power_watts")
+    assert labels == {"device_id": "tv"}
+    assert list(ring.samples(T0, T0)) == [(T0, 80.0)]
+    assert b'plug_power_watts{device_id="tv"} 80' in collector.registry.render()
@@ -0,0 +1,58 @@
+"""
+Tests for lazy imports of the server, camera backends and heavy dependencies.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+# Add the src path to Python path
+SRC = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+sys.path.insert(0, SRC)
+
+from tapo_camera_mcp.camera.base import CameraFactory  # noqa: E402 - needs SRC on sys.path
+
+HEAVY = ("cv2", "pytapo", "ring_doorbell", "aiohttp", "torch", "fastmcp")
+
+
+def _loaded_after(code: str):
+    """Top-level modules loaded by running ``code`` in a fresh interpreter."""
+    script = textwrap.dedent(code) + textwrap.dedent(
+        """
+        import json, sys
+        print(json.dumps(sorted({name.split(".")[0] for name in sys.modules})))
+        """
+    )
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC))
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True
+    )
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def test_package_import_loads_no_heavy_dependency():
+    """Importing the package and the camera manager loads no backend or server."""
+    loaded = _loaded_after("import tapo_camera_mcp, tapo_camera_mcp.camera.manager")
+    assert loaded.isdisjoint(HEAVY)
+
+
+def test_factory_imports_only_the_configured_backend():
+    """Creating a webcam imports cv2 but not the other camera clients."""
+    loaded = _loaded_after(
+        """
+        from tapo_camera_mcp.camera.base import CameraFactory
+        CameraFactory.get_camera_class("webcam")
+        """
+    )
+    assert "cv2" in loaded
+    assert loaded.isdisjoint({"pytapo", "ring_doorbell", "aiohttp"})
+
+
+def test_unknown_camera_type_is_rejected():
+    """Unknown camera types are still reported as unsupported."""
+    with pytest.raises(ValueError, match="Unsupported camera type"):
+        CameraFactory.create({"name": "pet", "type": "furbo", "params": {}})
@@ -0,0 +1,51 @@
+"""
+Tests for the event-loop lag monitor.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.loop_monitor import LoopLagMonitor
+from tapo_camera_mcp.prometheus import MetricsRegistry
+
+
+def _blocking_capture():
+    time.sleep(0.4)  # stands in for a synchronous cap.read() in a coroutine
+
+
+async def test_blocking_call_is_captured_with_its_stack():
+    """A callback blocking the loop is reported once, with the blocking frame."""
+    registry = MetricsRegistry()
+    monitor = LoopLagMonitor(interval=0.02, threshold=0.1, registry=registry)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+        _blocking_capture()
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    report = monitor.report()
+    assert report["stalls_total"] == 1
+    assert report["samples"] > 0
+    assert report["lag_max_ms"] >= 250
+    [stall] = report["recent_stalls"]
+    assert "_blocking_capture" in stall["stack"]
+    assert b"event_loop_lag_seconds_bucket" in registry.render()
+    assert b"event_loop_stalls_total 1\n" in registry.render()
+
+
+def test_stack_captures_are_rate_limited():
+    """Only one stack is captured per stack_interval."""
+    monitor = LoopLagMonitor(stack_interval=60, registry=MetricsRegistry())
+    monitor._loop_thread_id = threading.get_ident()
+
+    assert monitor.capture_stall(0.5) is not None
+    assert monitor.capture_stall(0.7) is None
+    assert len(monitor.stalls) == 1
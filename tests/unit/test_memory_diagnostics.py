@@ -0,0 +1,93 @@
+"""
+Tests for memory growth tracking.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.memory_diagnostics import DEFAULT_STRUCTURES, MemoryDiagnostics
+from tapo_camera_mcp.prometheus import MetricsRegistry
+from tapo_camera_mcp.tools.automation.smart_automation import SmartAutomationTool
+
+_leak = []
+
+
+def _leaky_handler():
+    _leak.append(bytearray(512 * 1024))
+
+
+@pytest.fixture
+def diagnostics():
+    tracker = MemoryDiagnostics(registry=MetricsRegistry(), structures={})
+    yield tracker
+    tracker.stop_tracing()
+    _leak.clear()
+
+
+def test_snapshots_attribute_growth_to_allocation_site(diagnostics):
+    """The line that keeps allocating tops the growth since the first snapshot."""
+    diagnostics.start_tracing()
+    for _ in range(4):
+        _leaky_handler()
+    result = diagnostics.take_snapshot(limit=5)
+
+    assert result["tracing"] is True
+    assert result["snapshots"] == 2
+    [top, *_] = result["since_first"]
+    assert top["site"].endswith(
+        f"test_memory_diagnostics.py:{_leaky_handler.__code__.co_firstlineno + 1}"
+    )
+    assert top["size_diff_kb"] >= 4 * 512
+    assert result["files_since_first"][0]["site"].endswith("test_memory_diagnostics.py")
+
+    _leaky_handler()
+    again = diagnostics.take_snapshot(limit=5)
+    assert 512 <= again["since_previous"][0]["size_diff_kb"] < 4 * 512
+
+
+def test_structure_growth_is_attributed_to_cameras(diagnostics):
+    """Structure probes report growth per owner, largest first."""
+    history = {"porch": 1, "garage": 1}
+    diagnostics.register_structure("frame_history", lambda: dict(history))
+    diagnostics.sample()
+    history.update(porch=51, garage=3, yard=2)
+    diagnostics.sample()
+
+    [structure] = diagnostics.structure_report()
+    assert structure["structure"] == "frame_history"
+    assert structure["size"] == 56
+    assert structure["growth"] == 54
+    assert [owner["owner"] for owner in structure["owners"]] == ["porch", "garage", "yard"]
+    assert structure["owners"][0]["growth"] == 50
+
+
+async def test_automation_history_is_probed():
+    """Executed rules count towards the automation history of their rule."""
+    probe, unit = DEFAULT_STRUCTURES["automation_history"]
+    tool = SmartAutomationTool()
+    before = probe().get("motion_detection_alert", 0)
+    await tool.execute("execute_rule", rule_id="motion_detection_alert")
+
+    assert unit == "items"
+    assert probe()["motion_detection_alert"] == before + 1
+
+
+def test_rss_growth_alert_gauge():
+    """The alert gauge turns on once RSS grew beyond the threshold."""
+    registry = MetricsRegistry()
+    tracker = MemoryDiagnostics(rss_growth_threshold=1024 * 1024, registry=registry, structures={})
+    status = tracker.sample()
+    if not status["available"]:
+        pytest.skip("RSS is not available on this platform")
+    assert status["alert"] is False
+    assert b"process_rss_growth_alert 0" in registry.render()
+
+    tracker.baseline_rss -= 2 * 1024 * 1024
+    assert tracker.sample()["alert"] is True
+    assert b"process_rss_growth_alert 1" in registry.render()
+    assert b"process_resident_memory_bytes" in registry.render()
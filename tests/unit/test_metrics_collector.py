@@ -0,0 +1,176 @@
+"""
+Tests for concurrent, adaptive camera metrics collection.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.camera.base import CameraConfig, CameraType
+from tapo_camera_mcp.camera.tapo import TapoCamera
+from tapo_camera_mcp.event_counters import MOTION, event_counters
+from tapo_camera_mcp.metrics_service import CameraStatus, MetricsCollector
+
+
+class _FakeCamera:
+    def __init__(self, status=None, delay: float = 0.0, fail: bool = False):
+        self.status = status or {"connected": True}
+        self.delay = delay
+        self.fail = fail
+        self.config = SimpleNamespace(params={"host": "192.168.1.20"})
+        self.polls = 0
+
+    async def get_status(self):
+        self.polls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("unreachable")
+        return dict(self.status)
+
+
+def _collector(cameras, **kwargs) -> MetricsCollector:
+    return MetricsCollector(SimpleNamespace(cameras=cameras), **kwargs)
+
+
+async def test_collect_fills_reported_fields():
+    """Reported status values are mapped onto the camera metrics."""
+    camera = _FakeCamera(
+        {
+            "connected": True,
+            "model": "C200",
+            "firmware": "1.3.2",
+            "uptime": 3600,
+            "temperature": 41.5,
+            "rssi": -58,
+            "rx_bytes": 1024,
+            "ptz_capable": True,
+            "ptz_position": {"pan": 0.25, "tilt": -0.1},
+        }
+    )
+    collector = _collector({"garage": camera})
+
+    await collector.collect_metrics()
+
+    metrics = collector.metrics["garage"]
+    assert metrics.status == CameraStatus.ONLINE
+    assert metrics.ip_address == "192.168.1.20"
+    assert (metrics.model, metrics.firmware) == ("C200", "1.3.2")
+    assert metrics.uptime_seconds == 3600
+    assert metrics.temperature == 41.5
+    assert metrics.signal_strength == -58
+    assert metrics.network_rx == 1024
+    assert metrics.ptz_supported
+    assert (metrics.ptz_position.pan, metrics.ptz_position.tilt) == (0.25, -0.1)
+    assert metrics.last_seen is not None
+
+
+async def test_cameras_are_polled_concurrently_with_timeout():
+    """Slow cameras time out without holding up the others."""
+    cameras = {f"cam{i}": _FakeCamera(delay=0.1) for i in range(8)}
+    cameras["stuck"] = _FakeCamera(delay=5.0)
+    collector = _collector(cameras, timeout=0.3)
+
+    started = time.monotonic()
+    await collector.collect_metrics()
+
+    assert time.monotonic() - started < 1.0
+    assert collector.metrics["stuck"].status == CameraStatus.ERROR
+    assert "timed out" in collector.metrics["stuck"].last_error
+    assert all(collector.metrics[f"cam{i}"].status == CameraStatus.ONLINE for i in range(8))
+
+
+async def test_intervals_adapt_to_changes_and_errors():
+    """Stable cameras slow down; changing or failing cameras speed up."""
+    stable = _FakeCamera({"connected": True, "temperature": 40.0})
+    changing = _FakeCamera({"connected": True, "temperature": 40.0})
+    failing = _FakeCamera(fail=True)
+    collector = _collector(
+        {"stable": stable, "changing": changing, "failing": failing},
+        poll_interval=30.0,
+        min_interval=5.0,
+        max_interval=120.0,
+    )
+
+    for step in range(3):
+        changing.status["temperature"] = 40.0 + step
+        await collector.collect_metrics()
+
+    assert collector.get_poll_interval("stable") > 30.0
+    assert collector.get_poll_interval("changing") < 30.0
+    assert collector.get_poll_interval("failing") == 5.0
+
+
+async def test_poll_budget_bounds_intervals_for_large_fleets():
+    """The shortest interval grows with the fleet to cap the total poll rate."""
+    cameras = {f"cam{i}": _FakeCamera(fail=True) for i in range(200)}
+    collector = _collector(cameras, min_interval=5.0, max_polls_per_second=10.0)
+
+    await collector.collect_metrics()
+
+    assert collector.interval_floor == 20.0
+    assert min(collector.get_poll_interval(camera_id) for camera_id in cameras) == 20.0
+
+
+async def test_background_loop_tracks_camera_changes():
+    """Cameras added to or removed from the source are picked up while running."""
+    cameras = {"garage": _FakeCamera()}
+    collector = _collector(cameras, poll_interval=0.05, min_interval=0.05, jitter=0.0)
+
+    await collector.start()
+    await asyncio.sleep(0.2)
+    cameras["porch"] = cameras.pop("garage")
+    await asyncio.sleep(1.2)
+    await collector.stop()
+
+    assert list(collector.metrics) == ["porch"]
+    assert collector.metrics["porch"].status == CameraStatus.ONLINE
+
+
+async def test_tapo_detections_are_counted_as_motion_events():
+    """Every detection a Tapo camera lists is counted once, at its start time."""
+    events = []
+    searches = []
+
+    def get_events():
+        searches.append(1)
+        return list(events)
+
+    client = SimpleNamespace(
+        getBasicInfo=lambda: {"device_info": {"device_model": "C200"}},
+        getVideoConfig=lambda: {},
+        getAudioConfig=lambda: {},
+        getEvents=get_events,
+    )
+    camera = TapoCamera(
+        CameraConfig(name="test_motion_driveway", type=CameraType.TAPO, params={"host": "x"})
+    )
+    camera._camera = client
+    camera._is_connected = True
+    collector = _collector({"test_motion_driveway": camera})
+
+    await collector.collect_metrics()
+    assert collector.metrics["test_motion_driveway"].motion_detected is False
+
+    # Three detections between two polls, the older two long over
+    now = time.time()
+    events.extend({"start_time": start, "end_time": start + 20} for start in (now - 900, now - 600))
+    events.append({"start_time": now - 5, "end_time": now})
+    await collector.collect_metrics()
+    await collector.collect_metrics()
+
+    metrics = collector.metrics["test_motion_driveway"]
+    assert metrics.motion_detected is True
+    assert metrics.motion_last_detected.timestamp() == pytest.approx(now)
+    assert event_counters.count("test_motion_driveway", MOTION, 3600) == 3
+    assert event_counters.count("test_motion_driveway", MOTION, 300) == 1
+
+    # Other status readers use the last poll's result without searching again
+    assert (await camera.get_status())["motion_detected"] is True
+    assert len(searches) == 3
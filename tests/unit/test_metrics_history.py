@@ -0,0 +1,111 @@
+"""
+Tests for the metrics history ring buffer and range queries.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.metrics_history import MetricsHistory, SeriesRing, parse_selector
+from tapo_camera_mcp.metrics_service import CameraMetrics, MetricsCollector, MetricsServer
+
+T0 = 1_699_999_980.0  # multiple of 30 and 60
+
+
+def test_ring_downsamples_by_step():
+    """Samples are grouped into step buckets with the chosen aggregation."""
+    ring = SeriesRing(resolution=30, capacity=100)
+    for index, value in enumerate([1, 3, 5, 7]):
+        ring.append(T0 + 30 * index, value)
+
+    assert ring.query(T0, T0 + 120, 60, "avg") == [(T0, 2.0), (T0 + 60, 6.0)]
+    assert ring.query(T0, T0 + 120, 60, "min") == [(T0, 1.0), (T0 + 60, 5.0)]
+    assert ring.query(T0, T0 + 120, 60, "max") == [(T0, 3.0), (T0 + 60, 7.0)]
+    assert ring.query(T0, T0 + 120, 60, "last") == [(T0, 3.0), (T0 + 60, 7.0)]
+
+
+def test_ring_retention_and_gaps():
+    """Old samples fall out of the ring and skipped intervals stay empty."""
+    ring = SeriesRing(resolution=30, capacity=4)
+    ring.append(T0, 1)
+    ring.append(T0 + 30, 2)
+    ring.append(T0 + 150, 6)  # skips three intervals, overwriting the oldest
+
+    assert list(ring.samples(T0, T0 + 300)) == [(T0 + 150, 6.0)]
+
+    ring.append(T0 + 180, 7)
+    ring.append(T0, 99)  # beyond retention, dropped
+    assert list(ring.samples(T0, T0 + 300)) == [(T0 + 150, 6.0), (T0 + 180, 7.0)]
+
+
+def test_week_of_history_for_fifty_cameras_fits_budget():
+    """A week at 30-second resolution for 50 cameras x 10 series stays under 100 MB."""
+    history = MetricsHistory(resolution=30, retention=7 * 24 * 3600)
+    for camera in range(50):
+        for metric in range(10):
+            history.record(f"metric_{metric}", {"camera_id": f"cam{camera}"}, 1.0, T0)
+
+    assert history.memory_bytes() < 100 * 1024 * 1024
+
+
+def test_large_counters_are_kept_exactly():
+    """Cumulative byte counters beyond 2**24 come back unrounded."""
+    ring = SeriesRing(resolution=30, capacity=10)
+    ring.append(T0, 16_777_217)
+    ring.append(T0 + 30, 123_456_789_012)
+
+    assert list(ring.samples(T0, T0 + 60)) == [(T0, 16_777_217), (T0 + 30, 123_456_789_012)]
+
+
+def test_parse_selector():
+    """Equality label matchers are parsed from the query."""
+    assert parse_selector("camera_temperature") == ("camera_temperature", {})
+    assert parse_selector('camera_temperature{camera_id="porch", name="Porch"}') == (
+        "camera_temperature",
+        {"camera_id": "porch", "name": "Porch"},
+    )
+    with pytest.raises(ValueError):
+        parse_selector('rate(camera_temperature{camera_id=~"p.*"}[5m])')
+
+
+def test_query_range_endpoint_serves_collector_history():
+    """Recorded camera samples are served as a Prometheus matrix."""
+    collector = MetricsCollector(SimpleNamespace(cameras={}))
+    collector.metrics["porch"] = CameraMetrics(camera_id="porch", name="Porch", ip_address="")
+    for index in range(4):
+        collector.metrics["porch"].temperature = 40.0 + index
+        collector.record_samples("porch", T0 + 30 * index)
+
+    client = TestClient(MetricsServer(collector).create_app())
+    response = client.get(
+        "/api/v1/query_range",
+        params={
+            "query": 'camera_temperature{camera_id="porch"}',
+            "start": str(T0),
+            "end": "2023-11-14T22:15:00Z",
+            "step": "1m",
+            "agg": "max",
+        },
+    )
+
+    assert response.status_code == 200
+    result = response.json()["data"]["result"]
+    assert result == [
+        {
+            "metric": {"__name__": "camera_temperature", "camera_id": "porch", "name": "Porch"},
+            "values": [[T0, "41"], [T0 + 60, "43"]],
+        }
+    ]
+
+    bad = client.get(
+        "/api/v1/query_range",
+        params={"query": "camera_temperature", "start": "0", "end": "1", "agg": "median"},
+    )
+    assert bad.status_code == 400
+    assert bad.json()["status"] == "error"
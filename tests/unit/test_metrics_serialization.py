@@ -0,0 +1,86 @@
+"""
+Tests for CameraMetrics serialization and the JSON metrics responses.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.metrics_service import (
+    CameraMetrics,
+    CameraStatus,
+    MetricsCollector,
+    PTZPosition,
+    dumps,
+)
+from tapo_camera_mcp.prometheus import MetricsRegistry
+
+
+def _metrics(camera_id: str = "porch") -> CameraMetrics:
+    return CameraMetrics(
+        camera_id=camera_id,
+        name=camera_id.title(),
+        ip_address="192.168.1.30",
+        status=CameraStatus.ONLINE,
+        last_seen=datetime(2024, 5, 1, 12, 0, 0),
+        temperature=39.5,
+        network_rx=2048,
+        ptz_supported=True,
+        ptz_position=PTZPosition(pan=0.5, preset_id=2, preset_name="Gate"),
+        ptz_presets={2: "Gate"},
+    )
+
+
+def test_camera_metrics_uses_slots():
+    """Instances have no per-instance __dict__ and reject unknown attributes."""
+    metrics = _metrics()
+    assert not hasattr(metrics, "__dict__")
+    with pytest.raises(AttributeError):
+        metrics.unknown = 1
+    assert CameraMetrics("a", "A", "").motion_zones is not CameraMetrics("b", "B", "").motion_zones
+
+
+def test_to_dict_serializes_nested_values():
+    """Datetimes, the status enum and the PTZ position become plain values."""
+    data = _metrics().to_dict()
+
+    assert data["status"] == "online"
+    assert data["last_seen"] == "2024-05-01T12:00:00"
+    assert data["motion_last_detected"] is None
+    assert data["ptz_position"] == {
+        "pan": 0.5,
+        "tilt": 0.0,
+        "zoom": 0.0,
+        "moving": False,
+        "preset_id": 2,
+        "preset_name": "Gate",
+    }
+    assert json.loads(dumps(data))["ptz_presets"] == {"2": "Gate"}
+
+
+def test_grafana_json_matches_dict_response():
+    """The pre-encoded JSON response carries the same series as the dict form."""
+    collector = MetricsCollector(SimpleNamespace(cameras={}), registry=MetricsRegistry())
+    for camera_id in ("porch", "garage"):
+        collector.metrics[camera_id] = _metrics(camera_id)
+
+    expected = collector.get_grafana_metrics()
+    first = json.loads(collector.get_grafana_metrics_json())
+    second = json.loads(collector.get_grafana_metrics_json())  # cached prefixes
+
+    for payload in (first, second):
+        assert payload["status"] == "success"
+        series = payload["data"]["result"]
+        assert [item["metric"] for item in series] == [
+            item["metric"] for item in expected["data"]["result"]
+        ]
+        assert [item["values"][0][1] for item in series] == [
+            item["values"][0][1] for item in expected["data"]["result"]
+        ]
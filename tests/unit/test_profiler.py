@@ -0,0 +1,90 @@
+"""
+Tests for the sampling profiler and the diagnostics endpoint.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.exceptions import DiagnosticsBusyError
+from tapo_camera_mcp.profiler import SamplingProfiler
+from tapo_camera_mcp.web.api import diagnostics
+
+
+def _encode_frames(stop: threading.Event):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_encode_frames, args=(stop,), name="encoder")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def test_profile_finds_hot_function(busy_thread):
+    """A CPU-bound thread shows up in the hot functions and collapsed stacks."""
+    profile = SamplingProfiler(interval=0.002).run(0.3)
+
+    assert profile.samples > 10
+    functions = [entry["function"] for entry in profile.top(50)]
+    assert any("_encode_frames" in function or "<genexpr>" in function for function in functions)
+
+    lines = profile.collapsed().splitlines()
+    assert any(line.startswith("encoder;") for line in lines)
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+    assert "_encode_frames" in profile.collapsed()
+
+
+def test_only_one_profile_at_a_time():
+    """A second profile while one is running is rejected."""
+    profiler = SamplingProfiler()
+    worker = threading.Thread(target=profiler.run, args=(0.3,))
+    worker.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(DiagnosticsBusyError):
+            profiler.run(0.1)
+    finally:
+        worker.join()
+
+
+def test_profile_endpoint_requires_token(monkeypatch):
+    """The REST endpoint is disabled without a token and checks the bearer token."""
+    app = FastAPI()
+    app.include_router(diagnostics.router)
+    client = TestClient(app)
+
+    monkeypatch.setattr(diagnostics, "get_config", lambda: {})
+    assert client.get("/api/diagnostics/profile").status_code == 404
+
+    monkeypatch.setattr(diagnostics, "get_config", lambda: {"diagnostics": {"token": "s3cret"}})
+    assert client.get("/api/diagnostics/profile").status_code == 401
+    wrong = {"Authorization": "Bearer nope"}
+    assert client.get("/api/diagnostics/profile", headers=wrong).status_code == 401
+
+    headers = {"Authorization": "Bearer s3cret"}
+    response = client.get("/api/diagnostics/profile", params={"seconds": 0.1}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["samples"] > 0
+    assert "top_functions" in response.json()
+
+    collapsed = client.get(
+        "/api/diagnostics/profile",
+        params={"seconds": 0.1, "format": "collapsed"},
+        headers=headers,
+    )
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    assert any(line.startswith("event-loop") for line in collapsed.text.splitlines())
@@ -0,0 +1,162 @@
+"""
+Tests for progress notifications and partial results of tool calls.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from fastmcp import Client, FastMCP
+
+from tapo_camera_mcp.core.sync_runner import background_loop, create_mcp_server
+from tapo_camera_mcp.media.clips import ClipExportProgress
+from tapo_camera_mcp.media.timelapse import TimelapseProgress
+from tapo_camera_mcp.tools.media import clip_export_tool, timelapse_tool
+from tapo_camera_mcp.tools.base_tool import BaseTool, ToolCategory
+from tapo_camera_mcp.tools.invoker import build_tool_wrapper
+from tapo_camera_mcp.tools.manifest import entries_from_classes, load_manifest
+from tapo_camera_mcp.tools.progress import ProgressReporter, run_with_reporter
+
+
+class CountdownTool(BaseTool):
+    """Sends three partial results, then finishes."""
+
+    class Meta:
+        name = "test_progress_countdown"
+        description = "Countdown"
+        category = ToolCategory.UTILITY
+
+    async def execute(self) -> Dict[str, Any]:
+        for n in (3, 2, 1):
+            await self.send_partial({"n": n}, total=3)
+        await self.report_progress(message="liftoff")
+        return {"success": True}
+
+
+def _server(entry: Dict[str, Any]) -> FastMCP:
+    mcp = FastMCP("test")
+    registered = mcp.tool(entry["name"], description=entry["description"])(
+        build_tool_wrapper(entry)
+    )
+    registered.parameters = entry["parameters"]
+    return mcp
+
+
+async def _call(mcp: FastMCP, name: str, arguments: Dict[str, Any]):
+    notifications = []
+
+    async def on_progress(progress, total, message):
+        notifications.append((progress, total, message))
+
+    async with Client(mcp) as client:
+        result = await client.call_tool(name, arguments, progress_handler=on_progress)
+    return result, notifications
+
+
+async def test_partial_results_reach_the_client():
+    """Partial results arrive as progress notifications before the result."""
+    (entry,) = entries_from_classes([CountdownTool])
+    result, notifications = await _call(_server(entry), entry["name"], {})
+
+    assert json.loads(result.content[0].text) == {"success": True}
+    assert notifications == [
+        (1, 3, '{"n": 3}'),
+        (2, 3, '{"n": 2}'),
+        (3, 3, '{"n": 1}'),
+        (4, None, "liftoff"),
+    ]
+
+
+async def test_discovery_sends_each_device_type():
+    """discover_devices reports the devices of each type as they are found."""
+    entry = next(e for e in load_manifest() if e["name"] == "discover_devices")
+    result, notifications = await _call(_server(entry), "discover_devices", {})
+
+    device_types = {json.loads(message)["device_type"] for _, _, message in notifications}
+    assert json.loads(result.content[0].text)["status"] == "success"
+    assert [progress for progress, _, _ in notifications] == [1, 2, 3, 4]
+    assert device_types == {"tapo_p115", "usb_webcams", "nest_protect", "ring_devices"}
+
+
+async def test_direct_mode_sends_progress_from_the_background_loop():
+    """Tools running on the background loop still notify the stdio session."""
+    try:
+        _, notifications = await _call(create_mcp_server(), "discover_devices", {})
+    finally:
+        background_loop.stop()
+
+    assert len(notifications) == 4
+
+
+async def test_reporting_without_a_request_is_silent():
+    """Outside an MCP request tools can report without anyone listening."""
+    assert (await CountdownTool().execute())["success"] is True
+
+    reporter = ProgressReporter()
+    await run_with_reporter(reporter, CountdownTool().execute())
+    assert reporter.partials == [{"n": 3}, {"n": 2}, {"n": 1}]
+    assert reporter.progress == 4
+
+
+async def _reported(call):
+    """The notifications a tool call sends; the call has to succeed."""
+    sent = []
+
+    async def send(progress, total, message):
+        sent.append((progress, total, message))
+
+    result = await run_with_reporter(ProgressReporter(send, asyncio.get_running_loop()), call)
+    assert result["success"] is True
+    return sent
+
+
+async def test_exports_stream_their_progress(monkeypatch):
+    """Clip exports and timelapses notify each progress update as it happens."""
+
+    class Exporter:
+        async def export(self, camera_id, start, end, output_path=None):
+            yield ClipExportProgress(stage="planning", message="Locating recordings")
+            yield ClipExportProgress(stage="copying", progress=0.5)
+            yield ClipExportProgress(stage="done", progress=1.0, output_path="clip.mp4")
+
+    class Builder:
+        async def build(self, camera_id, start, end, output_path=None, fps=24, width=1280):
+            yield TimelapseProgress(stage="encoding", progress=0.25, message="Frame 1/4")
+            yield TimelapseProgress(stage="done", progress=1.0, output_path="lapse.mp4")
+
+    monkeypatch.setattr(clip_export_tool, "clip_exporter", Exporter())
+    monkeypatch.setattr(timelapse_tool, "timelapse_builder", Builder())
+    window = {
+        "camera_id": "porch",
+        "start_time": "2024-05-01T14:00",
+        "end_time": "2024-05-01T15:00",
+    }
+    clip = await _reported(clip_export_tool.ExportClipTool(**window).execute())
+    timelapse = await _reported(timelapse_tool.CreateTimelapseTool(**window).execute())
+
+    assert clip == [
+        (0.0, 1.0, "Locating recordings"),
+        (0.5, 1.0, "copying"),
+        (1.0, 1.0, "done"),
+    ]
+    assert timelapse == [(0.25, 1.0, "Frame 1/4"), (1.0, 1.0, "done")]
+
+
+async def test_progress_never_goes_backwards():
+    """A smaller progress value does not move the progress back."""
+    sent = []
+
+    async def send(progress, total, message):
+        sent.append(progress)
+
+    reporter = ProgressReporter(send, asyncio.get_running_loop())
+    await reporter.report(5)
+    await reporter.report(2)
+    await reporter.report()
+
+    assert sent == [5, 5, 6]
@@ -0,0 +1,105 @@
+"""
+Tests for the Prometheus exposition registry.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.metrics_service import CameraMetrics, MetricsCollector, MetricsServer
+from tapo_camera_mcp.prometheus import MetricsRegistry, format_value
+
+
+def test_render_counters_and_gauges():
+    """Samples are rendered with HELP/TYPE headers and escaped labels."""
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Handled requests", ["path"])
+    temperature = registry.gauge("temperature", "Temperature", ["camera_id"])
+
+    requests.labels(path="/metrics").inc()
+    requests.labels(path="/metrics").inc(2)
+    temperature.labels('back "yard"').set(21.5)
+
+    assert registry.render().decode() == (
+        "# HELP requests_total Handled requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/metrics"} 3\n'
+        "# HELP temperature Temperature\n"
+        "# TYPE temperature gauge\n"
+        'temperature{camera_id="back \\"yard\\""} 21.5\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    """Histogram lines carry cumulative bucket counts, sum and count."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ["tool"], buckets=[0.1, 1])
+    child = latency.labels(tool="capture")
+    for value in (0.05, 0.5, 0.7, 3.0):
+        child.observe(value)
+
+    lines = registry.render().decode().splitlines()[2:]
+    assert lines == [
+        'latency_seconds_bucket{tool="capture",le="0.1"} 1',
+        'latency_seconds_bucket{tool="capture",le="1"} 3',
+        'latency_seconds_bucket{tool="capture",le="+Inf"} 4',
+        'latency_seconds_sum{tool="capture"} 4.25',
+        'latency_seconds_count{tool="capture"} 4',
+    ]
+    assert child.quantile(0.5) == pytest.approx(0.55)
+
+
+def test_unchanged_registry_reuses_rendered_body():
+    """Scrapes without changes return the cached body; changes re-render it."""
+    registry = MetricsRegistry()
+    gauge = registry.gauge("camera_status", "Status", ["camera_id"])
+    for index in range(5000):
+        gauge.labels(f"cam{index}").set(1)
+
+    body = registry.render()
+    assert registry.render() is body
+
+    gauge.labels("cam7").set(1)  # same value: nothing to re-render
+    assert registry.render() is body
+
+    gauge.labels("cam7").set(0)
+    changed = registry.render()
+    assert changed is not body
+    assert b'camera_status{camera_id="cam7"} 0\n' in changed
+
+
+def test_labels_are_interned_and_validated():
+    """Children are shared per label set and label arity is checked."""
+    registry = MetricsRegistry()
+    gauge = registry.gauge("g", "G", ["camera_id"])
+    assert gauge.labels("".join(["por", "ch"])) is gauge.labels(camera_id="porch")
+    with pytest.raises(ValueError):
+        gauge.labels("a", "b")
+    with pytest.raises(ValueError):
+        registry.counter("g", "G", ["camera_id"])
+    assert format_value(float("inf")) == "+Inf"
+
+
+def test_metrics_endpoint_exports_camera_gauges():
+    """Polled camera values appear on the /metrics endpoint."""
+    registry = MetricsRegistry()
+    collector = MetricsCollector(SimpleNamespace(cameras={}), registry=registry)
+    collector.metrics["porch"] = CameraMetrics(
+        camera_id="porch", name="Porch", ip_address="", temperature=38.0
+    )
+    collector.record_samples("porch")
+
+    response = TestClient(MetricsServer(collector).create_app()).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'camera_temperature{camera_id="porch",name="Porch"} 38\n' in response.text
+
+    collector.unregister_camera("porch")
+    assert "porch" not in registry.render().decode()
@@ -0,0 +1,122 @@
+"""
+Tests for subscriptions to the device state resources.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+from typing import Any, Dict
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.client.messages import MessageHandler
+
+from tapo_camera_mcp.core import resources
+from tapo_camera_mcp.core.subscriptions import ResourceWatcher
+from tapo_camera_mcp.prometheus import MetricsRegistry
+from tapo_camera_mcp.tools.energy.tapo_plug_tools import tapo_plug_manager
+
+STATE_URI = "tapo://test/state"
+
+
+class UpdateCollector(MessageHandler):
+    """Collects the URIs of resources/updated notifications."""
+
+    def __init__(self):
+        self.updated = []
+
+    async def on_resource_updated(self, message) -> None:
+        self.updated.append(str(message.params.uri))
+
+
+@pytest.fixture
+def watched(monkeypatch):
+    """A watcher and a state resource whose content the test changes."""
+    state: Dict[str, Any] = {"power_state": True}
+
+    async def read_state() -> Dict[str, Any]:
+        return dict(state)
+
+    watcher = ResourceWatcher(interval=3600, registry=MetricsRegistry())
+    monkeypatch.setattr(resources, "resource_watcher", watcher)
+    monkeypatch.setattr(resources, "STATE_RESOURCES", {"test/state": ("Test", read_state)})
+    return watcher, state
+
+
+async def _wait_for(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+async def test_subscribers_are_notified_only_of_changes(watched):
+    """Reading unchanged state sends nothing; a change sends one notification."""
+    watcher, state = watched
+    mcp = FastMCP("test")
+    resources.register_resources(mcp)
+    collector = UpdateCollector()
+
+    async with Client(mcp, message_handler=collector) as client:
+        assert client.initialize_result.capabilities.resources.subscribe is True
+        await client.session.subscribe_resource(STATE_URI)
+        assert watcher.subscriptions() == {STATE_URI: 1}
+
+        assert await watcher.check() == []
+        state["power_state"] = False
+        assert await watcher.check() == [STATE_URI]
+        assert await watcher.check() == []
+        await _wait_for(lambda: collector.updated)
+        assert collector.updated == [STATE_URI]
+        assert json.loads((await client.read_resource(STATE_URI))[0].text) == {"power_state": False}
+
+        await client.session.unsubscribe_resource(STATE_URI)
+        assert watcher.subscriptions() == {}
+    await watcher.stop()
+
+
+async def test_only_state_resources_can_be_subscribed(watched):
+    """Subscribing to anything else is an error."""
+    mcp = FastMCP("test")
+    resources.register_resources(mcp)
+
+    async with Client(mcp) as client:
+        with pytest.raises(Exception, match="does not support subscriptions"):
+            await client.session.subscribe_resource("tapo://snapshots/" + "0" * 64)
+
+
+async def test_plug_power_follows_the_plugs(monkeypatch):
+    """The plug power resource changes when a plug is switched, not otherwise."""
+    before = await resources.read_plug_power()
+    plug = (await tapo_plug_manager.get_all_devices())[0]
+    monkeypatch.setattr(plug, "last_seen", "2030-01-01T00:00:00Z")
+    assert await resources.read_plug_power() == before
+
+    monkeypatch.setattr(plug, "power_state", not plug.power_state)
+    after = await resources.read_plug_power()
+    assert after != before
+    assert after["plugs"][0]["power_state"] is plug.power_state
+
+
+async def test_motion_follows_the_camera_status(monkeypatch):
+    """The motion resource changes when a camera reports motion."""
+    status = {"connected": True, "motion_detected": False}
+
+    async def list_cameras():
+        return [{"name": "driveway", "status": dict(status)}]
+
+    async def camera_manager():
+        return SimpleNamespace(list_cameras=list_cameras)
+
+    monkeypatch.setattr(resources, "_camera_manager", camera_manager)
+    before = await resources.read_motion()
+    status["motion_detected"] = True
+    after = await resources.read_motion()
+
+    assert before["cameras"]["driveway"]["motion_detected"] is False
+    assert after["cameras"]["driveway"]["motion_detected"] is True
@@ -0,0 +1,183 @@
+"""
+Tests for the result cache of read-only tools.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import pytest
+
+from tapo_camera_mcp.prometheus import MetricsRegistry
+from tapo_camera_mcp.tools import invoker as invoker_module
+from tapo_camera_mcp.tools import result_cache as result_cache_module
+from tapo_camera_mcp.tools.base_tool import BaseTool, CachePolicy, ToolCategory
+from tapo_camera_mcp.tools.invoker import build_tool_wrapper
+from tapo_camera_mcp.tools.manifest import entries_from_classes, load_manifest
+from tapo_camera_mcp.tools.result_cache import ResultCache
+
+calls = []
+
+
+class ReadTool(BaseTool):
+    """Counts its calls; cached per station."""
+
+    class Meta:
+        name = "test_cache_read"
+        description = "Read"
+        category = ToolCategory.UTILITY
+        cache = CachePolicy(ttl=30, key=("station",), invalidated_by=("test_cache_write",))
+
+    station: str = "home"
+    verbose: bool = False
+
+    async def execute(self) -> Dict[str, Any]:
+        calls.append(self.station)
+        return {"success": True, "station": self.station, "call": len(calls)}
+
+
+class WriteTool(BaseTool):
+    """A mutating tool the read tool depends on."""
+
+    class Meta:
+        name = "test_cache_write"
+        description = "Write"
+        category = ToolCategory.UTILITY
+
+    async def execute(self) -> Dict[str, Any]:
+        return {"success": True}
+
+
+class ModeTool(BaseTool):
+    """Counts its calls; only the 'summary' mode is cached."""
+
+    class Meta:
+        name = "test_cache_mode"
+        description = "Mode"
+        category = ToolCategory.UTILITY
+        cache = CachePolicy(ttl=30, key=("mode",), only={"mode": ("summary",)})
+
+    mode: str = "summary"
+
+    async def execute(self) -> Dict[str, Any]:
+        calls.append(self.mode)
+        return {"success": True, "mode": self.mode, "call": len(calls)}
+
+
+class FailingTool(BaseTool):
+    """Reports a failure as its result."""
+
+    class Meta:
+        name = "test_cache_failing"
+        description = "Failing"
+        category = ToolCategory.UTILITY
+        cache = CachePolicy(ttl=30)
+
+    async def execute(self) -> Dict[str, Any]:
+        calls.append("failing")
+        return {"success": False, "error": "unreachable"}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ResultCache(MetricsRegistry())
+    monkeypatch.setattr(invoker_module, "result_cache", cache)
+    calls.clear()
+    return cache
+
+
+def _wrappers():
+    return {
+        entry["name"]: build_tool_wrapper(entry)
+        for entry in entries_from_classes([ReadTool, WriteTool, ModeTool, FailingTool])
+    }
+
+
+def test_policy_is_part_of_the_manifest_entry():
+    """The manifest records the policy, with the key fields spelled out."""
+    read, write = entries_from_classes([ReadTool, WriteTool])
+
+    assert read["cache"] == {
+        "ttl": 30,
+        "key": ["station"],
+        "invalidated_by": ["test_cache_write"],
+    }
+    assert "cache" not in write
+    assert "only" not in read["cache"]
+    (failing,) = entries_from_classes([FailingTool])
+    assert failing["cache"]["key"] == []
+    (mode,) = entries_from_classes([ModeTool])
+    assert mode["cache"]["only"] == {"mode": ["summary"]}
+
+
+async def test_cached_calls_skip_the_tool(cache):
+    """Within the TTL, calls with the same key return the first result."""
+    wrappers = _wrappers()
+    first = await wrappers["test_cache_read"](station="home")
+    second = await wrappers["test_cache_read"](station="home", verbose=True)
+    default = await wrappers["test_cache_read"]()
+    other = await wrappers["test_cache_read"](station="garden")
+
+    assert first == second == default
+    assert other["station"] == "garden"
+    assert calls == ["home", "garden"]
+    assert cache.hits.labels("test_cache_read").value == 2
+    assert cache.misses.labels("test_cache_read").value == 2
+
+
+async def test_results_expire(cache, monkeypatch):
+    """After the TTL the tool runs again."""
+    wrapper = _wrappers()["test_cache_read"]
+    await wrapper()
+    now = time.monotonic()
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now + 31)
+    await wrapper()
+
+    assert calls == ["home", "home"]
+
+
+async def test_mutating_tools_invalidate(cache):
+    """Calling a tool in invalidated_by drops the cached results."""
+    wrappers = _wrappers()
+    await wrappers["test_cache_read"]()
+    await wrappers["test_cache_write"]()
+    await wrappers["test_cache_read"]()
+
+    assert calls == ["home", "home"]
+
+
+async def test_only_listed_values_are_cached(cache):
+    """Calls with other values of an ``only`` parameter always run."""
+    wrapper = _wrappers()["test_cache_mode"]
+    for _ in range(2):
+        await wrapper()
+        await wrapper(mode="live")
+
+    assert calls == ["summary", "live", "live"]
+    assert cache.hits.labels("test_cache_mode").value == 1
+    assert cache.misses.labels("test_cache_mode").value == 1
+
+
+async def test_failures_are_not_cached(cache):
+    """Failed results are returned but not reused."""
+    wrapper = _wrappers()["test_cache_failing"]
+    await wrapper()
+    result = await wrapper()
+
+    assert result["error"] == "unreachable"
+    assert calls == ["failing", "failing"]
+
+
+def test_shipped_policies_name_existing_tools():
+    """Every tool that invalidates a cached tool exists."""
+    entries = load_manifest()
+    names = {entry["name"] for entry in entries}
+    cached = {entry["name"]: entry["cache"] for entry in entries if "cache" in entry}
+
+    assert {"get_smart_plug_status", "list_cameras", "system_info"} <= set(cached)
+    for policy in cached.values():
+        assert set(policy["invalidated_by"]) <= names
@@ -0,0 +1,64 @@
+"""
+Tests for starting the metrics collector and server with the MCP server.
+"""
+
+import os
+import sys
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import pytest
+
+import tapo_camera_mcp.config
+from tapo_camera_mcp.core.server import TapoCameraServer
+from tapo_camera_mcp.metrics_service import MetricsServer
+
+
+@pytest.fixture
+def fresh_server(monkeypatch):
+    """A new, uninitialized server singleton; the previous one comes back afterwards."""
+    monkeypatch.setattr(TapoCameraServer, "_instance", None)
+    monkeypatch.setattr(TapoCameraServer, "_initialized", False)
+    served = []
+
+    async def serve(self):
+        served.append((self.host, self.port))
+
+    monkeypatch.setattr(MetricsServer, "start", serve)
+
+    def use_config(metrics_server):
+        config = {
+            "loop_monitor": {"enabled": False},
+            "memory_diagnostics": {"enabled": False},
+            "metrics_server": metrics_server,
+        }
+        monkeypatch.setattr(tapo_camera_mcp.config, "get_config", lambda: config)
+
+    return use_config, served
+
+
+async def test_initialize_starts_the_metrics_service(fresh_server):
+    """With metrics_server enabled the collector polls and the HTTP server starts."""
+    use_config, served = fresh_server
+    use_config({"enabled": True, "port": 9100, "poll_interval": 10})
+
+    server = await TapoCameraServer.get_instance()
+    try:
+        await server._metrics_task
+        assert served == [("127.0.0.1", 9100)]
+        assert server.metrics_collector._running
+        assert server.metrics_collector.tapo_client is server.camera_manager
+        assert server.metrics_collector.poll_interval == 10
+    finally:
+        await server.metrics_collector.stop()
+
+
+async def test_metrics_service_is_off_by_default(fresh_server):
+    """Without the flag nothing is polled or served."""
+    use_config, served = fresh_server
+    use_config({})
+
+    server = await TapoCameraServer.get_instance()
+    assert server.metrics_collector is None
+    assert served == []
@@ -0,0 +1,118 @@
+"""
+Tests for the periodic snapshot scheduler and latest-frame cache.
+"""
+
+import asyncio
+import io
+import os
+import sys
+from datetime import datetime
+
+from PIL import Image
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.media.scheduler import (
+    CachedFrame,
+    LatestFrameCache,
+    SnapshotScheduler,
+    stagger_offsets,
+)
+
+
+def _jpeg() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), "blue").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+JPEG = _jpeg()
+
+
+class _FakeCamera:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def capture_jpeg(self, quality=90):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("camera offline")
+        return JPEG
+
+
+class _FakeManager:
+    def __init__(self, cameras):
+        self.cameras = cameras
+
+
+def test_stagger_offsets_spread_evenly():
+    """Capture offsets divide the interval into equal slots."""
+    offsets = stagger_offsets(["c", "a", "d", "b"], 60.0)
+    assert offsets == {"a": 0.0, "b": 15.0, "c": 30.0, "d": 45.0}
+
+
+def test_cache_expires_stale_frames():
+    """Frames older than the allowed age are not returned."""
+    cache = LatestFrameCache(max_age=10.0)
+    frame = CachedFrame("garage", b"jpeg", datetime.now(), 64, 48)
+    cache.put(frame)
+
+    assert cache.get("garage") is frame
+    frame._monotonic -= 30
+    assert cache.get("garage") is None
+    assert cache.get("garage", max_age=60) is frame
+
+
+async def test_concurrent_reads_share_one_capture():
+    """Simultaneous cache misses trigger a single live capture."""
+    camera = _FakeCamera(delay=0.05)
+    scheduler = SnapshotScheduler(cache=LatestFrameCache())
+
+    frames = await asyncio.gather(
+        *(
+            scheduler.latest("garage", camera_manager=_FakeManager({"garage": camera}))
+            for _ in range(5)
+        )
+    )
+
+    assert camera.calls == 1
+    assert all(frame is frames[0] for frame in frames)
+    assert frames[0].data == JPEG  # cached as the camera sent it
+    assert (frames[0].width, frames[0].height) == (64, 48)
+
+    # Later reads are served from memory
+    await scheduler.latest("garage")
+    assert camera.calls == 1
+
+
+async def test_failed_and_slow_captures_are_counted():
+    """Timeouts and errors leave the cache untouched and are counted."""
+    cache = LatestFrameCache()
+    scheduler = SnapshotScheduler(cache=cache, timeout=0.01)
+    scheduler.camera_manager = _FakeManager(
+        {"slow": _FakeCamera(delay=1.0), "broken": _FakeCamera(fail=True)}
+    )
+
+    assert await scheduler.capture("slow") is None
+    assert await scheduler.capture("broken") is None
+    assert cache.camera_ids() == []
+    assert scheduler.failures == {"slow": 1, "broken": 1}
+
+
+async def test_scheduler_captures_every_camera_periodically():
+    """Each camera is captured at its offset and again every interval."""
+    cameras = {name: _FakeCamera() for name in ("a", "b", "c")}
+    cache = LatestFrameCache()
+    scheduler = SnapshotScheduler(cache=cache, interval=0.15)
+
+    scheduler.start(_FakeManager(cameras))
+    await asyncio.sleep(0.4)
+    await scheduler.stop()
+
+    assert sorted(cache.camera_ids()) == ["a", "b", "c"]
+    assert all(camera.calls >= 2 for camera in cameras.values())
+    assert not scheduler.running
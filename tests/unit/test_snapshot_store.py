@@ -0,0 +1,114 @@
+"""
+Tests for the content-addressed snapshot store.
+"""
+
+import io
+import os
+import sys
+from datetime import datetime, timedelta
+
+from PIL import Image, ImageDraw
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.camera.manager import CameraManager
+from tapo_camera_mcp.media.snapshot_store import (
+    SnapshotStore,
+    hamming_distance,
+    perceptual_hash,
+)
+
+
+def _jpeg(shade: int = 120, box: int = 0, noise: int = 0) -> bytes:
+    image = Image.new("RGB", (320, 240), (shade, shade, shade))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([40 + box, 40, 140 + box, 160], fill=(230, 230, 230))
+    if noise:
+        draw.point([(noise, noise)], fill=(0, 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def test_perceptual_hash_separates_different_scenes():
+    """Near-identical frames hash close together, different scenes far apart."""
+    base = perceptual_hash(_jpeg())
+    assert hamming_distance(base, perceptual_hash(_jpeg(noise=5))) <= 4
+    assert hamming_distance(base, perceptual_hash(_jpeg(box=150))) > 4
+
+
+def test_exact_duplicates_are_written_once(tmp_path):
+    """Identical captures share one blob but keep their own timeline entries."""
+    store = SnapshotStore(root=tmp_path, near_duplicate_distance=0)
+    start = datetime(2024, 5, 1, 22, 0, 0)
+    data = _jpeg()
+
+    first = store.put("garage", data, start)
+    second = store.put("garage", data, start + timedelta(seconds=30))
+
+    assert first.stored and not second.stored
+    assert first.blob == second.blob
+    assert len(list((tmp_path / "blobs").rglob("*.jpg"))) == 1
+    assert [entry.taken for entry in store.entries("garage")] == [first.taken, second.taken]
+
+
+def test_near_duplicates_become_references_within_window(tmp_path):
+    """Similar captures refer to the anchor blob until the window expires."""
+    store = SnapshotStore(root=tmp_path, near_duplicate_distance=4, window_seconds=600)
+    start = datetime(2024, 5, 1, 22, 0, 0)
+
+    anchor = store.put("garage", _jpeg(), start)
+    similar = store.put("garage", _jpeg(noise=5), start + timedelta(minutes=1))
+    changed = store.put("garage", _jpeg(box=150), start + timedelta(minutes=2))
+    late = store.put("garage", _jpeg(box=150, noise=7), start + timedelta(minutes=30))
+
+    assert similar.reference and similar.blob == anchor.blob
+    assert changed.stored
+    assert late.stored  # too old to reference the previous anchor
+    assert store.read(similar) == store.read(anchor)
+
+    stats = store.stats("garage")
+    assert stats["entries"] == 4
+    assert stats["blobs_written"] == 3
+    assert stats["references"] == 1
+
+
+def test_anchor_survives_restart(tmp_path):
+    """A new store instance resumes deduplication from the on-disk index."""
+    start = datetime(2024, 5, 1, 22, 0, 0)
+    SnapshotStore(root=tmp_path).put("hallway", _jpeg(), start)
+
+    entry = SnapshotStore(root=tmp_path).put(
+        "hallway", _jpeg(noise=5), start + timedelta(minutes=1)
+    )
+
+    assert entry.reference
+
+
+class JpegCamera:
+    """A camera that sends JPEG."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def capture_jpeg(self) -> bytes:
+        return self.data
+
+
+async def test_captures_store_the_camera_jpeg(tmp_path, monkeypatch):
+    """capture_still(store=True) keeps the camera's bytes without re-encoding."""
+    store = SnapshotStore(root=tmp_path / "store")
+    # The media package re-exports the instance under the module's name
+    monkeypatch.setattr(sys.modules[SnapshotStore.__module__], "snapshot_store", store)
+    manager = CameraManager()
+    data = _jpeg()
+    manager.cameras["porch"] = JpegCamera(data)
+
+    result = await manager.capture_still("porch", tmp_path / "porch.jpg", store=True)
+
+    assert result["status"] == "success"
+    assert result["snapshot"]["camera_id"] == "porch"
+    [entry] = store.entries("porch")
+    assert store.read(entry) == data
+    assert Image.open(tmp_path / "porch.jpg").size == (320, 240)
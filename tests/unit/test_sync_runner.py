@@ -0,0 +1,78 @@
+"""
+Tests for the direct-mode runner and its background event loop.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+import pytest
+from fastmcp import Client
+
+from tapo_camera_mcp.core.sync_runner import BackgroundLoop, background_loop, create_mcp_server
+
+
+async def _where():
+    return threading.get_ident(), asyncio.get_running_loop()
+
+
+def test_calls_share_one_loop_thread():
+    """Every coroutine runs on the same loop, in a thread of its own."""
+    runner = BackgroundLoop("test-loop")
+    try:
+        first = runner.run(_where())
+        second = runner.run(_where())
+        assert first == second
+        assert first[0] != threading.get_ident()
+        assert runner.running
+    finally:
+        runner.stop()
+
+    assert not runner.running
+    assert first[1].is_closed()
+
+
+def test_stop_cancels_pending_tasks():
+    """Stopping the loop cancels what is still running on it."""
+    runner = BackgroundLoop("test-loop")
+    future = runner.submit(asyncio.sleep(60))
+    runner.stop()
+
+    assert future.cancelled()
+
+
+def test_run_from_the_loop_thread_is_refused():
+    """Blocking on the loop from its own thread would deadlock."""
+    runner = BackgroundLoop("test-loop")
+
+    async def nested():
+        coro = _where()
+        try:
+            runner.run(coro)
+        finally:
+            coro.close()
+
+    try:
+        with pytest.raises(RuntimeError):
+            runner.run(nested())
+    finally:
+        runner.stop()
+
+
+async def test_direct_mode_awaits_async_tools():
+    """Async tools return their result, computed on the background loop."""
+    mcp = create_mcp_server()
+    async with Client(mcp) as client:
+        result = await client.call_tool("system_info", {"operation": "tool_metrics"})
+
+    try:
+        assert json.loads(result.content[0].text)["success"] is True
+        assert background_loop.running
+        assert background_loop.loop is not asyncio.get_running_loop()
+    finally:
+        background_loop.stop()
@@ -0,0 +1,76 @@
+"""
+Tests for the thumbnail service.
+"""
+
+import io
+import os
+import sys
+
+from PIL import Image
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.media.thumbnails import ThumbnailService, fit_size, render_thumbnail
+
+
+def _jpeg(size=(3840, 2160), color="green") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
+def test_fit_size_keeps_aspect_and_never_enlarges():
+    """Bounds are applied to either dimension without upscaling."""
+    assert fit_size((3840, 2160), width=640) == (640, 360)
+    assert fit_size((3840, 2160), height=270) == (480, 270)
+    assert fit_size((3840, 2160), width=640, height=100) == (178, 100)
+    assert fit_size((320, 240), width=640) == (320, 240)
+
+
+def test_render_thumbnail_decodes_at_reduced_scale(monkeypatch):
+    """A 4K JPEG is reduced by the decoder before the final resample."""
+    decoded = []
+    original_convert = Image.Image.convert
+
+    def tracking_convert(self, *args, **kwargs):
+        decoded.append(self.size)
+        return original_convert(self, *args, **kwargs)
+
+    monkeypatch.setattr(Image.Image, "convert", tracking_convert)
+    thumb = render_thumbnail(_jpeg(), width=480)
+
+    assert (thumb.width, thumb.height) == (480, 270)
+    assert decoded[0] == (480, 270)  # 1/8 DCT scaling hits the target exactly
+    with Image.open(io.BytesIO(thumb.data)) as image:
+        assert image.size == (480, 270)
+
+
+def test_thumbnails_are_cached_by_source_and_size():
+    """Repeated requests are served from the cache; sizes are cached separately."""
+    service = ThumbnailService(max_entries=2)
+    data = _jpeg((800, 600))
+
+    first = service.thumbnail(data, width=200, source_id="garage@1")
+    again = service.thumbnail(data, width=200, source_id="garage@1")
+    other = service.thumbnail(data, width=100, source_id="garage@1")
+
+    assert again is first
+    assert other.width == 100
+    assert service.stats() == {"entries": 2, "hits": 1, "misses": 2}
+
+    service.thumbnail(data, width=50, source_id="garage@1")
+    assert service.stats()["entries"] == 2  # least recently used entry evicted
+
+
+async def test_async_thumbnail_from_file(tmp_path):
+    """File sources are identified by path and modification time."""
+    path = tmp_path / "frame.jpg"
+    path.write_bytes(_jpeg((640, 480)))
+    service = ThumbnailService()
+
+    first = await service.get(path, width=160)
+    second = await service.get(path, width=160)
+
+    assert second is first
+    assert (first.width, first.height) == (160, 120)
@@ -0,0 +1,178 @@
+"""
+Tests for timelapse generation and media jobs.
+"""
+
+import asyncio
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.exceptions import StorageError
+from tapo_camera_mcp.media.imaging import open_scaled, scaled_size
+from tapo_camera_mcp.media.jobs import JobManager
+from tapo_camera_mcp.media.timelapse import TimelapseBuilder
+
+
+def _write_snapshots(directory: Path, start: datetime, count: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        taken = start + timedelta(minutes=index)
+        image = Image.new("RGB", (320, 240), (index * 20 % 256, 80, 160))
+        image.save(directory / f"{taken:%Y%m%d_%H%M%S}.jpg", quality=80)
+
+
+def test_open_scaled_uses_jpeg_draft(tmp_path):
+    """JPEG decoding is reduced in the DCT domain to the smallest scale >= target."""
+    path = tmp_path / "frame.jpg"
+    Image.new("RGB", (800, 600), "white").save(path)
+
+    with open_scaled(path, (200, 150)) as image:
+        assert image.size == (200, 150)
+    with open_scaled(path, (300, 200)) as image:
+        assert image.size == (400, 300)
+
+
+def test_scaled_size_keeps_aspect_and_even_dimensions():
+    """Frame sizes follow the source aspect ratio and are even."""
+    assert scaled_size((1920, 1080), 1280) == (1280, 720)
+    assert scaled_size((320, 240), 1280) == (320, 240)
+    assert scaled_size((1001, 751), 501) == (500, 376)
+
+
+def test_find_snapshots_filters_window(tmp_path):
+    """Only snapshots taken inside the window are used, in capture order."""
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    _write_snapshots(tmp_path / "garage", start, 6)
+    builder = TimelapseBuilder(snapshots_dir=tmp_path)
+
+    found = builder.find_snapshots(
+        "garage", start + timedelta(minutes=1), start + timedelta(minutes=4)
+    )
+
+    assert [taken for taken, _ in found] == [start + timedelta(minutes=m) for m in (1, 2, 3)]
+
+
+def test_flat_snapshots_match_the_whole_camera_id(tmp_path):
+    """Snapshots of camX_other are not part of camX's timelapse."""
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    for camera_id in ("camX", "camX_other"):
+        Image.new("RGB", (32, 24)).save(tmp_path / f"{camera_id}_{start:%Y%m%d_%H%M%S}.jpg")
+    builder = TimelapseBuilder(snapshots_dir=tmp_path)
+
+    found = builder.find_snapshots("camX", start, start + timedelta(minutes=1))
+
+    assert [path.name for _, path in found] == ["camX_20240501_120000.jpg"]
+
+
+async def test_build_timelapse(tmp_path):
+    """Snapshots are encoded into a video with progress updates."""
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    _write_snapshots(tmp_path / "snapshots" / "garage", start, 12)
+    builder = TimelapseBuilder(
+        snapshots_dir=tmp_path / "snapshots", output_dir=tmp_path / "out", max_workers=2
+    )
+
+    updates = [
+        update
+        async for update in builder.build(
+            "garage", start, start + timedelta(hours=1), fps=10, width=160
+        )
+    ]
+
+    assert updates[0].stage == "planning"
+    assert updates[-1].stage == "done"
+    assert updates[-1].frames_written == 12
+    progress = [update.progress for update in updates]
+    assert progress == sorted(progress)
+    assert Path(updates[-1].output_path).stat().st_size > 0
+
+
+async def test_build_without_snapshots_fails(tmp_path):
+    """An empty window is reported as a storage error."""
+    builder = TimelapseBuilder(snapshots_dir=tmp_path, output_dir=tmp_path)
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    with pytest.raises(StorageError):
+        async for _ in builder.build("garage", start, start + timedelta(hours=1)):
+            pass
+
+
+async def test_build_stays_inside_its_directories(tmp_path):
+    """Output paths outside the output directory and unsafe camera ids are rejected."""
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    _write_snapshots(tmp_path / "snapshots" / "garage", start, 2)
+    victim = tmp_path / "victim.mp4"
+    victim.write_bytes(b"keep")
+    builder = TimelapseBuilder(snapshots_dir=tmp_path / "snapshots", output_dir=tmp_path / "out")
+
+    for camera_id, output_path in (("garage", str(victim)), ("../snapshots", None)):
+        with pytest.raises(ValueError):
+            async for _ in builder.build(
+                camera_id, start, start + timedelta(hours=1), output_path=output_path
+            ):
+                pass
+    assert victim.read_bytes() == b"keep"
+
+
+async def test_undecodable_snapshots_keep_existing_output(tmp_path):
+    """A build without frames removes only its partial file."""
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    snapshots = tmp_path / "snapshots" / "garage"
+    _write_snapshots(snapshots, start, 1)
+    # The header is intact, the image data is cut off
+    snapshot = snapshots / f"{start:%Y%m%d_%H%M%S}.jpg"
+    data = snapshot.read_bytes()
+    snapshot.write_bytes(data[: len(data) // 2])
+    builder = TimelapseBuilder(snapshots_dir=tmp_path / "snapshots", output_dir=tmp_path / "out")
+    existing = tmp_path / "out" / "garage.mp4"
+    existing.parent.mkdir()
+    existing.write_bytes(b"earlier timelapse")
+
+    with pytest.raises(StorageError):
+        async for _ in builder.build(
+            "garage", start, start + timedelta(hours=1), output_path="garage.mp4", width=160
+        ):
+            pass
+    assert existing.read_bytes() == b"earlier timelapse"
+    assert list(existing.parent.iterdir()) == [existing]
+
+
+@dataclass
+class _Update:
+    progress: float
+    message: str = ""
+
+    def to_dict(self):
+        return {"progress": self.progress}
+
+
+async def test_job_manager_tracks_progress_and_result():
+    """Jobs record progress, the final update and failures."""
+
+    async def updates():
+        for step in (0.25, 0.5, 1.0):
+            yield _Update(step)
+            await asyncio.sleep(0)
+
+    async def failing():
+        yield _Update(0.1)
+        raise StorageError("disk full")
+
+    manager = JobManager()
+    job = manager.start("test", updates())
+    failed = manager.start("test", failing())
+    await asyncio.gather(job._task, failed._task)
+
+    assert job.status == "completed"
+    assert job.result == {"progress": 1.0}
+    assert failed.status == "failed"
+    assert failed.error == "disk full"
+    assert manager.get(job.job_id) is job
+    assert len(manager.list("test")) == 2
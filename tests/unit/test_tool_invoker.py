@@ -0,0 +1,133 @@
+"""
+Tests for the signature-based tool wrappers.
+"""
+
+import asyncio
+import inspect
+import os
+import sys
+from typing import Any, Dict, Optional
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from pydantic import BaseModel, Field
+
+from tapo_camera_mcp.tools.base_tool import BaseTool, ToolCategory
+from tapo_camera_mcp.tools.invoker import build_tool_wrapper, is_stateless, signature_from_schema
+from tapo_camera_mcp.tools.manifest import entries_from_classes
+
+
+class CountingFieldsTool(BaseTool):
+    """Tool taking its parameters as model fields."""
+
+    class Meta:
+        name = "test_invoker_fields"
+        description = "Fields tool"
+        category = ToolCategory.UTILITY
+
+    value: int = Field(0, description="Value")
+
+    async def execute(self) -> Dict[str, Any]:
+        return {"value": self.value, "instance": id(self)}
+
+
+class CountingRunTool(BaseTool):
+    """Portmanteau tool taking its parameters in _run."""
+
+    class Meta:
+        name = "test_invoker_run"
+        description = "Run tool"
+        category = ToolCategory.UTILITY
+
+        class Parameters(BaseModel):
+            operation: str = Field(..., description="Operation")
+            limit: int = Field(10, description="Limit")
+
+    async def _run(self, operation: str, limit: int = 5) -> Dict[str, Any]:
+        return {"operation": operation, "limit": limit, "instance": id(self)}
+
+
+class StatefulRunTool(BaseTool):
+    """Keeps the running call's operation on self, like performance_analyzer's start time."""
+
+    class Meta:
+        name = "test_invoker_stateful"
+        description = "Stateful tool"
+        category = ToolCategory.UTILITY
+
+        class Parameters(BaseModel):
+            operation: str = Field(..., description="Operation")
+
+    _operation: Optional[str] = None
+
+    async def _run(self, operation: str) -> Dict[str, Any]:
+        self._operation = operation
+        await asyncio.sleep(0.01)
+        return {"operation": self._operation, "instance": id(self)}
+
+
+def _wrappers():
+    fields_entry, run_entry = sorted(
+        entries_from_classes([CountingFieldsTool, CountingRunTool]), key=lambda e: e["name"]
+    )
+    return build_tool_wrapper(fields_entry), build_tool_wrapper(run_entry)
+
+
+def test_signature_follows_the_schema():
+    """Required parameters come first and optional ones carry their defaults."""
+    signature = signature_from_schema(
+        {
+            "properties": {"limit": {"default": 10}, "operation": {}},
+            "required": ["operation"],
+        }
+    )
+    assert list(signature.parameters) == ["operation", "limit"]
+    assert signature.parameters["operation"].default is inspect.Parameter.empty
+    assert signature.parameters["limit"].default == 10
+    assert list(inspect.signature(_wrappers()[1]).parameters) == ["operation", "limit"]
+
+
+async def test_run_tools_are_called_with_validated_arguments():
+    """_run tools get arguments validated and defaulted by Meta.Parameters."""
+    _, run_wrapper = _wrappers()
+    first = await run_wrapper(operation="info", limit="3")
+    second = await run_wrapper(operation="logs")
+
+    assert (first["operation"], first["limit"]) == ("info", 3)
+    assert second["limit"] == 10
+    assert first["instance"] == second["instance"]
+
+
+async def test_field_arguments_get_their_own_instance():
+    """Calls setting model fields construct the tool; calls without arguments share one."""
+    fields_wrapper, _ = _wrappers()
+    shared = [await fields_wrapper(), await fields_wrapper()]
+    own = await fields_wrapper(value=2)
+
+    assert shared[0]["instance"] == shared[1]["instance"]
+    assert own["value"] == 2
+
+
+async def test_concurrent_calls_of_stateful_tools_do_not_interfere():
+    """Tools with state of their own get an instance per call; stateless ones share one."""
+    (entry,) = entries_from_classes([StatefulRunTool])
+    wrapper = build_tool_wrapper(entry)
+    results = await asyncio.gather(*(wrapper(operation=str(n)) for n in range(5)))
+
+    assert [result["operation"] for result in results] == ["0", "1", "2", "3", "4"]
+    assert not is_stateless(StatefulRunTool)
+    assert is_stateless(CountingRunTool)
+
+    _, run_wrapper = _wrappers()
+    shared = await asyncio.gather(*(run_wrapper(operation="info") for _ in range(3)))
+    assert len({result["instance"] for result in shared}) == 1
+
+
+async def test_invalid_arguments_return_an_error():
+    """Validation errors come back as an error result instead of raising."""
+    _, run_wrapper = _wrappers()
+    result = await run_wrapper(operation=["not", "a", "string"])
+
+    assert result["is_error"] is True
+    assert "test_invoker_run" in result["content"]
@@ -0,0 +1,79 @@
+"""
+Tests for the prebuilt tool manifest.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+# Add the src path to Python path
+SRC = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+sys.path.insert(0, SRC)
+
+from tapo_camera_mcp.tools.manifest import (  # noqa: E402 - needs SRC on sys.path
+    MANIFEST_PATH,
+    build_manifest,
+    load_manifest,
+    render_manifest,
+    resolve_tool,
+)
+
+
+def test_manifest_is_up_to_date():
+    """The checked-in manifest matches the tools in the tree.
+
+    Regenerate it with ``python -m tapo_camera_mcp.tools.manifest``.
+    """
+    assert MANIFEST_PATH.read_text(encoding="utf-8") == render_manifest(build_manifest())
+
+
+def test_entries_resolve_to_their_tool_classes():
+    """Every entry names an importable tool class with the same name."""
+    entries = load_manifest()
+    assert len({entry["name"] for entry in entries}) == len(entries)
+    for entry in entries:
+        assert resolve_tool(entry).Meta.name == entry["name"]
+
+
+def test_registration_imports_no_tool_module():
+    """The server lists all tools without importing them; a call imports one module."""
+    script = textwrap.dedent(
+        """
+        import asyncio, json, sys
+
+        from fastmcp import Client, FastMCP
+
+        from tapo_camera_mcp.core.server import TapoCameraServer
+
+        def tool_modules():
+            return sorted(
+                name for name in sys.modules
+                if name.startswith("tapo_camera_mcp.tools.")
+                and name.rsplit(".", 1)[1]
+                not in ("base_tool", "discovery", "invoker", "manifest", "progress", "result_cache")
+            )
+
+        async def main():
+            server = object.__new__(TapoCameraServer)
+            server.mcp = FastMCP("test")
+            await server._register_tools()
+            async with Client(server.mcp) as client:
+                tools = await client.list_tools()
+                before = tool_modules()
+                await client.call_tool("profile_server", {"duration": 0.05, "top": 1})
+            print(json.dumps({"tools": len(tools), "before": before, "after": tool_modules()}))
+
+        asyncio.run(main())
+        """
+    )
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC))
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result["tools"] == len(load_manifest())
+    assert result["before"] == []
+    assert "tapo_camera_mcp.tools.system.profiler_tool" in result["after"]
@@ -0,0 +1,78 @@
+"""
+Tests for the per-tool call metrics.
+"""
+
+import inspect
+import os
+import sys
+
+import pytest
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.prometheus import MetricsRegistry
+from tapo_camera_mcp.tool_metrics import ToolMetrics, hdr_buckets
+
+
+def test_hdr_buckets_are_log_linear():
+    """Each power of two is split into equal steps."""
+    bounds = hdr_buckets(lowest=1, highest=4, sub_buckets=4)
+    assert bounds == [1, 1.25, 1.5, 1.75, 2, 2.5, 3, 3.5, 4]
+
+
+async def test_instrument_counts_calls_errors_and_latency():
+    """Async tools keep their signature; failures and error results count as errors."""
+    registry = MetricsRegistry()
+    metrics = ToolMetrics(registry)
+
+    async def capture_still(camera_id: str, quality: int = 90):
+        """Capture a still."""
+        if camera_id == "broken":
+            raise RuntimeError("offline")
+        if camera_id == "missing":
+            return {"content": "not found", "is_error": True}
+        return {"content": "ok"}
+
+    wrapped = metrics.instrument("capture_still", capture_still)
+    assert inspect.signature(wrapped) == inspect.signature(capture_still)
+    assert wrapped.__doc__ == "Capture a still."
+
+    for _ in range(8):
+        await wrapped("porch")
+    await wrapped(camera_id="missing")
+    with pytest.raises(RuntimeError):
+        await wrapped("broken")
+
+    stats = metrics.snapshot()["capture_still"]
+    assert stats["calls"] == 10
+    assert stats["errors"] == 2
+    assert stats["error_rate"] == 0.2
+    assert stats["p50_ms"] <= stats["p99_ms"]
+
+    body = registry.render().decode()
+    assert 'mcp_tool_calls_total{tool="capture_still"} 10\n' in body
+    assert 'mcp_tool_errors_total{tool="capture_still"} 2\n' in body
+    assert 'mcp_tool_duration_seconds_count{tool="capture_still"} 10\n' in body
+
+
+def test_instrument_sync_tools():
+    """Synchronous wrappers (direct mode) are measured as well."""
+    metrics = ToolMetrics(MetricsRegistry())
+    wrapped = metrics.instrument("list_cameras", lambda **kwargs: {"success": False})
+
+    assert wrapped() == {"success": False}
+    assert metrics.snapshot()["list_cameras"]["errors"] == 1
+
+
+def test_quantiles_follow_recorded_latencies():
+    """Percentiles are read from the log-linear buckets."""
+    metrics = ToolMetrics(MetricsRegistry())
+    for _ in range(99):
+        metrics.record("ptz_move", 0.010)
+    metrics.record("ptz_move", 2.0)
+
+    stats = metrics.snapshot()["ptz_move"]
+    # Within the width of the bucket holding 10 ms (9.6-11.2 ms)
+    assert 9.6 <= stats["p50_ms"] <= stats["p99_ms"] <= 11.2
+    assert stats["mean_ms"] == pytest.approx(29.9)
@@ -0,0 +1,59 @@
+"""
+Tests for lazy loading of the vision model.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the src path to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tapo_camera_mcp.analysis import ImageAnalyzer
+from tapo_camera_mcp.vision import DINOv3Processor, dinov3_processor
+
+
+def test_import_does_not_load_the_model():
+    """Importing the vision package and the analyzer loads no model or torch."""
+    assert not dinov3_processor.loaded
+    assert ImageAnalyzer().processor is dinov3_processor
+    assert not dinov3_processor.loaded
+    assert ImageAnalyzer("facebook/dinov2-small").processor is not dinov3_processor
+
+
+def test_concurrent_first_use_loads_once(monkeypatch):
+    """Threads racing for the first inference load the model exactly once."""
+    processor = DINOv3Processor()
+    loads = []
+
+    def initialize():
+        loads.append(threading.get_ident())
+        time.sleep(0.05)
+        processor.model = object()
+
+    monkeypatch.setattr(processor, "_initialize_model", initialize)
+    threads = [threading.Thread(target=processor.load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert processor.loaded
+
+
+async def test_warmup_runs_off_the_event_loop(monkeypatch):
+    """warmup loads the model in a worker thread."""
+    processor = DINOv3Processor()
+    loaded_in = []
+
+    def initialize():
+        loaded_in.append(threading.get_ident())
+        processor.model = object()
+
+    monkeypatch.setattr(processor, "_initialize_model", initialize)
+    await processor.warmup()
+
+    assert processor.loaded
+    assert loaded_in != [threading.get_ident()]